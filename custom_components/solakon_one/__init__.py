@@ -6,18 +6,53 @@ import logging
 
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
-
-from .const import PLATFORMS
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    CONF_CONTROLLER_INTERVAL,
+    CONF_CONTROLLER_METER,
+    CONF_PEAK_SHAVING_LIMIT,
+    CONF_PROXY_ENABLED,
+    CONF_PROXY_HOST,
+    CONF_PROXY_MAX_AGE,
+    CONF_PROXY_PORT,
+    DEFAULT_CONTROLLER_INTERVAL,
+    DEFAULT_PEAK_SHAVING_LIMIT,
+    DEFAULT_PROXY_HOST,
+    DEFAULT_PROXY_MAX_AGE,
+    DEFAULT_PROXY_PORT,
+    DOMAIN,
+    PLATFORMS,
+)
+from .controller import ControllerSettings, ZeroExportController
 from .coordinator import SolakonDataCoordinator
+from .discovery import RegisterMapStore
 from .modbus import get_modbus_hub
+from .peak_shaving import PeakShavingController
+from .proxy import SolakonModbusProxy
+from .schedule import ScheduleExecutor, async_remove_schedule
+from .scheduler import get_poll_scheduler
+from .services import async_setup_services
 from .types import SolakonConfigEntry, SolakonData
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Solakon ONE integration."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: SolakonConfigEntry) -> bool:
     """Set up Solakon ONE from a config entry."""
-    hub = get_modbus_hub(hass, entry.data | entry.options)  # let options override data
+    # Plan the batches around the ranges a stored discovery scan found unreadable
+    unreadable = await RegisterMapStore(hass, entry.entry_id).async_load_unreadable()
+    # let options override data
+    hub = get_modbus_hub(hass, entry.data | entry.options, unreadable)
 
     try:
         await hub.async_setup()
@@ -27,13 +62,74 @@ async def async_setup_entry(hass: HomeAssistant, entry: SolakonConfigEntry) -> b
     except Exception as err:
         raise ConfigEntryNotReady(err) from err
 
-    coordinator = SolakonDataCoordinator(hass, hub)
-    # Coordinator isn't tied to a config entry object, so call a regular refresh
-    # rather than async_config_entry_first_refresh which is only supported
-    # for coordinators that are created with a config entry.
-    await coordinator.async_refresh()
+    # Poll and create entities for a second battery module only if present
+    await hub.async_detect_bms2()
 
-    entry.runtime_data = SolakonData(hub=hub, coordinator=coordinator)
+    coordinator = SolakonDataCoordinator(hass, entry, hub, get_poll_scheduler(hass))
+    # Call a regular refresh rather than async_config_entry_first_refresh so a
+    # failed first poll does not abort the setup; entities stay unavailable
+    # until the next successful poll.
+    await coordinator.async_refresh()
+    if cancel_fast_poll := coordinator.async_start_fast_poll():
+        entry.async_on_unload(cancel_fast_poll)
+    if cancel_bms2_probe := coordinator.async_start_bms2_probe():
+        entry.async_on_unload(cancel_bms2_probe)
+
+    proxy: SolakonModbusProxy | None = None
+    if entry.options.get(CONF_PROXY_ENABLED, False):
+        proxy = SolakonModbusProxy(
+            hub,
+            str(entry.options.get(CONF_PROXY_HOST, DEFAULT_PROXY_HOST)),
+            int(entry.options.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT)),
+            float(entry.options.get(CONF_PROXY_MAX_AGE, DEFAULT_PROXY_MAX_AGE)),
+        )
+        try:
+            await proxy.async_start()
+        except RuntimeError as err:
+            _LOGGER.error("Failed to start Modbus proxy: %s", err)
+            proxy = None
+        else:
+            entry.async_on_unload(proxy.async_stop)
+
+    controller: ZeroExportController | None = None
+    if entry.options.get(CONF_CONTROLLER_INTERVAL, DEFAULT_CONTROLLER_INTERVAL):
+        if entry.options.get(CONF_CONTROLLER_METER):
+            # Started and stopped by its switch entity
+            controller = ZeroExportController(
+                hass, coordinator, ControllerSettings.from_options(entry.options)
+            )
+            entry.async_on_unload(controller.async_disable)
+        else:
+            # Options saved before the zero export controller required a meter
+            _LOGGER.warning(
+                "Zero export control is disabled: it needs a meter of the grid "
+                "connection"
+            )
+
+    peak_shaving: PeakShavingController | None = None
+    if entry.options.get(CONF_PEAK_SHAVING_LIMIT, DEFAULT_PEAK_SHAVING_LIMIT):
+        if entry.options.get(CONF_CONTROLLER_METER):
+            peak_shaving = PeakShavingController(hass, coordinator, entry.options)
+            peak_shaving.async_start()
+            entry.async_on_unload(peak_shaving.async_stop)
+        else:
+            # Options saved before peak shaving required a meter
+            _LOGGER.warning(
+                "Peak shaving is disabled: it needs a meter of the grid connection"
+            )
+
+    schedule = ScheduleExecutor(hass, hub, entry.entry_id)
+    await schedule.async_load()
+    entry.async_on_unload(schedule.async_stop)
+
+    entry.runtime_data = SolakonData(
+        hub=hub,
+        coordinator=coordinator,
+        schedule=schedule,
+        proxy=proxy,
+        controller=controller,
+        peak_shaving=peak_shaving,
+    )
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -48,6 +144,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: SolakonConfigEntry) ->
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: SolakonConfigEntry) -> None:
+    """Remove the stored schedule and register map of a removed entry."""
+    await async_remove_schedule(hass, entry.entry_id)
+    await RegisterMapStore(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: SolakonConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
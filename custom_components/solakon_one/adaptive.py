@@ -0,0 +1,79 @@
+"""Adaptive poll interval for Solakon ONE."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+# Power registers whose change between polls drives the interval
+ACTIVITY_KEYS = ("active_power", "battery_power", "total_pv_power")
+# Change between two polls (W) above which the device counts as active
+_ACTIVITY_THRESHOLD = 50.0
+# Factors the interval shrinks by when active and grows by when stable
+_SHRINK = 0.5
+_GROWTH = 1.25
+# While PV produces, stable polls stretch the interval to at most this
+# multiple of the minimum; the full maximum is reserved for the night
+_DAY_FACTOR = 4
+
+
+class AdaptivePollInterval:
+    """Poll interval between a minimum and a maximum following the device.
+
+    Each poll compares the power registers with the previous one. A change
+    of more than ``_ACTIVITY_THRESHOLD`` halves the interval; otherwise it
+    grows by a quarter, up to the maximum at night (no PV power) and up to
+    ``_DAY_FACTOR`` times the minimum during the day. Every step is bounded
+    by these factors and the limits. ``reset`` returns to the minimum, e.g.
+    after a write.
+    """
+
+    def __init__(self, minimum: float, maximum: float) -> None:
+        """Initialize the interval at its minimum."""
+        self.minimum = minimum
+        self.maximum = maximum
+        self.interval = minimum
+        self._previous: dict[str, float] = {}
+
+    def update(self, data: Mapping[str, Any]) -> float:
+        """Adapt the interval to a poll's data and return it."""
+        current = {
+            key: float(value)
+            for key in ACTIVITY_KEYS
+            if isinstance(value := data.get(key), (int, float))
+        }
+        change = max(
+            (
+                abs(value - self._previous[key])
+                for key, value in current.items()
+                if key in self._previous
+            ),
+            default=0.0,
+        )
+        self._previous = current
+
+        if change > _ACTIVITY_THRESHOLD:
+            self.interval = max(self.minimum, self.interval * _SHRINK)
+        else:
+            ceiling = self.maximum
+            if current.get("total_pv_power", 0.0) > 0:
+                ceiling = min(ceiling, self.minimum * _DAY_FACTOR)
+            # A lowered ceiling pulls the interval down in bounded steps too
+            self.interval = max(
+                min(ceiling, self.interval * _GROWTH), self.interval * _SHRINK
+            )
+        return self.interval
+
+    def reset(self) -> bool:
+        """Return to the minimum interval; return whether it changed."""
+        changed = self.interval != self.minimum
+        self.interval = self.minimum
+        return changed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the interval state for diagnostics."""
+        return {
+            "interval": self.interval,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+        }
@@ -15,6 +15,8 @@ from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .const import EDGE_WORDS
+from .edges import BitEdge, bit_name
 from .entity import SolakonEntity
 from .types import SolakonConfigEntry
 
@@ -47,6 +49,35 @@ BINARY_SENSOR_ENTITY_DESCRIPTIONS: tuple[SolakonBinarySensorEntityDescription, .
 )
 
 
+@dataclass(frozen=True, kw_only=True)
+class SolakonBitBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Solakon binary sensor entity description for one bit of a word."""
+
+    word: str
+    bit: int
+
+
+# One binary sensor per bit of the tracked alarm and status words
+BIT_BINARY_SENSOR_ENTITY_DESCRIPTIONS: tuple[
+    SolakonBitBinarySensorEntityDescription, ...
+] = tuple(
+    SolakonBitBinarySensorEntityDescription(
+        key=bit_name(word, bit),
+        translation_key=f"{word.rsplit('_', 1)[0]}_bit",
+        translation_placeholders={"index": word.rsplit("_", 1)[1], "bit": str(bit)},
+        device_class=(
+            BinarySensorDeviceClass.PROBLEM if word.startswith("alarm") else None
+        ),
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        word=word,
+        bit=bit,
+    )
+    for word in EDGE_WORDS
+    for bit in range(16)
+)
+
+
 async def async_setup_entry(
     _: HomeAssistant,
     config_entry: SolakonConfigEntry,
@@ -56,7 +87,7 @@ async def async_setup_entry(
     # Get device info for all binary sensors
     device_info = await config_entry.runtime_data.hub.async_get_device_info()
 
-    entities: list[SolakonBinarySensor] = []
+    entities: list[SolakonBinarySensor | SolakonBitBinarySensor] = []
     entities.extend(
         SolakonBinarySensor(
             config_entry,
@@ -65,6 +96,14 @@ async def async_setup_entry(
         )
         for description in BINARY_SENSOR_ENTITY_DESCRIPTIONS
     )
+    entities.extend(
+        SolakonBitBinarySensor(
+            config_entry,
+            device_info,
+            description,
+        )
+        for description in BIT_BINARY_SENSOR_ENTITY_DESCRIPTIONS
+    )
     if entities:
         async_add_entities(entities, True)
 
@@ -92,7 +131,7 @@ class SolakonBinarySensor(SolakonEntity, BinarySensorEntity):
             else self.entity_description.key
         )
 
-        if self.coordinator.data and key in self.coordinator.data:
+        if self.coordinator.data is not None and key in self.coordinator.data:
             value = self.coordinator.data[key]
             if self.entity_description.value_fn and value is not None:
                 self._attr_is_on = self.entity_description.value_fn(value)
@@ -107,3 +146,66 @@ class SolakonBinarySensor(SolakonEntity, BinarySensorEntity):
     def available(self) -> bool:
         """Return if entity is available."""
         return self.coordinator.last_update_success and self._attr_is_on is not None
+
+
+class SolakonBitBinarySensor(SolakonEntity, BinarySensorEntity):
+    """Binary sensor for one bit of an alarm or status word.
+
+    The state is written when the bit flips or the availability changes,
+    not on every poll.
+    """
+
+    entity_description: SolakonBitBinarySensorEntityDescription
+
+    def __init__(
+        self,
+        config_entry: SolakonConfigEntry,
+        device_info: dict,
+        description: SolakonBitBinarySensorEntityDescription,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(config_entry, device_info, description.key)
+        self.entity_description = description
+        self._attr_translation_key = description.translation_key
+        self._attr_translation_placeholders = dict(
+            description.translation_placeholders or {}
+        )
+        self._last_available: bool | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to flips of the bit."""
+        await super().async_added_to_hass()
+        self._attr_is_on = self.coordinator.edges.value(
+            self.entity_description.word, self.entity_description.bit
+        )
+        self._last_available = self.available
+        self.async_on_remove(
+            self.coordinator.async_add_edge_listener(
+                self.entity_description.word,
+                self.entity_description.bit,
+                self._handle_edge,
+            )
+        )
+
+    @callback
+    def _handle_edge(self, edge: BitEdge) -> None:
+        """Handle a flip of the bit."""
+        self._attr_is_on = edge.new
+        self._last_available = self.available
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write the state when the availability changed."""
+        if self._attr_is_on is None:
+            self._attr_is_on = self.coordinator.edges.value(
+                self.entity_description.word, self.entity_description.bit
+            )
+        if (available := self.available) != self._last_available:
+            self._last_available = available
+            self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return self.coordinator.last_update_success and self._attr_is_on is not None
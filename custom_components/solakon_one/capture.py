@@ -0,0 +1,301 @@
+"""Record and replay of raw Modbus traffic for Solakon ONE.
+
+Captures are append-only binary files. Each file starts with ``MAGIC``,
+followed by records of ``RECORD_HEADER`` and ``words`` big-endian words:
+
+    timestamp   f64   monotonic time the request was sent
+    duration    f32   seconds until the response arrived
+    function    u8    Modbus function code (3, 6 or 16)
+    flags       u8    bit 0: error response / exception
+    address     u16   start address
+    count       u16   registers requested or written
+    words       u16   number of register words that follow
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, defaultdict, deque
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from itertools import pairwise
+import logging
+import os
+import struct
+import time
+from typing import Any
+
+from pymodbus.pdu import ExceptionResponse
+from pymodbus.pdu.register_message import (
+    ReadHoldingRegistersResponse,
+    WriteMultipleRegistersResponse,
+    WriteSingleRegisterResponse,
+)
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"SKCAP\x01"
+RECORD_HEADER = struct.Struct("<dfBBHHH")
+
+FUNCTION_READ_HOLDING_REGISTERS = 3
+FUNCTION_WRITE_SINGLE_REGISTER = 6
+FUNCTION_WRITE_MULTIPLE_REGISTERS = 16
+
+FLAG_ERROR = 0x01
+
+# Buffered bytes are handed to the executor once this size is reached
+_FLUSH_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class CaptureRecord:
+    """One recorded Modbus transaction."""
+
+    timestamp: float
+    duration: float
+    function: int
+    error: bool
+    address: int
+    count: int
+    registers: tuple[int, ...]
+
+
+def encode_record(record: CaptureRecord) -> bytes:
+    """Encode a record to its binary representation."""
+    return RECORD_HEADER.pack(
+        record.timestamp,
+        record.duration,
+        record.function,
+        FLAG_ERROR if record.error else 0,
+        record.address,
+        record.count,
+        len(record.registers),
+    ) + struct.pack(f">{len(record.registers)}H", *record.registers)
+
+
+def read_capture(path: str) -> list[CaptureRecord]:
+    """Read all records of a capture file (blocking)."""
+    with open(path, "rb") as file:
+        data = file.read()
+
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a Solakon ONE capture file")
+
+    records: list[CaptureRecord] = []
+    pos = len(MAGIC)
+    while pos + RECORD_HEADER.size <= len(data):
+        timestamp, duration, function, flags, address, count, words = (
+            RECORD_HEADER.unpack_from(data, pos)
+        )
+        pos += RECORD_HEADER.size
+        if pos + 2 * words > len(data):
+            # Truncated trailing record, e.g. after a crash during a write
+            break
+        registers = struct.unpack_from(f">{words}H", data, pos)
+        pos += 2 * words
+        records.append(
+            CaptureRecord(
+                timestamp,
+                duration,
+                function,
+                bool(flags & FLAG_ERROR),
+                address,
+                count,
+                registers,
+            )
+        )
+    return records
+
+
+class ModbusTrafficRecorder:
+    """Append Modbus transactions of a hub to a rotating capture file."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        path: str,
+        max_bytes: int,
+        backup_count: int,
+    ) -> None:
+        """Initialize the recorder."""
+        self._hass = hass
+        self.path = path
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._buffer = bytearray()
+        self._write_lock = asyncio.Lock()
+        self.records = 0
+
+    def record(
+        self,
+        timestamp: float,
+        duration: float,
+        function: int,
+        error: bool,
+        address: int,
+        count: int,
+        registers: Sequence[int],
+    ) -> None:
+        """Buffer a transaction and flush the buffer when it is large enough."""
+        self._buffer += encode_record(
+            CaptureRecord(
+                timestamp, duration, function, error, address, count, tuple(registers)
+            )
+        )
+        self.records += 1
+        if len(self._buffer) >= _FLUSH_SIZE:
+            self._hass.async_create_task(self.async_flush())
+
+    async def async_flush(self) -> None:
+        """Write buffered records to the capture file."""
+        async with self._write_lock:
+            if not self._buffer:
+                return
+            chunk = bytes(self._buffer)
+            self._buffer.clear()
+            await self._hass.async_add_executor_job(self._write, chunk)
+
+    def _write(self, chunk: bytes) -> None:
+        """Append a chunk, rotating the file when it would exceed the limit."""
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if size and size + len(chunk) > self._max_bytes:
+            self._rotate()
+            size = 0
+        with open(self.path, "ab") as file:
+            if size == 0:
+                file.write(MAGIC)
+            file.write(chunk)
+
+    def _rotate(self) -> None:
+        """Shift ``path.N`` backups and move the current file to ``path.1``."""
+        if self._backup_count <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self._backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+class ReplayModbusClient:
+    """Modbus client that answers from a capture instead of a device.
+
+    Responses for a request are served in recorded order per function code,
+    address and count, and wrap around when a sequence is exhausted. The
+    recorded response time is reproduced, divided by ``speed``; a speed of
+    0 answers immediately.
+    """
+
+    def __init__(self, records: list[CaptureRecord], speed: float = 1.0) -> None:
+        """Initialize the replay client."""
+        self.records = records
+        self._speed = speed
+        self._responses: dict[tuple[int, int, int], deque[CaptureRecord]] = defaultdict(
+            deque
+        )
+        for record in records:
+            self._responses[(record.function, record.address, record.count)].append(
+                record
+            )
+        self.connected = False
+
+    async def connect(self) -> bool:
+        """Pretend to connect."""
+        self.connected = True
+        return True
+
+    def close(self) -> None:
+        """Pretend to disconnect."""
+        self.connected = False
+
+    async def _next(self, function: int, address: int, count: int) -> CaptureRecord:
+        """Return the next recorded response and wait its recorded duration."""
+        queue = self._responses.get((function, address, count))
+        if not queue:
+            return CaptureRecord(0.0, 0.0, function, True, address, count, ())
+        record = queue.popleft()
+        queue.append(record)
+        if self._speed > 0 and record.duration > 0:
+            await asyncio.sleep(record.duration / self._speed)
+        return record
+
+    async def read_holding_registers(
+        self, address: int, *, count: int = 1, device_id: int = 1
+    ) -> ReadHoldingRegistersResponse | ExceptionResponse:
+        """Replay a holding register read."""
+        record = await self._next(FUNCTION_READ_HOLDING_REGISTERS, address, count)
+        if record.error:
+            return ExceptionResponse(FUNCTION_READ_HOLDING_REGISTERS, 0x04, device_id)
+        return ReadHoldingRegistersResponse(
+            registers=list(record.registers), dev_id=device_id
+        )
+
+    async def write_register(
+        self, address: int, value: int, *, device_id: int = 1
+    ) -> WriteSingleRegisterResponse | ExceptionResponse:
+        """Replay a single register write."""
+        record = await self._next(FUNCTION_WRITE_SINGLE_REGISTER, address, 1)
+        if record.error:
+            return ExceptionResponse(FUNCTION_WRITE_SINGLE_REGISTER, 0x04, device_id)
+        return WriteSingleRegisterResponse(
+            address=address, registers=[value], dev_id=device_id
+        )
+
+    async def write_registers(
+        self, address: int, values: list[int], *, device_id: int = 1
+    ) -> WriteMultipleRegistersResponse | ExceptionResponse:
+        """Replay a multiple register write."""
+        record = await self._next(
+            FUNCTION_WRITE_MULTIPLE_REGISTERS, address, len(values)
+        )
+        if record.error:
+            return ExceptionResponse(FUNCTION_WRITE_MULTIPLE_REGISTERS, 0x04, device_id)
+        return WriteMultipleRegistersResponse(
+            address=address, count=len(values), dev_id=device_id
+        )
+
+    def poll_gaps(self) -> list[float]:
+        """Return the recorded gaps between polls.
+
+        Polls are recognized by the most frequently read address and count,
+        which is a batch of the dynamic register plan.
+        """
+        reads = Counter(
+            (record.address, record.count)
+            for record in self.records
+            if record.function == FUNCTION_READ_HOLDING_REGISTERS
+        )
+        if not reads:
+            return []
+        marker = reads.most_common(1)[0][0]
+        starts = [
+            record.timestamp
+            for record in self.records
+            if record.function == FUNCTION_READ_HOLDING_REGISTERS
+            and (record.address, record.count) == marker
+        ]
+        return [end - start for start, end in pairwise(starts)]
+
+
+async def async_replay_polls(
+    hub_poll: Callable[[], Awaitable[Any]],
+    client: ReplayModbusClient,
+    speed: float = 0.0,
+) -> list[float]:
+    """Drive ``hub_poll`` once per recorded poll and return each poll's duration.
+
+    Polls are spaced by the recorded gaps divided by ``speed``; a speed of 0
+    runs them back to back, which is what benchmarks usually want.
+    """
+    durations: list[float] = []
+    gaps = client.poll_gaps()
+    for index in range(len(gaps) + 1):
+        start = time.perf_counter()
+        await hub_poll()
+        durations.append(time.perf_counter() - start)
+        if speed > 0 and index < len(gaps):
+            await asyncio.sleep(max(0.0, gaps[index] / speed - durations[-1]))
+    return durations
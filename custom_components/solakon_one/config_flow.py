@@ -8,16 +8,58 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL, UnitOfTime
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    UnitOfPower,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_validation as cv, selector
 
 from .const import (
+    CONF_CONTROLLER_DEADBAND,
+    CONF_CONTROLLER_INTERVAL,
+    CONF_CONTROLLER_KI,
+    CONF_CONTROLLER_KP,
+    CONF_CONTROLLER_MAX_OUTPUT,
+    CONF_CONTROLLER_METER,
+    CONF_CONTROLLER_METER_INVERTED,
+    CONF_CONTROLLER_MIN_OUTPUT,
+    CONF_CONTROLLER_SLEW_RATE,
+    CONF_CONTROLLER_TARGET,
     CONF_DEVICE_ID,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_PEAK_SHAVING_HYSTERESIS,
+    CONF_PEAK_SHAVING_LIMIT,
+    CONF_POWER_RAMP_RATE,
+    CONF_PROXY_ENABLED,
+    CONF_PROXY_HOST,
+    CONF_PROXY_MAX_AGE,
+    CONF_PROXY_PORT,
+    DEFAULT_CONTROLLER_DEADBAND,
+    DEFAULT_CONTROLLER_INTERVAL,
+    DEFAULT_CONTROLLER_KI,
+    DEFAULT_CONTROLLER_KP,
+    DEFAULT_CONTROLLER_MAX_OUTPUT,
+    DEFAULT_CONTROLLER_MIN_OUTPUT,
+    DEFAULT_CONTROLLER_SLEW_RATE,
+    DEFAULT_CONTROLLER_TARGET,
     DEFAULT_DEVICE_ID,
+    DEFAULT_FAST_POLL_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
     DEFAULT_NAME,
+    DEFAULT_PEAK_SHAVING_HYSTERESIS,
+    DEFAULT_PEAK_SHAVING_LIMIT,
+    DEFAULT_POWER_RAMP_RATE,
     DEFAULT_PORT,
+    DEFAULT_PROXY_HOST,
+    DEFAULT_PROXY_MAX_AGE,
+    DEFAULT_PROXY_PORT,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
 )
@@ -37,6 +79,25 @@ SCAN_INTERVAL_NUMBER_SELECTOR = selector.NumberSelector(
     ),
 )
 
+CONTROLLER_POWER_NUMBER_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        mode=selector.NumberSelectorMode.BOX,
+        min=-1200,
+        max=1200,
+        step=10,
+        unit_of_measurement=UnitOfPower.WATT,
+    ),
+)
+
+CONTROLLER_GAIN_NUMBER_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        mode=selector.NumberSelectorMode.BOX,
+        min=0,
+        max=10,
+        step=0.01,
+    ),
+)
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_HOST): str,
@@ -63,6 +124,130 @@ STEP_OPTIONS_DATA_SCHEMA = vol.Schema(
         vol.Optional(
             CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL
         ): SCAN_INTERVAL_NUMBER_SELECTOR,
+        vol.Optional(
+            CONF_MAX_SCAN_INTERVAL, default=DEFAULT_MAX_SCAN_INTERVAL
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                mode=selector.NumberSelectorMode.BOX,
+                min=0,
+                max=3600,
+                step=1,
+                unit_of_measurement=UnitOfTime.SECONDS,
+            ),
+        ),
+        vol.Optional(
+            CONF_FAST_POLL_INTERVAL, default=DEFAULT_FAST_POLL_INTERVAL
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                mode=selector.NumberSelectorMode.BOX,
+                min=0,
+                max=10,
+                step=0.1,
+                unit_of_measurement=UnitOfTime.SECONDS,
+            ),
+        ),
+        vol.Optional(
+            CONF_CONTROLLER_INTERVAL, default=DEFAULT_CONTROLLER_INTERVAL
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                mode=selector.NumberSelectorMode.BOX,
+                min=0,
+                max=60,
+                step=0.1,
+                unit_of_measurement=UnitOfTime.SECONDS,
+            ),
+        ),
+        vol.Optional(CONF_CONTROLLER_METER): selector.EntitySelector(
+            selector.EntitySelectorConfig(
+                domain="sensor", device_class=SensorDeviceClass.POWER
+            ),
+        ),
+        vol.Optional(CONF_CONTROLLER_METER_INVERTED, default=False): bool,
+        vol.Optional(
+            CONF_CONTROLLER_TARGET, default=DEFAULT_CONTROLLER_TARGET
+        ): CONTROLLER_POWER_NUMBER_SELECTOR,
+        vol.Optional(
+            CONF_CONTROLLER_KP, default=DEFAULT_CONTROLLER_KP
+        ): CONTROLLER_GAIN_NUMBER_SELECTOR,
+        vol.Optional(
+            CONF_CONTROLLER_KI, default=DEFAULT_CONTROLLER_KI
+        ): CONTROLLER_GAIN_NUMBER_SELECTOR,
+        vol.Optional(
+            CONF_CONTROLLER_DEADBAND, default=DEFAULT_CONTROLLER_DEADBAND
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                mode=selector.NumberSelectorMode.BOX,
+                min=0,
+                max=500,
+                step=1,
+                unit_of_measurement=UnitOfPower.WATT,
+            ),
+        ),
+        vol.Optional(
+            CONF_CONTROLLER_SLEW_RATE, default=DEFAULT_CONTROLLER_SLEW_RATE
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                mode=selector.NumberSelectorMode.BOX,
+                min=0,
+                max=5000,
+                step=10,
+                unit_of_measurement="W/s",
+            ),
+        ),
+        vol.Optional(
+            CONF_CONTROLLER_MIN_OUTPUT, default=DEFAULT_CONTROLLER_MIN_OUTPUT
+        ): CONTROLLER_POWER_NUMBER_SELECTOR,
+        vol.Optional(
+            CONF_CONTROLLER_MAX_OUTPUT, default=DEFAULT_CONTROLLER_MAX_OUTPUT
+        ): CONTROLLER_POWER_NUMBER_SELECTOR,
+        vol.Optional(
+            CONF_PEAK_SHAVING_LIMIT, default=DEFAULT_PEAK_SHAVING_LIMIT
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                mode=selector.NumberSelectorMode.BOX,
+                min=0,
+                max=100000,
+                step=10,
+                unit_of_measurement=UnitOfPower.WATT,
+            ),
+        ),
+        vol.Optional(
+            CONF_PEAK_SHAVING_HYSTERESIS, default=DEFAULT_PEAK_SHAVING_HYSTERESIS
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                mode=selector.NumberSelectorMode.BOX,
+                min=0,
+                max=1000,
+                step=10,
+                unit_of_measurement=UnitOfPower.WATT,
+            ),
+        ),
+        vol.Optional(
+            CONF_POWER_RAMP_RATE, default=DEFAULT_POWER_RAMP_RATE
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                mode=selector.NumberSelectorMode.BOX,
+                min=0,
+                max=5000,
+                step=10,
+                unit_of_measurement="W/s",
+            ),
+        ),
+        vol.Optional(CONF_PROXY_ENABLED, default=False): bool,
+        vol.Optional(CONF_PROXY_HOST, default=DEFAULT_PROXY_HOST): cv.string,
+        vol.Optional(CONF_PROXY_PORT, default=DEFAULT_PROXY_PORT): cv.port,
+        vol.Optional(CONF_PROXY_MAX_AGE, default=DEFAULT_PROXY_MAX_AGE): vol.All(
+            selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    mode=selector.NumberSelectorMode.BOX,
+                    min=0,
+                    max=3600,
+                    step=1,
+                    unit_of_measurement=UnitOfTime.SECONDS,
+                ),
+            ),
+            vol.Coerce(int),
+        ),
     }
 )
 
@@ -142,13 +327,23 @@ class OptionsFlowHandler(config_entries.OptionsFlowWithReload):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(data=user_input)
+            # Without a meter only the device's own power is known, not the
+            # export or import of the house
+            if not user_input.get(CONF_CONTROLLER_METER):
+                if user_input.get(CONF_CONTROLLER_INTERVAL):
+                    errors[CONF_CONTROLLER_METER] = "controller_meter_required"
+                elif user_input.get(CONF_PEAK_SHAVING_LIMIT):
+                    errors[CONF_CONTROLLER_METER] = "peak_shaving_meter_required"
+            if not errors:
+                return self.async_create_entry(data=user_input)
 
         return self.async_show_form(
             step_id="init",
+            errors=errors,
             data_schema=self.add_suggested_values_to_schema(
                 STEP_OPTIONS_DATA_SCHEMA,
-                self._config_entry.options or self._config_entry.data,
+                user_input or self._config_entry.options or self._config_entry.data,
             ),
         )
@@ -7,6 +7,25 @@ from homeassistant.const import Platform
 DOMAIN: Final = "solakon_one"
 
 CONF_DEVICE_ID: Final = "slave_id"
+CONF_PROXY_ENABLED: Final = "proxy_enabled"
+CONF_PROXY_HOST: Final = "proxy_host"
+CONF_PROXY_PORT: Final = "proxy_port"
+CONF_PROXY_MAX_AGE: Final = "proxy_max_age"
+CONF_FAST_POLL_INTERVAL: Final = "fast_poll_interval"
+CONF_CONTROLLER_INTERVAL: Final = "controller_interval"
+CONF_CONTROLLER_METER: Final = "controller_meter"
+CONF_CONTROLLER_METER_INVERTED: Final = "controller_meter_inverted"
+CONF_CONTROLLER_TARGET: Final = "controller_target"
+CONF_CONTROLLER_KP: Final = "controller_kp"
+CONF_CONTROLLER_KI: Final = "controller_ki"
+CONF_CONTROLLER_DEADBAND: Final = "controller_deadband"
+CONF_CONTROLLER_SLEW_RATE: Final = "controller_slew_rate"
+CONF_CONTROLLER_MIN_OUTPUT: Final = "controller_min_output"
+CONF_CONTROLLER_MAX_OUTPUT: Final = "controller_max_output"
+CONF_PEAK_SHAVING_LIMIT: Final = "peak_shaving_limit"
+CONF_PEAK_SHAVING_HYSTERESIS: Final = "peak_shaving_hysteresis"
+CONF_POWER_RAMP_RATE: Final = "power_ramp_rate"
+CONF_MAX_SCAN_INTERVAL: Final = "max_scan_interval"
 
 DEFAULT_MANUFACTURER: Final = "Solakon"
 DEFAULT_MODEL: Final = "ONE"
@@ -14,16 +33,59 @@ DEFAULT_NAME: Final = "Solakon ONE"
 DEFAULT_PORT: Final = 502
 DEFAULT_DEVICE_ID: Final = 1
 DEFAULT_SCAN_INTERVAL: Final = 30
+DEFAULT_PROXY_HOST: Final = "127.0.0.1"
+DEFAULT_PROXY_PORT: Final = 5020
+DEFAULT_PROXY_MAX_AGE: Final = 30
+DEFAULT_FAST_POLL_INTERVAL: Final = 0
+DEFAULT_CONTROLLER_INTERVAL: Final = 0
+DEFAULT_CONTROLLER_TARGET: Final = 0
+DEFAULT_CONTROLLER_KP: Final = 0.5
+DEFAULT_CONTROLLER_KI: Final = 0.2
+DEFAULT_CONTROLLER_DEADBAND: Final = 20
+DEFAULT_CONTROLLER_SLEW_RATE: Final = 200
+DEFAULT_CONTROLLER_MIN_OUTPUT: Final = 0
+DEFAULT_CONTROLLER_MAX_OUTPUT: Final = 800
+DEFAULT_PEAK_SHAVING_LIMIT: Final = 0
+DEFAULT_PEAK_SHAVING_HYSTERESIS: Final = 100
+DEFAULT_POWER_RAMP_RATE: Final = 0
+DEFAULT_MAX_SCAN_INTERVAL: Final = 0
+
+ATTR_CONFIG_ENTRY_ID: Final = "config_entry_id"
+
+EVENT_STATUS_BIT_CHANGED: Final = f"{DOMAIN}_status_bit_changed"
+# Bitfield words whose bits are tracked for edges
+EDGE_WORDS: Final = ("status_1", "alarm_1", "alarm_2", "alarm_3")
+# Registers read at the fast poll interval, if enabled
+FAST_POLL_KEYS: Final = ("active_power", "battery_power", "total_pv_power")
+# Registers of the second battery module, only polled while it is detected
+BMS2_KEYS: Final = (
+    "bms2_ambient_temp",
+    "bms2_max_temp",
+    "bms2_min_temp",
+    "bms2_soc",
+    "bms2_soh",
+)
+# Interval of the probes for a second battery module while it is absent (s)
+BMS2_PROBE_INTERVAL: Final = 3600
+# Polls a value of a failed batch read is kept for before it is dropped
+STALE_POLLS: Final = 3
+# Poll priorities of registers. When polls overrun their interval, batches of
+# only lower-priority registers are shed first; unmarked registers are core
+PRIORITY_LOW: Final = 0
+PRIORITY_MEDIUM: Final = 1
+PRIORITY_CORE: Final = 2
 
 PLATFORMS = [
     Platform.BINARY_SENSOR,
     Platform.NUMBER,
     Platform.SELECT,
     Platform.SENSOR,
+    Platform.SWITCH,
 ]
 
 # fmt: off
-# Register definitions
+# Register definitions. Registers sharing a "group" are read in one request,
+# so the values of a group are sampled together.
 REGISTERS = {
     # Model Information (Table 3-1)
     "model_name": {"address": 30000, "count": 16, "type": "string", "static": True},
@@ -31,21 +93,21 @@ REGISTERS = {
     "mfg_id": {"address": 30032, "count": 16, "type": "string", "static": True},
 
     # Version Information (Table 3-2)
-    "inverter_version": {"address": 36001, "count": 1, "type": "u16"}, # master_version
-    "slave_version": {"address": 36002, "count": 1, "type": "u16"},
-    "pv_version": {"address": 36003, "count": 1, "type": "u16"}, # manager_version
+    "inverter_version": {"address": 36001, "count": 1, "type": "u16", "priority": PRIORITY_LOW}, # master_version
+    "slave_version": {"address": 36002, "count": 1, "type": "u16", "priority": PRIORITY_LOW},
+    "pv_version": {"address": 36003, "count": 1, "type": "u16", "priority": PRIORITY_LOW}, # manager_version
 
     # Battery Version Information (Table 3-3)
-    "bms1_version": {"address": 37003, "count": 1, "type": "u16"}, # bms1_master_version
+    "bms1_version": {"address": 37003, "count": 1, "type": "u16", "priority": PRIORITY_LOW}, # bms1_master_version
     "bms1_design_energy": {"address": 37635, "count": 1, "type": "i16", "scale": 0.1, "unit": "Wh"},
 
     "bms1_max_cell_voltage": {"address": 37619, "count": 1, "type": "u16", "scale": 1, "unit": "mV"},
     "bms1_min_cell_voltage": {"address": 37620, "count": 1, "type": "u16", "scale": 1, "unit": "mV"},
 
     "bms1_soh": {"address": 37624, "count": 1, "type": "u16", "scale": 1, "unit": "%"},
-    "bms2_soh": {"address": 38322, "count": 1, "type": "u16", "scale": 1, "unit": "%"},
+    "bms2_soh": {"address": 38322, "count": 1, "type": "u16", "scale": 1, "unit": "%", "priority": PRIORITY_MEDIUM},
     "bms1_soc": {"address": 37612, "count": 1, "type": "i16", "scale": 1, "unit": "%"},
-    "bms2_soc": {"address": 38310, "count": 1, "type": "i16", "scale": 1, "unit": "%"},
+    "bms2_soc": {"address": 38310, "count": 1, "type": "i16", "scale": 1, "unit": "%", "priority": PRIORITY_MEDIUM},
 
     # Protocol & Device Info (Table 3-5)
     "protocol_version": {"address": 39000, "count": 2, "type": "u32", "static": True},
@@ -59,7 +121,7 @@ REGISTERS = {
     "alarm_1": {"address": 39067, "count": 1, "type": "u16"}, #bitfield16
     "alarm_2": {"address": 39068, "count": 1, "type": "u16"}, #bitfield16
     "alarm_3": {"address": 39069, "count": 1, "type": "u16"}, #bitfield16
-    "grid_standard_code": {"address": 49079, "count": 1, "type": 'u16'},
+    "grid_standard_code": {"address": 49079, "count": 1, "type": 'u16', "priority": PRIORITY_LOW},
 
     # PV Input
     "pv1_voltage": {"address": 39070, "count": 1, "type": "i16", "scale": 10, "unit": "V"},
@@ -74,8 +136,8 @@ REGISTERS = {
     "pv4_voltage": {"address": 39076, "count": 1, "type": "i16", "scale": 10, "unit": "V"},
     "pv4_current": {"address": 39077, "count": 1, "type": "i16", "scale": 100, "unit": "A"},
     "pv4_power": {"address": 39285, "count": 2, "type": "i32", "scale": 1, "unit": "W"},
-    "total_pv_power": {"address": 39118, "count": 2, "type": "i32", "scale": 1, "unit": "W"},
-    "pv_total_energy": {"address": 39601, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
+    "total_pv_power": {"address": 39118, "count": 2, "type": "i32", "scale": 1, "unit": "W", "group": "power"},
+    "pv_total_energy": {"address": 39601, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "priority": PRIORITY_MEDIUM},
 
     # EPS Information
     "eps_voltage": {"address": 39201, "count": 1, "type": "i16", "scale": 10, "unit": "V"},
@@ -87,12 +149,12 @@ REGISTERS = {
     "grid_s_voltage": {"address": 39124, "count": 1, "type": "i16", "scale": 10, "unit": "V"},
     "grid_t_voltage": {"address": 39125, "count": 1, "type": "i16", "scale": 10, "unit": "V"},
     "grid_frequency": {"address": 39139, "count": 1, "type": "i16", "scale": 100, "unit": "Hz"},
-    "active_power": {"address": 39134, "count": 2, "type": "i32", "scale": 1, "unit": "W"},
+    "active_power": {"address": 39134, "count": 2, "type": "i32", "scale": 1, "unit": "W", "group": "power"},
     "reactive_power": {"address": 39136, "count": 2, "type": "i32", "scale": 1000, "unit": "kvar"},
     "power_factor": {"address": 39138, "count": 1, "type": "i16", "scale": 1000},
-    "grid_total_export_energy": {"address": 39621, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
-    "grid_total_import_energy": {"address": 39625, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
-    "grid_export_power_limit": {"address": 46616, "count": 2, "type": "i32", "scale": 1, "unit": "W", "rw": True},
+    "grid_total_export_energy": {"address": 39621, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "priority": PRIORITY_MEDIUM},
+    "grid_total_import_energy": {"address": 39625, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "priority": PRIORITY_MEDIUM},
+    "grid_export_power_limit": {"address": 46616, "count": 2, "type": "i32", "scale": 1, "unit": "W", "rw": True, "priority": PRIORITY_LOW},
 
     # Inverter Information
     "inverter_r_current": {"address": 39126, "count": 2, "type": "i32", "scale": 1000, "unit": "A"},
@@ -107,9 +169,9 @@ REGISTERS = {
     "bms1_ambient_temp": {"address": 37611, "count": 1, "type": "i16", "scale": 10, "unit": "°C"},
     "bms1_max_temp": {"address": 37617, "count": 1, "type": "i16", "scale": 10, "unit": "°C"},
     "bms1_min_temp": {"address": 37618, "count": 1, "type": "i16", "scale": 10, "unit": "°C"},
-    "bms2_ambient_temp": {"address": 38309, "count": 1, "type": "i16", "scale": 10, "unit": "°C"},
-    "bms2_max_temp": {"address": 38315, "count": 1, "type": "i16", "scale": 10, "unit": "°C"},
-    "bms2_min_temp": {"address": 38316, "count": 1, "type": "i16", "scale": 10, "unit": "°C"},
+    "bms2_ambient_temp": {"address": 38309, "count": 1, "type": "i16", "scale": 10, "unit": "°C", "priority": PRIORITY_MEDIUM},
+    "bms2_max_temp": {"address": 38315, "count": 1, "type": "i16", "scale": 10, "unit": "°C", "priority": PRIORITY_MEDIUM},
+    "bms2_min_temp": {"address": 38316, "count": 1, "type": "i16", "scale": 10, "unit": "°C", "priority": PRIORITY_MEDIUM},
 
     # Energy Statistics
     "cumulative_generation": {"address": 39149, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
@@ -118,12 +180,12 @@ REGISTERS = {
     # Battery Information
     "battery1_voltage": {"address": 39227, "count": 1, "type": "i16", "scale": 10, "unit": "V"},
     "battery1_current": {"address": 39228, "count": 2, "type": "i32", "scale": 1000, "unit": "A"},
-    "battery_power": {"address": 39230, "count": 2, "type": "i32", "scale": 1, "unit": "W"},
+    "battery_power": {"address": 39230, "count": 2, "type": "i32", "scale": 1, "unit": "W", "group": "power"},
     "battery_soc": {"address": 39424, "count": 1, "type": "i16", "scale": 1, "unit": "%"},
-    "battery_max_charge_current": {"address": 46607, "count": 1, "type": 'i16', "scale": 10, "unit": 'A', "rw": True},
-    "battery_max_discharge_current": {"address": 46608, "count": 1, "type": 'i16', "scale": 10, "unit": 'A', "rw": True},
-    "battery_total_charge_energy": {"address": 39605, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
-    "battery_total_discharge_energy": {"address": 39609, "count": 2, "type": "u32", "scale": 100, "unit": "kWh"},
+    "battery_max_charge_current": {"address": 46607, "count": 1, "type": 'i16', "scale": 10, "unit": 'A', "rw": True, "priority": PRIORITY_LOW},
+    "battery_max_discharge_current": {"address": 46608, "count": 1, "type": 'i16', "scale": 10, "unit": 'A', "rw": True, "priority": PRIORITY_LOW},
+    "battery_total_charge_energy": {"address": 39605, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "priority": PRIORITY_MEDIUM},
+    "battery_total_discharge_energy": {"address": 39609, "count": 2, "type": "u32", "scale": 100, "unit": "kWh", "priority": PRIORITY_MEDIUM},
 
     # Remote Control Registers (Read/Write)
     "remote_control": {"address": 46001, "count": 1, "type": "u16", "scale": 1, "rw": True},
@@ -133,13 +195,13 @@ REGISTERS = {
     "remote_timeout_countdown": {"address": 46007, "count": 1, "type": "u16", "scale": 1, "unit": "s"},
 
     # Control Registers (Read/Write)
-    "eps_output": {"address": 46613, "count": 1, "type": "u16", "scale": 1, "rw": True},
+    "eps_output": {"address": 46613, "count": 1, "type": "u16", "scale": 1, "rw": True, "priority": PRIORITY_LOW},
     # "import_power_limit": {"address": 46501, "count": 2, "type": "i32", "scale": 1, "unit": "W", "rw": True},
     # "export_peak_limit": {"address": 46504, "count": 2, "type": "i32", "scale": 1, "unit": "W", "rw": True},
-    "minimum_soc": {"address": 46609, "count": 1, "type": "u16", "scale": 1, "unit": "%", "rw": True},
-    "maximum_soc": {"address": 46610, "count": 1, "type": "u16", "scale": 1, "unit": "%", "rw": True},
-    "minimum_soc_ongrid": {"address": 46611, "count": 1, "type": "u16", "scale": 1, "unit": "%", "rw": True},
-    "operating_mode": {"address": 49203, "count": 1, "type": "u16", "scale": 1, "rw": True}, # work_mode
+    "minimum_soc": {"address": 46609, "count": 1, "type": "u16", "scale": 1, "unit": "%", "rw": True, "priority": PRIORITY_LOW},
+    "maximum_soc": {"address": 46610, "count": 1, "type": "u16", "scale": 1, "unit": "%", "rw": True, "priority": PRIORITY_LOW},
+    "minimum_soc_ongrid": {"address": 46611, "count": 1, "type": "u16", "scale": 1, "unit": "%", "rw": True, "priority": PRIORITY_LOW},
+    "operating_mode": {"address": 49203, "count": 1, "type": "u16", "scale": 1, "rw": True, "priority": PRIORITY_LOW}, # work_mode
     "network_status": {"address": 49240, "count": 1, "type": "u16", "scale": 1},
 }
 # fmt: on
@@ -0,0 +1,299 @@
+"""Closed-loop control of the remote active power setpoint."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import TYPE_CHECKING, Any, cast
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN, UnitOfPower
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util.unit_conversion import PowerConverter
+
+from .const import (
+    CONF_CONTROLLER_DEADBAND,
+    CONF_CONTROLLER_INTERVAL,
+    CONF_CONTROLLER_KI,
+    CONF_CONTROLLER_KP,
+    CONF_CONTROLLER_MAX_OUTPUT,
+    CONF_CONTROLLER_METER,
+    CONF_CONTROLLER_METER_INVERTED,
+    CONF_CONTROLLER_MIN_OUTPUT,
+    CONF_CONTROLLER_SLEW_RATE,
+    CONF_CONTROLLER_TARGET,
+    DEFAULT_CONTROLLER_DEADBAND,
+    DEFAULT_CONTROLLER_INTERVAL,
+    DEFAULT_CONTROLLER_KI,
+    DEFAULT_CONTROLLER_KP,
+    DEFAULT_CONTROLLER_MAX_OUTPUT,
+    DEFAULT_CONTROLLER_MIN_OUTPUT,
+    DEFAULT_CONTROLLER_SLEW_RATE,
+    DEFAULT_CONTROLLER_TARGET,
+    REGISTERS,
+)
+
+from .modbus import encode_register_value
+
+if TYPE_CHECKING:
+    from .coordinator import SolakonDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Owner of remote control while the loop runs
+_OWNER = "zero_export"
+
+
+@dataclass(frozen=True, kw_only=True)
+class ControllerSettings:
+    """Tuning of the zero export controller."""
+
+    interval: float
+    target: float = DEFAULT_CONTROLLER_TARGET
+    kp: float = DEFAULT_CONTROLLER_KP
+    ki: float = DEFAULT_CONTROLLER_KI
+    deadband: float = DEFAULT_CONTROLLER_DEADBAND
+    slew_rate: float = DEFAULT_CONTROLLER_SLEW_RATE
+    min_output: float = DEFAULT_CONTROLLER_MIN_OUTPUT
+    max_output: float = DEFAULT_CONTROLLER_MAX_OUTPUT
+    meter: str
+    meter_inverted: bool = False
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> ControllerSettings:
+        """Create the settings from config entry options."""
+        return cls(
+            interval=float(
+                options.get(CONF_CONTROLLER_INTERVAL, DEFAULT_CONTROLLER_INTERVAL)
+            ),
+            target=float(
+                options.get(CONF_CONTROLLER_TARGET, DEFAULT_CONTROLLER_TARGET)
+            ),
+            kp=float(options.get(CONF_CONTROLLER_KP, DEFAULT_CONTROLLER_KP)),
+            ki=float(options.get(CONF_CONTROLLER_KI, DEFAULT_CONTROLLER_KI)),
+            deadband=float(
+                options.get(CONF_CONTROLLER_DEADBAND, DEFAULT_CONTROLLER_DEADBAND)
+            ),
+            slew_rate=float(
+                options.get(CONF_CONTROLLER_SLEW_RATE, DEFAULT_CONTROLLER_SLEW_RATE)
+            ),
+            min_output=float(
+                options.get(CONF_CONTROLLER_MIN_OUTPUT, DEFAULT_CONTROLLER_MIN_OUTPUT)
+            ),
+            max_output=float(
+                options.get(CONF_CONTROLLER_MAX_OUTPUT, DEFAULT_CONTROLLER_MAX_OUTPUT)
+            ),
+            meter=options[CONF_CONTROLLER_METER],
+            meter_inverted=bool(options.get(CONF_CONTROLLER_METER_INVERTED, False)),
+        )
+
+
+class PIController:
+    """PI controller in velocity form with output and slew rate limits.
+
+    Each step moves the output by the change of the proportional term plus
+    the integral term of the step. Because the state is the output itself,
+    clamping it to the limits cannot wind up the integrator.
+    """
+
+    def __init__(
+        self,
+        kp: float,
+        ki: float,
+        minimum: float,
+        maximum: float,
+        slew_rate: float,
+    ) -> None:
+        """Initialize the controller."""
+        self.kp = kp
+        self.ki = ki
+        self.minimum = minimum
+        self.maximum = maximum
+        self.slew_rate = slew_rate
+        self.output = 0.0
+        self._error: float | None = None
+
+    def reset(self, output: float) -> None:
+        """Restart from ``output`` without a previous error."""
+        self.output = min(max(output, self.minimum), self.maximum)
+        self._error = None
+
+    def step(self, error: float, dt: float) -> float:
+        """Advance the controller by ``dt`` seconds and return the output."""
+        delta = self.ki * error * dt
+        if self._error is not None:
+            delta += self.kp * (error - self._error)
+        self._error = error
+        if self.slew_rate:
+            limit = self.slew_rate * dt
+            delta = min(max(delta, -limit), limit)
+        self.output = min(max(self.output + delta, self.minimum), self.maximum)
+        return self.output
+
+
+class PowerMeasurement:
+    """Power in W at the grid connection, positive for export.
+
+    The source is a power meter entity. The device's own ``active_power``
+    does not include the load of the house, so it cannot stand in for one.
+    """
+
+    def __init__(self, hass: HomeAssistant, meter: str, meter_inverted: bool) -> None:
+        """Initialize the measurement."""
+        self._hass = hass
+        self.meter = meter
+        self._meter_inverted = meter_inverted
+
+    async def async_read(self) -> float | None:
+        """Return the current measurement."""
+        state = self._hass.states.get(self.meter)
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return None
+        try:
+            value = PowerConverter.convert(
+                float(state.state),
+                state.attributes.get("unit_of_measurement", UnitOfPower.WATT),
+                UnitOfPower.WATT,
+            )
+        except (ValueError, KeyError) as err:
+            _LOGGER.debug("Invalid meter state %s: %s", state.state, err)
+            return None
+        return -value if self._meter_inverted else value
+
+
+class ZeroExportController:
+    """Hold a measured power at a target by writing ``remote_active_power``.
+
+    The measurement is a power meter entity of the grid connection,
+    positive for export. The loop runs at its own interval and
+    writes the setpoint straight through the hub. Control errors and setpoint
+    changes smaller than the deadband are ignored.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: SolakonDataCoordinator,
+        settings: ControllerSettings,
+    ) -> None:
+        """Initialize the controller."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self.settings = settings
+        self.pi = PIController(
+            settings.kp,
+            settings.ki,
+            settings.min_output,
+            settings.max_output,
+            settings.slew_rate,
+        )
+        self.setpoint: int | None = None
+        self.measurement: float | None = None
+        self.writes = 0
+        self.suppressed = 0
+        self._measurement = PowerMeasurement(
+            hass, settings.meter, settings.meter_inverted
+        )
+        self._last_step: float | None = None
+        self._unsub: list[CALLBACK_TYPE] = []
+        self._busy = False
+
+    @property
+    def enabled(self) -> bool:
+        """Return whether the control loop is running."""
+        return bool(self._unsub)
+
+    def step(self, measurement: float, now: float) -> int | None:
+        """Run one controller step and return the setpoint to write, if any."""
+        self.measurement = measurement
+        dt = (
+            min(now - self._last_step, 2 * self.settings.interval)
+            if self._last_step is not None
+            else self.settings.interval
+        )
+        self._last_step = now
+        error = self.settings.target - measurement
+        if abs(error) < self.settings.deadband:
+            # Integrating errors within the deadband only drifts the output
+            # until it crosses the deadband and overshoots the other way
+            error = 0.0
+        output = round(self.pi.step(error, dt))
+        if self.setpoint is not None and (
+            output == self.setpoint
+            or abs(output - self.setpoint) < self.settings.deadband
+        ):
+            self.suppressed += 1
+            return None
+        return output
+
+    @callback
+    def async_enable(self) -> bool:
+        """Start the control loop from the current setpoint.
+
+        Returns False without starting if another subsystem runs remote
+        control.
+        """
+        if self.enabled:
+            return True
+        if not self._coordinator.hub.remote_control.claim(_OWNER):
+            return False
+        data = self._coordinator.data
+        current = data.get("remote_active_power") if data is not None else None
+        self.setpoint = int(current) if current is not None else None
+        self.pi.reset(float(current or 0))
+        self._last_step = None
+        self._unsub.append(
+            async_track_time_interval(
+                self._hass,
+                self._async_step,
+                timedelta(seconds=self.settings.interval),
+                name="Solakon ONE zero export controller",
+                cancel_on_shutdown=True,
+            )
+        )
+        return True
+
+    @callback
+    def async_disable(self) -> None:
+        """Stop the control loop, leaving the last setpoint in place."""
+        while self._unsub:
+            self._unsub.pop()()
+        self._coordinator.hub.remote_control.release(_OWNER)
+
+    async def _async_step(self, _: datetime) -> None:
+        """Measure, step the controller and write the setpoint if it moved."""
+        if self._busy:
+            return
+        self._busy = True
+        try:
+            if (measurement := await self._measurement.async_read()) is None:
+                # Do not integrate across the gap
+                self._last_step = None
+                return
+            if (setpoint := self.step(measurement, time.monotonic())) is None:
+                return
+            config = REGISTERS["remote_active_power"]
+            if await self._coordinator.hub.async_write_registers(
+                cast(int, config["address"]),
+                encode_register_value(config, setpoint),
+            ):
+                self.setpoint = setpoint
+                self.writes += 1
+            else:
+                _LOGGER.warning("Failed to write zero export setpoint %s W", setpoint)
+        finally:
+            self._busy = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the controller state for diagnostics."""
+        return {
+            "enabled": self.enabled,
+            "measurement": self.measurement,
+            "output": self.pi.output,
+            "setpoint": self.setpoint,
+            "writes": self.writes,
+            "suppressed": self.suppressed,
+        }
@@ -3,36 +3,316 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import datetime, timedelta
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .adaptive import AdaptivePollInterval
+from .const import (
+    BMS2_PROBE_INTERVAL,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    DEFAULT_FAST_POLL_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    EDGE_WORDS,
+    EVENT_STATUS_BIT_CHANGED,
+    FAST_POLL_KEYS,
+    STALE_POLLS,
+)
+from .derived import DerivedMetricsEngine
+from .edges import BitEdge, BitEdgeTracker
+from .energy import EnergyIntegrationEngine
 from .modbus import SolakonModbusHub
+from .oversampling import FastSampleAggregator
+from .profiler import CycleProfile
+from .register_image import RegisterSnapshot
+from .scheduler import SolakonPollScheduler
+from .shedding import PollLoadShedder
+from .telemetry import TelemetryBuffers
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class SolakonDataCoordinator(DataUpdateCoordinator):
+class SolakonDataCoordinator(DataUpdateCoordinator[RegisterSnapshot]):
     """Class to manage fetching data from Solakon ONE."""
 
-    def __init__(self, hass: HomeAssistant, hub: SolakonModbusHub) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        hub: SolakonModbusHub,
+        scheduler: SolakonPollScheduler,
+    ) -> None:
         """Initialize coordinator."""
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             name="Solakon ONE",
             update_interval=timedelta(seconds=hub.scan_interval),
         )
         self.hub = hub
+        self._scheduler = scheduler
+        self._entry_id = config_entry.entry_id
+        self.poll_phase = scheduler.async_register(self._entry_id)
+        # Only set while a profiling run is active
+        self.profile: CycleProfile | None = None
+        self.edges = BitEdgeTracker(EDGE_WORDS)
+        self._edge_listeners: defaultdict[
+            tuple[str, int], list[Callable[[BitEdge], None]]
+        ] = defaultdict(list)
+        # Metrics are registered by the platforms declaring them
+        self.derived = DerivedMetricsEngine()
+        self.energy = EnergyIntegrationEngine()
+        self.telemetry = TelemetryBuffers(hub.scan_interval)
+        # Fast poll samples are aggregated and published with each refresh
+        self.fast_poll_interval = float(
+            config_entry.options.get(
+                CONF_FAST_POLL_INTERVAL, DEFAULT_FAST_POLL_INTERVAL
+            )
+        )
+        self.fast_samples: FastSampleAggregator | None = (
+            FastSampleAggregator(FAST_POLL_KEYS) if self.fast_poll_interval else None
+        )
+        self._sample_listeners: list[Callable[[dict[str, Any], float], None]] = []
+        self._fast_poll_busy = False
+        # The scan interval is the floor of the adaptive interval, if enabled
+        max_scan_interval = float(
+            config_entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
+        )
+        self.adaptive: AdaptivePollInterval | None = (
+            AdaptivePollInterval(hub.scan_interval, max_scan_interval)
+            if max_scan_interval > hub.scan_interval
+            else None
+        )
+        self.shedder = PollLoadShedder()
+        self._unsub_write: CALLBACK_TYPE | None = (
+            hub.async_add_write_listener(self._handle_write)
+            if self.adaptive is not None
+            else None
+        )
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call and release the poll phase."""
+        await super().async_shutdown()
+        self._scheduler.async_unregister(self._entry_id)
+        if self._unsub_write is not None:
+            self._unsub_write()
+            self._unsub_write = None
+
+    @callback
+    def _handle_write(self) -> None:
+        """Poll at the minimum interval again after a write."""
+        if self.adaptive is not None and self.adaptive.reset():
+            self.update_interval = timedelta(seconds=self.adaptive.interval)
+            self._schedule_refresh()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule the next refresh on this entry's phase-offset grid."""
+        if self._update_interval_seconds is None:
+            return
+
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+
+        self._async_unsub_refresh()
+
+        loop = self.hass.loop
+        next_refresh = self._scheduler.next_refresh(
+            self._entry_id, self._update_interval_seconds, loop.time()
+        )
+        self._unsub_refresh = loop.call_at(
+            next_refresh, self._handle_scheduled_refresh
+        ).cancel
+
+    @callback
+    def _handle_scheduled_refresh(self) -> None:
+        """Start a scheduled refresh in the background.
+
+        The task belongs to the config entry, so unloading the entry cancels
+        a refresh in flight.
+        """
+        name = f"{self.name} - {self._entry_id} - refresh"
+        if self.config_entry is None:
+            self.hass.async_create_background_task(
+                self._handle_refresh_interval(), name=name, eager_start=True
+            )
+            return
+        self.config_entry.async_create_background_task(
+            self.hass, self._handle_refresh_interval(), name=name, eager_start=True
+        )
+
+    async def async_profile(self, cycles: int) -> CycleProfile:
+        """Run and profile ``cycles`` refreshes back to back.
+
+        The profiler sees everything running on the event loop meanwhile,
+        not only this integration.
+        """
+        profile = self.profile = CycleProfile()
+        try:
+            profile.profiler.enable()
+            try:
+                for _ in range(cycles):
+                    start = time.perf_counter()
+                    await self.async_refresh()
+                    profile.add_cycle(time.perf_counter() - start)
+            finally:
+                profile.profiler.disable()
+        finally:
+            self.profile = None
+        return profile
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, timing them while profiling."""
+        if self.profile is None:
+            super().async_update_listeners()
+            return
+        self.profile.update_listeners(
+            [update_callback for update_callback, _ in self._listeners.values()]
+        )
+
+    @callback
+    def async_start_fast_poll(self) -> CALLBACK_TYPE | None:
+        """Start the fast poll loop if enabled and return its cancel callback."""
+        if self.fast_samples is None:
+            return None
+        return async_track_time_interval(
+            self.hass,
+            self._async_fast_poll,
+            timedelta(seconds=self.fast_poll_interval),
+            name=f"{self.name} - {self._entry_id} - fast poll",
+            cancel_on_shutdown=True,
+        )
+
+    @callback
+    def async_start_bms2_probe(self) -> CALLBACK_TYPE | None:
+        """Probe for a second battery module while it is absent.
+
+        Returns the cancel callback of the probe loop, or None if the module
+        is present already.
+        """
+        if self.hub.bms2_present:
+            return None
+        return async_track_time_interval(
+            self.hass,
+            self._async_probe_bms2,
+            timedelta(seconds=BMS2_PROBE_INTERVAL),
+            name=f"{self.name} - {self._entry_id} - BMS2 probe",
+            cancel_on_shutdown=True,
+        )
+
+    async def _async_probe_bms2(self, _: datetime) -> None:
+        """Reload the entry to add the entities of a newly found module."""
+        if self.hub.bms2_present or not await self.hub.async_detect_bms2():
+            return
+        self.hass.config_entries.async_schedule_reload(self._entry_id)
+
+    async def _async_fast_poll(self, _: datetime) -> None:
+        """Read the fast poll registers and pass them to the consumers."""
+        if self.fast_samples is None or self._fast_poll_busy:
+            # Skip this tick rather than queueing reads behind a slow one
+            return
+        self._fast_poll_busy = True
+        try:
+            values = await self.hub.async_read_fast()
+        finally:
+            self._fast_poll_busy = False
+        if not values:
+            return
+
+        timestamp = time.monotonic()
+        self.fast_samples.add(values)
+        for sample_callback in self._sample_listeners:
+            sample_callback(values, timestamp)
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    @callback
+    def async_add_sample_listener(
+        self, sample_callback: Callable[[dict[str, Any], float], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for every fast poll sample (values and monotonic time)."""
+        self._sample_listeners.append(sample_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._sample_listeners.remove(sample_callback)
+
+        return remove_listener
+
+    @callback
+    def async_add_edge_listener(
+        self, word: str, bit: int, edge_callback: Callable[[BitEdge], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for flips of one bit of a tracked word."""
+        listeners = self._edge_listeners[(word, bit)]
+        listeners.append(edge_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(edge_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_process_edges(self, data: RegisterSnapshot) -> None:
+        """Fire events and notify listeners for bits flipped since the last poll."""
+        if not (edges := self.edges.update(data)):
+            return
+
+        timestamp = dt_util.utcnow().isoformat()
+        for edge in edges:
+            _LOGGER.debug("%s changed from %s to %s", edge.name, edge.old, edge.new)
+            self.hass.bus.async_fire(
+                EVENT_STATUS_BIT_CHANGED,
+                {
+                    "config_entry_id": self._entry_id,
+                    "word": edge.word,
+                    "bit": edge.bit,
+                    "name": edge.name,
+                    "old": edge.old,
+                    "new": edge.new,
+                    "timestamp": timestamp,
+                },
+            )
+            for edge_callback in self._edge_listeners.get((edge.word, edge.bit), ()):
+                edge_callback(edge)
+
+    async def _async_update_data(self) -> RegisterSnapshot:
         """Fetch data from Solakon ONE."""
         try:
+            start = time.perf_counter()
             data = await self.hub.async_read_all_data()
+            elapsed = time.perf_counter() - start
+            if self.profile is not None:
+                self.profile.add_read(elapsed)
+            # Polls that overrun their interval shed low-priority batches
+            self.hub.set_shed_priority(
+                self.shedder.update(
+                    elapsed, self._update_interval_seconds or self.hub.scan_interval
+                )
+            )
             if not data:
                 raise UpdateFailed("Failed to fetch data from device")
-            return data
         except Exception as err:
             raise UpdateFailed(f"Error communicating with device: {err}") from err
+
+        self._async_process_edges(data)
+        self.derived.update(data)
+        self.energy.update(data)
+        self.telemetry.update(data)
+        if self.fast_samples is not None:
+            self.fast_samples.publish()
+        if self.adaptive is not None:
+            # Applies from the refresh scheduled after this one
+            self.update_interval = timedelta(seconds=self.adaptive.update(data))
+            self.hub.max_age = STALE_POLLS * self.adaptive.interval
+        return data
@@ -0,0 +1,122 @@
+"""Debounced register writes for Solakon ONE."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+if TYPE_CHECKING:
+    from .modbus import SolakonModbusHub
+
+_LOGGER = logging.getLogger(__name__)
+
+# Time a key must stay unchanged before its value is written (s)
+DEBOUNCE_DELAY = 0.5
+
+type WriteDoneCallback = Callable[[Any], None]
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    """Latest value requested for a key."""
+
+    value: float
+    done: WriteDoneCallback
+    config_entry: ConfigEntry
+    timer: asyncio.TimerHandle
+
+
+class WriteDebouncer:
+    """Write only the last of a burst of values for a register key.
+
+    Each request restarts the key's timer and replaces the pending value.
+    Once no new value arrived for ``DEBOUNCE_DELAY`` seconds, the value is
+    written and the key's registers are read back on their own. The
+    decoded readback, or None if either step failed, is passed to the
+    callback of the latest request. The write runs as a background task of
+    the requesting config entry, so unloading the entry cancels it.
+    """
+
+    def __init__(self, hass: HomeAssistant, hub: SolakonModbusHub) -> None:
+        """Initialize the debouncer."""
+        self._hass = hass
+        self._hub = hub
+        self._pending: dict[str, _PendingWrite] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.requests = 0
+        self.writes = 0
+
+    @property
+    def pending(self) -> dict[str, float]:
+        """Return the values waiting to be written."""
+        return {key: pending.value for key, pending in self._pending.items()}
+
+    @callback
+    def schedule(
+        self,
+        config_entry: ConfigEntry,
+        key: str,
+        value: float,
+        done: WriteDoneCallback,
+    ) -> None:
+        """Write ``value`` to ``key`` unless a newer value follows shortly."""
+        self.requests += 1
+        if (pending := self._pending.get(key)) is not None:
+            pending.timer.cancel()
+        self._pending[key] = _PendingWrite(
+            value,
+            done,
+            config_entry,
+            self._hass.loop.call_later(DEBOUNCE_DELAY, self._handle_timer, key),
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Drop all pending values and cancel writes in flight."""
+        for pending in self._pending.values():
+            pending.timer.cancel()
+        self._pending.clear()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    @callback
+    def _handle_timer(self, key: str) -> None:
+        """Write the settled value in the background."""
+        pending = self._pending.pop(key)
+        task = pending.config_entry.async_create_background_task(
+            self._hass,
+            self._async_write(key, pending),
+            name=f"Solakon ONE debounced write of {key}",
+        )
+        # An eagerly started task may already have finished
+        if not task.done():
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _async_write(self, key: str, pending: _PendingWrite) -> None:
+        """Write a value, read the key back and report the result."""
+        results = await self._hub.async_write_values({key: pending.value})
+        self.writes += 1
+        if not results.get(key, True):
+            _LOGGER.error("Failed to write %s = %s", key, pending.value)
+            pending.done(None)
+            return
+
+        if (value := (await self._hub.async_read_keys((key,)))[key]) is None:
+            _LOGGER.warning("Failed to read back %s after writing it", key)
+        pending.done(value)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the debouncer state for diagnostics."""
+        return {
+            "pending": self.pending,
+            "requests": self.requests,
+            "writes": self.writes,
+        }
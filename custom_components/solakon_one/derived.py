@@ -0,0 +1,68 @@
+"""Derived metrics computed from the register snapshot of each poll."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+import logging
+from typing import Any, Protocol
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DerivedMetric(Protocol):
+    """Declaration of a value derived from register keys."""
+
+    @property
+    def key(self) -> str:
+        """Return the key the value is published under."""
+
+    @property
+    def inputs(self) -> tuple[str, ...]:
+        """Return the register keys the value depends on."""
+
+    @property
+    def derive_fn(self) -> Callable[..., Any]:
+        """Return the function computing the value from the inputs, in order."""
+
+
+class DerivedMetricsEngine:
+    """Compute derived metrics once per snapshot.
+
+    A metric is recomputed only if one of its inputs changed since the last
+    poll; otherwise its previous value is kept. Metrics with a missing input
+    have no value.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the engine."""
+        self._metrics: dict[str, DerivedMetric] = {}
+        self._inputs: dict[str, tuple[Any, ...]] = {}
+        self.values: dict[str, Any] = {}
+        self.recomputed = 0
+
+    def register(self, metrics: Iterable[DerivedMetric]) -> None:
+        """Add metric declarations to the engine."""
+        for metric in metrics:
+            self._metrics[metric.key] = metric
+
+    def update(self, data: Mapping[str, Any]) -> None:
+        """Recompute the metrics whose inputs changed in ``data``."""
+        for key, metric in self._metrics.items():
+            inputs = tuple(data.get(name) for name in metric.inputs)
+            if None in inputs:
+                self._inputs.pop(key, None)
+                self.values.pop(key, None)
+                continue
+            if self._inputs.get(key) == inputs:
+                continue
+            self._inputs[key] = inputs
+            self.recomputed += 1
+            try:
+                value = metric.derive_fn(*inputs)
+            except ArithmeticError as err:
+                _LOGGER.debug("Failed to compute %s: %s", key, err)
+                value = None
+            if value is None:
+                self.values.pop(key, None)
+            else:
+                self.values[key] = value
@@ -6,6 +6,7 @@ from typing import Any
 
 from homeassistant.core import HomeAssistant
 
+from .const import FAST_POLL_KEYS
 from .types import SolakonConfigEntry
 
 
@@ -15,8 +16,33 @@ async def async_get_config_entry_diagnostics(
     """Return diagnostics for a config entry."""
 
     coordinator = config_entry.runtime_data.coordinator
+    controller = config_entry.runtime_data.controller
+    peak_shaving = config_entry.runtime_data.peak_shaving
+    hub = config_entry.runtime_data.hub
 
     return {
         "entry": config_entry.as_dict(),
-        "data": coordinator.data,
+        "data": dict(coordinator.data) if coordinator.data is not None else None,
+        # Time between the reads of the power values derived values combine
+        "power_read_skew": coordinator.data.skew(*FAST_POLL_KEYS)
+        if coordinator.data is not None
+        else None,
+        "controller": controller.as_dict() if controller else None,
+        "peak_shaving": peak_shaving.as_dict() if peak_shaving else None,
+        "remote_control_owner": hub.remote_control.owner,
+        "keepalive": hub.keepalive.as_dict(),
+        "ramp": hub.ramper.as_dict(),
+        "debounced_writes": hub.debouncer.as_dict(),
+        "skipped_writes": {
+            "registers": hub.skipped_writes,
+            "values": hub.skipped_values,
+        },
+        "schedule": config_entry.runtime_data.schedule.as_dict(),
+        "load_shedding": {
+            **coordinator.shedder.as_dict(),
+            "shed_batches": hub.shed_batches,
+        },
+        "adaptive_poll_interval": coordinator.adaptive.as_dict()
+        if coordinator.adaptive
+        else None,
     }
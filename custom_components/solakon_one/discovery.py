@@ -0,0 +1,218 @@
+"""Discovery of the readable register space of a Solakon ONE."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING, Any, cast
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, REGISTERS
+
+if TYPE_CHECKING:
+    from .modbus import SolakonModbusHub
+
+STORAGE_VERSION = 1
+
+# Address ranges swept by a scan, as inclusive (first, last) pairs
+DISCOVERY_RANGES: tuple[tuple[int, int], ...] = (
+    (30000, 30100),
+    (36000, 39700),
+    (46000, 46700),
+    (49000, 49300),
+)
+# Largest number of words a probe reads
+_MAX_PROBE = 125
+
+# Readable address ranges as (start, end) with an exclusive end
+type AddressRanges = list[tuple[int, int]]
+
+
+def merge_ranges(ranges: Iterable[tuple[int, int]]) -> AddressRanges:
+    """Merge overlapping and adjacent ranges."""
+    merged: AddressRanges = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def span_readable(start: int, end: int, readable: Sequence[tuple[int, int]]) -> bool:
+    """Return whether ``[start, end)`` lies within one readable range."""
+    return any(first <= start and end <= last for first, last in readable)
+
+
+def unreadable_ranges(
+    readable: Sequence[tuple[int, int]],
+    ranges: Iterable[tuple[int, int]] = DISCOVERY_RANGES,
+) -> AddressRanges:
+    """Return the parts of inclusive scanned ranges that are not readable."""
+    unreadable: AddressRanges = []
+    for first, last in ranges:
+        current = first
+        for start, end in readable:
+            if end <= current or start > last:
+                continue
+            if start > current:
+                unreadable.append((current, start))
+            current = max(current, end)
+        if current <= last:
+            unreadable.append((current, last + 1))
+    return unreadable
+
+
+class RegisterScanner:
+    """Map the readable register space with as few reads as possible.
+
+    Each range is probed in reads of up to 125 words. When the device
+    answers a probe with an exception response, the readable part at its
+    start is found by bisection. The refused run that follows is skipped
+    with single-word probes at doubling distances (up to a full probe), and
+    its end found by bisecting the last step. Readable and refused words
+    come in runs, so this takes a few dozen reads per hole instead of one
+    per word. A readable island shorter than the step inside a refused run
+    can be skipped; configured registers in refused runs are therefore
+    probed on their own at the end.
+    """
+
+    def __init__(self, hub: SolakonModbusHub) -> None:
+        """Initialize the scanner."""
+        self._hub = hub
+        self.round_trips = 0
+
+    async def async_scan(
+        self, ranges: Sequence[tuple[int, int]] = DISCOVERY_RANGES
+    ) -> AddressRanges:
+        """Return the readable parts of inclusive address ranges."""
+        readable: AddressRanges = []
+        for first, last in ranges:
+            address = first
+            end = last + 1
+            while address < end:
+                count = min(_MAX_PROBE, end - address)
+                if await self._async_readable(address, count):
+                    readable.append((address, address + count))
+                    address += count
+                    continue
+                # Longest readable prefix; the full probe is known to fail
+                low, high = 0, count - 1
+                while low < high:
+                    middle = (low + high + 1) // 2
+                    if await self._async_readable(address, middle):
+                        low = middle
+                    else:
+                        high = middle - 1
+                if low:
+                    readable.append((address, address + low))
+                address = await self._async_skip_refused(address + low, end)
+
+        readable = merge_ranges(readable)
+        probed: set[tuple[int, int]] = set()
+        for config in REGISTERS.values():
+            start = cast(int, config["address"])
+            span = (start, start + cast(int, config.get("count", 1)))
+            if (
+                span not in probed
+                and any(first <= start <= last for first, last in ranges)
+                and not span_readable(*span, readable)
+            ):
+                probed.add(span)
+                if await self._async_readable(span[0], span[1] - span[0]):
+                    readable.append(span)
+        return merge_ranges(readable)
+
+    async def _async_readable(self, address: int, count: int) -> bool:
+        """Return whether the device reads a range."""
+        self.round_trips += 1
+        return await self._hub.async_probe(address, count) is not None
+
+    async def _async_skip_refused(self, refused: int, end: int) -> int:
+        """Return the first readable address after a refused one, or ``end``."""
+        step = 1
+        while True:
+            probe = refused + step
+            if probe >= end:
+                return end
+            if await self._async_readable(probe, 1):
+                break
+            refused = probe
+            step = min(step * 2, _MAX_PROBE)
+        low, high = refused + 1, probe
+        while low < high:
+            middle = (low + high) // 2
+            if await self._async_readable(middle, 1):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+
+def diff_registers(
+    readable: Sequence[tuple[int, int]],
+    ranges: Iterable[tuple[int, int]] = DISCOVERY_RANGES,
+) -> dict[str, Any]:
+    """Compare a readable map with the configured registers.
+
+    Returns the configured keys whose words are not all readable, and the
+    readable ranges within the scanned ranges no configured key covers.
+    """
+    configured: AddressRanges = []
+    unreadable: list[str] = []
+    for key, config in REGISTERS.items():
+        address = cast(int, config["address"])
+        end = address + cast(int, config.get("count", 1))
+        configured.append((address, end))
+        scanned = any(first <= address <= last for first, last in ranges)
+        if scanned and not span_readable(address, end, readable):
+            unreadable.append(key)
+
+    covered = merge_ranges(configured)
+    unmapped: AddressRanges = []
+    for start, end in readable:
+        current = start
+        for first, last in covered:
+            if last <= current or first >= end:
+                continue
+            if first > current:
+                unmapped.append((current, first))
+            current = max(current, last)
+        if current < end:
+            unmapped.append((current, end))
+    return {"unreadable_keys": sorted(unreadable), "unmapped_ranges": unmapped}
+
+
+class RegisterMapStore:
+    """Persist the scanned and readable ranges of a device."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.register_map.{entry_id}"
+        )
+
+    async def async_load_unreadable(self) -> AddressRanges:
+        """Return the unreadable ranges of the stored scan, if any."""
+        if (data := await self._store.async_load()) is None:
+            return []
+        return unreadable_ranges(
+            [(start, end) for start, end in data["readable"]],
+            [(first, last) for first, last in data["ranges"]],
+        )
+
+    async def async_save(
+        self, ranges: Iterable[tuple[int, int]], readable: AddressRanges
+    ) -> None:
+        """Store the result of a scan."""
+        await self._store.async_save(
+            {
+                "ranges": [list(pair) for pair in ranges],
+                "readable": [list(pair) for pair in readable],
+            }
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the stored scan."""
+        await self._store.async_remove()
@@ -0,0 +1,65 @@
+"""Edge detection on the alarm and status bitfield words of Solakon ONE."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class BitEdge:
+    """A single bit of a status or alarm word that changed between polls."""
+
+    word: str
+    bit: int
+    old: bool
+    new: bool
+
+    @property
+    def name(self) -> str:
+        """Return the name of the bit, e.g. ``alarm_1_bit_3``."""
+        return bit_name(self.word, self.bit)
+
+
+def bit_name(word: str, bit: int) -> str:
+    """Return the name of a bit of a word."""
+    return f"{word}_bit_{bit}"
+
+
+class BitEdgeTracker:
+    """Compare consecutive values of bitfield words and report flipped bits.
+
+    The first value seen for a word is taken as the baseline and produces
+    no edges. Words missing from a snapshot keep their last known value.
+    """
+
+    def __init__(self, words: tuple[str, ...]) -> None:
+        """Initialize the tracker."""
+        self.words = words
+        self._values: dict[str, int] = {}
+
+    def value(self, word: str, bit: int) -> bool | None:
+        """Return the last known state of a bit, or None if never read."""
+        if (value := self._values.get(word)) is None:
+            return None
+        return bool(value >> bit & 1)
+
+    def update(self, data: Mapping[str, Any]) -> list[BitEdge]:
+        """Store the words of a snapshot and return the bits that flipped."""
+        edges: list[BitEdge] = []
+        for word in self.words:
+            if (new := data.get(word)) is None:
+                continue
+            new = int(new)
+            old = self._values.get(word)
+            self._values[word] = new
+            if old is None or (changed := old ^ new) == 0:
+                continue
+            # Walk the set bits of the XOR, lowest first
+            while changed:
+                lowest = changed & -changed
+                bit = lowest.bit_length() - 1
+                edges.append(BitEdge(word, bit, bool(old & lowest), bool(new & lowest)))
+                changed ^= lowest
+        return edges
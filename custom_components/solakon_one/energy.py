@@ -0,0 +1,127 @@
+"""Local integration of power readings into energy between counter reads."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Protocol
+
+from .register_image import RegisterSnapshot
+
+# Largest step (kWh) a single counter read may move the integrated value up
+_MAX_CORRECTION = 0.05
+# Deviations beyond this (kWh) are taken as a gap or counter reset and snapped
+_SNAP_THRESHOLD = 1.0
+
+
+class IntegratedEnergy(Protocol):
+    """Declaration of an energy value integrated from a power register."""
+
+    @property
+    def key(self) -> str:
+        """Return the key the value is published under."""
+
+    @property
+    def power_key(self) -> str:
+        """Return the register key of the power (W) to integrate."""
+
+    @property
+    def power_fn(self) -> Callable[[float], float]:
+        """Return the function selecting the integrated part of the power."""
+
+    @property
+    def counter_key(self) -> str:
+        """Return the register key of the device's energy counter (kWh)."""
+
+
+class EnergyIntegrator:
+    """Trapezoidal power integrator anchored to a device energy counter.
+
+    Between counter steps the energy is advanced by the trapezoidal rule
+    over the power readings. Whenever the counter changes the integral is
+    pulled towards it, by at most ``_MAX_CORRECTION`` per step. The value
+    never decreases: if the integral ran ahead of the counter, the excess
+    is absorbed by the following increments instead.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the integrator."""
+        self.value: float | None = None
+        self._counter: float | None = None
+        self._power: float | None = None
+        self._time: float | None = None
+        self._excess = 0.0
+
+    def integrate(self, power: float, timestamp: float) -> None:
+        """Add the energy since the previous power reading."""
+        if (
+            self.value is not None
+            and self._power is not None
+            and self._time is not None
+            and timestamp > self._time
+        ):
+            increment = (self._power + power) / 2 * (timestamp - self._time) / 3600000
+            absorbed = min(increment, self._excess)
+            self._excess -= absorbed
+            self.value += increment - absorbed
+        self._power = power
+        self._time = timestamp
+
+    def anchor(self, counter: float) -> None:
+        """Correct the integral when the device counter moved."""
+        if counter == self._counter:
+            return
+        self._counter = counter
+
+        if self.value is None or abs(counter - self.value) > _SNAP_THRESHOLD:
+            self.value = counter
+            self._excess = 0.0
+            return
+
+        error = counter - self.value
+        if error >= 0:
+            self.value += min(error, _MAX_CORRECTION)
+            self._excess = 0.0
+        else:
+            self._excess = -error
+
+    def reset(self) -> None:
+        """Forget the last power reading, e.g. after a failed poll."""
+        self._power = None
+        self._time = None
+
+
+class EnergyIntegrationEngine:
+    """Run the integrators of all registered energy values once per poll."""
+
+    def __init__(self) -> None:
+        """Initialize the engine."""
+        self._declarations: dict[str, IntegratedEnergy] = {}
+        self._integrators: dict[str, EnergyIntegrator] = {}
+
+    @property
+    def values(self) -> dict[str, float]:
+        """Return the integrated energy (kWh) by key."""
+        return {
+            key: round(integrator.value, 4)
+            for key, integrator in self._integrators.items()
+            if integrator.value is not None
+        }
+
+    def register(self, declarations: Iterable[IntegratedEnergy]) -> None:
+        """Add energy declarations to the engine."""
+        for declaration in declarations:
+            self._declarations[declaration.key] = declaration
+            self._integrators.setdefault(declaration.key, EnergyIntegrator())
+
+    def update(self, data: RegisterSnapshot) -> None:
+        """Integrate the power readings and anchor to the counters of a poll."""
+        for key, declaration in self._declarations.items():
+            integrator = self._integrators[key]
+            power = data.get(declaration.power_key)
+            timestamp = data.timestamp(declaration.power_key)
+            if power is None or timestamp is None:
+                integrator.reset()
+            else:
+                integrator.integrate(declaration.power_fn(power), timestamp)
+            if (counter := data.get(declaration.counter_key)) is not None:
+                integrator.anchor(counter)
@@ -5,10 +5,11 @@ from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DEFAULT_MANUFACTURER, DEFAULT_MODEL, DEFAULT_NAME, DOMAIN
+from .coordinator import SolakonDataCoordinator
 from .types import SolakonConfigEntry
 
 
-class SolakonEntity(CoordinatorEntity, Entity):
+class SolakonEntity(CoordinatorEntity[SolakonDataCoordinator], Entity):
     """Base class for Solakon ONE entities."""
 
     _attr_has_entity_name = True
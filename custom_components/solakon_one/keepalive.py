@@ -0,0 +1,202 @@
+"""Keepalive of the remote control timeout for Solakon ONE."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Mapping, Sequence
+import logging
+import math
+import time
+from typing import TYPE_CHECKING, Any, cast
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import REGISTERS
+
+if TYPE_CHECKING:
+    from .modbus import SolakonModbusHub
+
+_LOGGER = logging.getLogger(__name__)
+
+COUNTDOWN_KEY = "remote_timeout_countdown"
+TIMEOUT_KEY = "remote_timeout_set"
+_TIMEOUT_ADDRESS = cast(int, REGISTERS[TIMEOUT_KEY]["address"])
+_MODE_ADDRESS = cast(int, REGISTERS["remote_control"]["address"])
+
+# Renew this many seconds before the countdown expires
+_RENEW_LEAD = 5.0
+# Delay before retrying a failed renewal
+_RETRY_DELAY = 1.0
+# Number of renewals kept for the jitter statistics
+_JITTER_HISTORY = 100
+
+
+class RemoteTimeoutKeepalive:
+    """Renew ``remote_timeout_set`` shortly before the remote control expires.
+
+    The countdown (46007) is mirrored locally: from the last poll while the
+    keepalive is off, and from the last write of the timeout while it is on.
+    While active the hub no longer reads the countdown and serves the mirror
+    in its place. Each renewal is a single-register write of the current
+    timeout, scheduled ``_RENEW_LEAD`` seconds before expiry (or halfway
+    for short timeouts), and only while remote control is enabled.
+
+    Several owners, e.g. the keepalive switch and peak shaving, can hold the
+    keepalive at once; it runs until the last of them releases its hold.
+    """
+
+    def __init__(self, hass: HomeAssistant, hub: SolakonModbusHub) -> None:
+        """Initialize the keepalive."""
+        self._hass = hass
+        self._hub = hub
+        self._owners: set[str] = set()
+        self.timeout: int | None = None
+        self.expires: float | None = None
+        self._remote_enabled = False
+        self._timer: asyncio.TimerHandle | None = None
+        self._scheduled: float | None = None
+        self._task: asyncio.Task[None] | None = None
+        self.renewals = 0
+        self.failures = 0
+        self._jitter: deque[float] = deque(maxlen=_JITTER_HISTORY)
+
+    @property
+    def active(self) -> bool:
+        """Return whether any owner holds the keepalive."""
+        return bool(self._owners)
+
+    def holds(self, owner: str) -> bool:
+        """Return whether ``owner`` holds the keepalive."""
+        return owner in self._owners
+
+    def countdown(self, now: float | None = None) -> int | None:
+        """Return the mirrored countdown in seconds."""
+        if self.expires is None:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(0, math.ceil(self.expires - now))
+
+    @callback
+    def observe(self, data: Mapping[str, Any], countdown_time: float | None) -> None:
+        """Track the timeout, mode and (while inactive) countdown of a poll."""
+        if (timeout := data.get(TIMEOUT_KEY)) is not None:
+            self.timeout = int(timeout)
+        if (mode := data.get("remote_control")) is not None:
+            self._remote_enabled = bool(int(mode) & 0b1)
+        if not self.active:
+            countdown = data.get(COUNTDOWN_KEY)
+            if countdown is not None and countdown_time is not None:
+                self.expires = countdown_time + int(countdown)
+        elif self._timer is None and self._task is None:
+            self._schedule()
+
+    @callback
+    def written(self, address: int, values: Sequence[int]) -> None:
+        """Track writes of the mode and restart the mirror on timeout writes."""
+        if address <= _MODE_ADDRESS < address + len(values):
+            self._remote_enabled = bool(values[_MODE_ADDRESS - address] & 0b1)
+        if not address <= _TIMEOUT_ADDRESS < address + len(values):
+            return
+        self.timeout = values[_TIMEOUT_ADDRESS - address]
+        self.expires = time.monotonic() + self.timeout
+        if self.active:
+            self._schedule()
+
+    @callback
+    def async_start(self, owner: str) -> None:
+        """Hold the keepalive for ``owner``, starting it if it is not running.
+
+        While running the timeout is renewed and the countdown is not polled.
+        """
+        if self.active:
+            self._owners.add(owner)
+            return
+        self._owners.add(owner)
+        self._hub.set_poll_exclusions("keepalive", {COUNTDOWN_KEY})
+        self._schedule()
+
+    @callback
+    def async_stop(self, owner: str | None = None) -> None:
+        """Release the hold of ``owner``, or of all owners if None.
+
+        Once no owner holds it, renewing stops and the countdown is polled
+        again.
+        """
+        if owner is None:
+            self._owners.clear()
+        else:
+            self._owners.discard(owner)
+        if self.active:
+            return
+        self._cancel()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._hub.set_poll_exclusions("keepalive", ())
+
+    def _cancel(self) -> None:
+        """Cancel a scheduled renewal."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._scheduled = None
+
+    def _schedule(self, delay: float | None = None) -> None:
+        """Schedule the next renewal before the mirrored countdown expires."""
+        self._cancel()
+        if not self.active or not self.timeout or not self._remote_enabled:
+            return
+        now = time.monotonic()
+        if delay is None:
+            lead = min(_RENEW_LEAD, self.timeout / 2)
+            delay = (self.expires - lead - now) if self.expires is not None else 0.0
+        self._scheduled = now + max(delay, 0.0)
+        self._timer = self._hass.loop.call_later(max(delay, 0.0), self._handle_timer)
+
+    @callback
+    def _handle_timer(self) -> None:
+        """Start the renewal in the background."""
+        self._timer = None
+        task = self._hass.async_create_background_task(
+            self._async_renew(), name="Solakon ONE remote timeout keepalive"
+        )
+        # An eagerly started task may already have finished
+        self._task = None if task.done() else task
+
+    async def _async_renew(self) -> None:
+        """Write the timeout once to restart the device's countdown."""
+        try:
+            if self._scheduled is not None:
+                self._jitter.append(time.monotonic() - self._scheduled)
+            if not self.active or not self.timeout or not self._remote_enabled:
+                return
+            if await self._hub.async_write_register(_TIMEOUT_ADDRESS, self.timeout):
+                # The hub reports the write back through written()
+                self.renewals += 1
+                return
+            self.failures += 1
+            _LOGGER.warning("Failed to renew the remote control timeout")
+            if (countdown := self.countdown()) is None or countdown > 0:
+                self._schedule(_RETRY_DELAY)
+        finally:
+            self._task = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the keepalive state for diagnostics."""
+        jitter = list(self._jitter)
+        return {
+            "active": self.active,
+            "owners": sorted(self._owners),
+            "timeout": self.timeout,
+            "countdown": self.countdown(),
+            "renewals": self.renewals,
+            "failures": self.failures,
+            "jitter_ms": {
+                "last": round(jitter[-1] * 1000, 1),
+                "mean": round(sum(jitter) / len(jitter) * 1000, 1),
+                "max": round(max(jitter) * 1000, 1),
+            }
+            if jitter
+            else None,
+        }
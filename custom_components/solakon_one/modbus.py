@@ -5,24 +5,42 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from typing import Any
+from collections.abc import Iterable, Mapping, Sequence
+from itertools import pairwise
+from typing import Any, cast
 
 from bitflags import BitFlags
 from pymodbus.client import AsyncModbusTcpClient
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant
-
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .capture import (
+    FUNCTION_READ_HOLDING_REGISTERS,
+    FUNCTION_WRITE_MULTIPLE_REGISTERS,
+    FUNCTION_WRITE_SINGLE_REGISTER,
+    ModbusTrafficRecorder,
+    ReplayModbusClient,
+)
 from .const import (
+    BMS2_KEYS,
     CONF_DEVICE_ID,
     DEFAULT_DEVICE_ID,
     DEFAULT_MANUFACTURER,
     DEFAULT_NAME,
     DEFAULT_SCAN_INTERVAL,
+    FAST_POLL_KEYS,
+    PRIORITY_CORE,
     REGISTERS,
+    STALE_POLLS,
 )
+from .debounce import WriteDebouncer
 from .exceptions import CannotConnect
+from .keepalive import COUNTDOWN_KEY, RemoteTimeoutKeepalive
+from .ramp import SetpointRamper
+from .register_image import KeyLayout, RegisterImage, RegisterSnapshot
+from .remote_control import RemoteControlOwner
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,28 +48,43 @@ _LOGGER = logging.getLogger(__name__)
 _MAX_BATCH_SIZE = 125
 # Maximum gap between registers before starting a new batch
 _BATCH_GAP_THRESHOLD = 10
+# Maximum number of registers that can be written in a single Modbus request
+_MAX_WRITE_SIZE = 123
+# Registers whose write acts even with an unchanged value: writing the
+# remote control timeout restarts its countdown
+_ACTION_ADDRESSES = frozenset({cast(int, REGISTERS["remote_timeout_set"]["address"])})
 
 
 def compute_register_batches(
     registers: dict[str, dict[str, Any]],
     static: bool = False,
+    unreadable: Sequence[tuple[int, int]] = (),
 ) -> list[dict[str, Any]]:
     """Compute optimized batches of contiguous register reads.
 
     Groups registers that are close together (within _BATCH_GAP_THRESHOLD)
-    into single Modbus read operations to minimize round-trips.
+    into single Modbus read operations to minimize round-trips. Registers
+    sharing a coherence "group" are read in one operation regardless of the
+    gaps between them, padding included, so their values are sampled at the
+    same time. A group only gets this guarantee if its span fits into one
+    read and does not cross an unreadable range; otherwise its registers are
+    batched like any others.
 
     Args:
         registers: The REGISTERS dict from const.py.
         static: If True, only include registers with "static": True.
                 If False, only include registers without "static": True.
+        unreadable: Address ranges (start, exclusive end) the device refuses
+                to read, e.g. from a discovery scan. No batch spans them, so
+                a register inside one fails on its own.
 
     Returns a list of batch descriptors:
         [
             {
                 "address": start_address,
                 "count": total_registers_to_read,
-                "keys": [(key, offset, count, config), ...]
+                "keys": [(key, offset, count, config), ...],
+                "priority": highest_priority_of_the_keys,
             },
             ...
         ]
@@ -68,6 +101,7 @@ def compute_register_batches(
 
     # Sort by address, then by key name for deterministic ordering
     entries.sort(key=lambda e: (e[1]["address"], e[0]))
+    spans = _coherence_spans(entries, unreadable)
 
     batches: list[dict[str, Any]] = []
     batch_start = entries[0][1]["address"]
@@ -84,8 +118,25 @@ def compute_register_batches(
         # Check if this entry fits in the current batch
         gap = addr - batch_end
         new_total = entry_end - batch_start
+        span = next(((start, end) for start, end in spans if start <= addr < end), None)
 
-        if gap <= _BATCH_GAP_THRESHOLD and new_total <= _MAX_BATCH_SIZE:
+        if span is not None and batch_start < span[0]:
+            # Only a batch that can take the whole group may enter its span
+            extend = (
+                span[1] - batch_start <= _MAX_BATCH_SIZE and gap <= _BATCH_GAP_THRESHOLD
+            )
+        elif span is not None:
+            # Within the span of a group the gaps are padding
+            extend = True
+        else:
+            extend = gap <= _BATCH_GAP_THRESHOLD
+        if (
+            extend
+            and new_total <= _MAX_BATCH_SIZE
+            and not any(
+                start < entry_end and batch_start < end for start, end in unreadable
+            )
+        ):
             # Extend the batch
             offset = addr - batch_start
             batch_keys.append((key, offset, count, config))
@@ -98,6 +149,7 @@ def compute_register_batches(
                     "address": batch_start,
                     "count": batch_end - batch_start,
                     "keys": list(batch_keys),
+                    "priority": _batch_priority(batch_keys),
                 }
             )
             batch_start = addr
@@ -110,12 +162,101 @@ def compute_register_batches(
             "address": batch_start,
             "count": batch_end - batch_start,
             "keys": list(batch_keys),
+            "priority": _batch_priority(batch_keys),
         }
     )
 
     return batches
 
 
+def _coherence_spans(
+    entries: Iterable[tuple[str, dict[str, Any]]],
+    unreadable: Sequence[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    """Return the address spans of the coherence groups that fit into one read."""
+    groups: dict[str, tuple[int, int]] = {}
+    for _, config in entries:
+        if (group := config.get("group")) is None:
+            continue
+        start = config["address"]
+        end = start + config.get("count", 1)
+        if group in groups:
+            start = min(start, groups[group][0])
+            end = max(end, groups[group][1])
+        groups[group] = (start, end)
+    return [
+        (start, end)
+        for start, end in groups.values()
+        if end - start <= _MAX_BATCH_SIZE
+        and not any(first < end and start < last for first, last in unreadable)
+    ]
+
+
+def _batch_priority(keys: Iterable[tuple[str, int, int, dict[str, Any]]]) -> int:
+    """Return the poll priority of a batch, the highest one of its keys."""
+    return max(config.get("priority", PRIORITY_CORE) for _, _, _, config in keys)
+
+
+def compute_write_batches(words: Mapping[int, int]) -> list[tuple[int, list[int]]]:
+    """Group register words into the fewest contiguous writes.
+
+    Args:
+        words: Register values by address.
+
+    Returns a list of (start address, values) tuples in address order.
+    """
+    batches: list[tuple[int, list[int]]] = []
+    for address in sorted(words):
+        if (
+            batches
+            and batches[-1][0] + len(batches[-1][1]) == address
+            and len(batches[-1][1]) < _MAX_WRITE_SIZE
+        ):
+            batches[-1][1].append(words[address])
+        else:
+            batches.append((address, [words[address]]))
+    return batches
+
+
+def _bridge_write_gaps(words: dict[int, int], held: Mapping[int, int]) -> None:
+    """Fill gaps between words to write with requested words already held.
+
+    Rewriting requested but unchanged values lets both sides of a gap go
+    out in one write. Only gaps made up entirely of such words are bridged,
+    so no register outside the request is written.
+    """
+    for previous, following in pairwise(sorted(words)):
+        gap = range(previous + 1, following)
+        if gap and all(address in held for address in gap):
+            words.update((address, held[address]) for address in gap)
+
+
+def trim_register_batches(
+    batches: list[dict[str, Any]], excluded: set[str]
+) -> list[dict[str, Any]]:
+    """Return the batches without the excluded keys.
+
+    Batches keep their start address so their words still land in the same
+    register image blocks. Excluded keys are therefore only cut from the end
+    of a batch; excluded keys between included ones are still read.
+    """
+    trimmed: list[dict[str, Any]] = []
+    for batch in batches:
+        keys = [entry for entry in batch["keys"] if entry[0] not in excluded]
+        if not keys:
+            continue
+        count = max(offset + count for _, offset, count, _ in keys)
+        trimmed.append(
+            {
+                "address": batch["address"],
+                "count": count,
+                "keys": keys,
+                "priority": _batch_priority(keys),
+            }
+        )
+    return trimmed
+
+
 class Bitfield16(BitFlags):
     nbits = 16
 
@@ -134,8 +275,15 @@ class SolakonModbusHub:
         port: int,
         device_id: int,
         scan_interval: int,
+        client: AsyncModbusTcpClient | ReplayModbusClient | None = None,
+        unreadable: Sequence[tuple[int, int]] = (),
     ) -> None:
-        """Initialize the Modbus hub."""
+        """Initialize the Modbus hub.
+
+        A ``client`` can be passed to run the hub against another transport,
+        e.g. a ``ReplayModbusClient`` serving a recorded capture. Batches
+        are planned around the ``unreadable`` address ranges.
+        """
         self._hass = hass
         self._host = host
         self._port = port
@@ -143,15 +291,58 @@ class SolakonModbusHub:
         self.scan_interval = scan_interval
         self._lock = asyncio.Lock()
         # Create client exactly like the working script
-        self._client = AsyncModbusTcpClient(
+        self._client = client or AsyncModbusTcpClient(
             host=self._host,
             port=self._port,
             timeout=5,  # Same timeout as working script
         )
+        # Set while a traffic capture is running
+        self.recorder: ModbusTrafficRecorder | None = None
+        # Ranges the device refuses to read, which no batch may cross
+        self._unreadable = tuple(unreadable)
         # Pre-compute batched register groups for efficient reading
-        self._dynamic_batches = compute_register_batches(REGISTERS, static=False)
-        self._static_batches = compute_register_batches(REGISTERS, static=True)
-        self._static_data: dict[str, Any] = {}
+        self._dynamic_batches = compute_register_batches(
+            REGISTERS, static=False, unreadable=unreadable
+        )
+        self._poll_batches = self._dynamic_batches
+        self._poll_exclusions: dict[str, set[str]] = {}
+        self._static_batches = compute_register_batches(
+            REGISTERS, static=True, unreadable=unreadable
+        )
+        self._fast_batches = compute_register_batches(
+            {key: REGISTERS[key] for key in FAST_POLL_KEYS}, unreadable=unreadable
+        )
+        # Raw words of the latest batch reads, decoded lazily by snapshots
+        self.image = RegisterImage()
+        self._layout: dict[str, KeyLayout] = {}
+        for batch in self._dynamic_batches + self._static_batches:
+            self.image.allocate(batch["address"], batch["count"])
+            for key, offset, count, config in batch["keys"]:
+                self._layout[key] = (batch["address"], offset, count, config)
+        self._static_blocks = frozenset(
+            batch["address"] for batch in self._static_batches
+        )
+        self._static_read = False
+        self._generation = 0
+        self.keepalive = RemoteTimeoutKeepalive(hass, self)
+        self.ramper = SetpointRamper(hass, self)
+        self.debouncer = WriteDebouncer(hass, self)
+        # Subsystem currently running remote control, if any
+        self.remote_control = RemoteControlOwner()
+        # Writes and keys of value writes skipped as the device held the value
+        self.skipped_writes = 0
+        self.skipped_values = 0
+        self._write_listeners: list[CALLBACK_TYPE] = []
+        # Batches of registers below this priority are not polled, while
+        # their blocks keep the words of their last read
+        self._shed_priority = 0
+        self._shed_blocks: frozenset[int] = frozenset()
+        self.shed_batches = 0
+        # The second battery module is only polled once a probe found it
+        self.bms2_present = False
+        self.set_poll_exclusions("bms2", BMS2_KEYS)
+        # Age up to which snapshots keep the values of failed batch reads
+        self.max_age: float = STALE_POLLS * self.scan_interval
 
         _LOGGER.debug(
             "Computed %d dynamic batches and %d static batches from %d registers",
@@ -160,6 +351,43 @@ class SolakonModbusHub:
             len(REGISTERS),
         )
 
+    def set_poll_exclusions(self, source: str, keys: Iterable[str]) -> None:
+        """Stop polling ``keys`` where the batch layout allows it.
+
+        Each source sets its own keys; the exclusions of all sources add up.
+        """
+        self._poll_exclusions[source] = set(keys)
+        excluded = set().union(*self._poll_exclusions.values())
+        self._poll_batches = (
+            trim_register_batches(self._dynamic_batches, excluded)
+            if excluded
+            else self._dynamic_batches
+        )
+
+    def set_shed_priority(self, priority: int) -> None:
+        """Shed the poll batches of registers below ``priority``."""
+        if priority != self._shed_priority:
+            _LOGGER.debug("Shedding poll batches below priority %d", priority)
+        self._shed_priority = priority
+
+    @callback
+    def async_add_write_listener(self, write_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for writes that changed a register of the device."""
+        self._write_listeners.append(write_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._write_listeners.remove(write_callback)
+
+        return remove_listener
+
+    def _written(self, address: int, values: Sequence[int], changed: bool) -> None:
+        """Pass a successful write on to the keepalive and the listeners."""
+        self.keepalive.written(address, values)
+        if changed:
+            for write_callback in self._write_listeners:
+                write_callback()
+
     @property
     def connected(self) -> bool:
         """Check if client is connected."""
@@ -179,13 +407,8 @@ class SolakonModbusHub:
                 _LOGGER.info(f"Successfully connected to {self._host}:{self._port}")
 
                 # Test the connection with a simple read
-                # Using device_id parameter like the working script
                 try:
-                    test_result = await self._client.read_holding_registers(
-                        address=30000,
-                        count=1,
-                        device_id=self._device_id,  # Using device_id like your working script
-                    )
+                    test_result = await self._async_client_read(30000, 1)
 
                     if test_result.isError():
                         _LOGGER.warning(f"Test read returned error: {test_result}")
@@ -206,8 +429,20 @@ class SolakonModbusHub:
             _LOGGER.error(f"Connection setup error: {err}")
             raise
 
+    async def async_stop_capture(self) -> ModbusTrafficRecorder | None:
+        """Stop a running traffic capture and flush it to disk."""
+        if (recorder := self.recorder) is None:
+            return None
+        self.recorder = None
+        await recorder.async_flush()
+        return recorder
+
     async def async_close(self) -> None:
         """Close the Modbus connection."""
+        self.keepalive.async_stop()
+        self.ramper.async_stop()
+        self.debouncer.async_stop()
+        await self.async_stop_capture()
         if self._client:
             try:
                 self._client.close()
@@ -229,11 +464,8 @@ class SolakonModbusHub:
                 f"Testing connection to {self._host}:{self._port} with device_id={self._device_id}"
             )
 
-            result = await self._client.read_holding_registers(
-                address=30000,  # Model name register
-                count=1,
-                device_id=self._device_id,  # Using device_id
-            )
+            # Model name register
+            result = await self._async_client_read(30000, 1)
 
             if not result.isError():
                 _LOGGER.info("Connection test successful")
@@ -262,13 +494,8 @@ class SolakonModbusHub:
             serial_number = None
 
             try:
-                model_result = await self._client.read_holding_registers(
-                    address=30000, count=16, device_id=self._device_id
-                )
-
-                serial_result = await self._client.read_holding_registers(
-                    address=30016, count=16, device_id=self._device_id
-                )
+                model_result = await self._async_client_read(30000, 16)
+                serial_result = await self._async_client_read(30016, 16)
 
                 if not model_result.isError():
                     model_name = convert_string(model_result.registers)
@@ -292,49 +519,107 @@ class SolakonModbusHub:
                 "name": DEFAULT_NAME,
             }
 
+    async def _async_client_read(self, address: int, count: int) -> Any:
+        """Read holding registers and record the transaction if capturing."""
+        start = time.monotonic()
+        try:
+            result = await self._client.read_holding_registers(
+                address=address, count=count, device_id=self._device_id
+            )
+        except Exception:
+            self._record(FUNCTION_READ_HOLDING_REGISTERS, start, True, address, count)
+            raise
+        error = result.isError()
+        self._record(
+            FUNCTION_READ_HOLDING_REGISTERS,
+            start,
+            error,
+            address,
+            count,
+            () if error else result.registers,
+        )
+        return result
+
+    async def _async_client_write(
+        self, function: int, address: int, values: list[int]
+    ) -> Any:
+        """Write holding registers and record the transaction if capturing."""
+        start = time.monotonic()
+        try:
+            if function == FUNCTION_WRITE_SINGLE_REGISTER:
+                result = await self._client.write_register(
+                    address=address, value=values[0], device_id=self._device_id
+                )
+            else:
+                result = await self._client.write_registers(
+                    address=address, values=values, device_id=self._device_id
+                )
+        except Exception:
+            self._record(function, start, True, address, len(values), values)
+            raise
+        self._record(function, start, result.isError(), address, len(values), values)
+        return result
+
+    def _record(
+        self,
+        function: int,
+        start: float,
+        error: bool,
+        address: int,
+        count: int,
+        registers: Sequence[int] = (),
+    ) -> None:
+        """Pass a transaction to the running capture, if any."""
+        if self.recorder is not None:
+            self.recorder.record(
+                start,
+                time.monotonic() - start,
+                function,
+                error,
+                address,
+                count,
+                registers,
+            )
+
     async def _async_read_batches(
-        self, batches: list[dict[str, Any]]
-    ) -> dict[str, Any]:
-        """Read a list of register batches and return processed values."""
-        data: dict[str, Any] = {}
+        self, batches: list[dict[str, Any]], generation: int = 0
+    ) -> int:
+        """Read a list of register batches into the register image.
+
+        Returns the number of batches read successfully.
+        """
+        read_count = 0
 
         for batch in batches:
             batch_start = time.monotonic()
             batch_addr = batch["address"]
             batch_count = batch["count"]
             batch_keys = batch["keys"]
-            key_names = [k[0] for k in batch_keys]
 
             try:
-                result = await self._client.read_holding_registers(
-                    address=batch_addr,
-                    count=batch_count,
-                    device_id=self._device_id,
-                )
+                result = await self._async_client_read(batch_addr, batch_count)
 
                 if result.isError():
                     _LOGGER.debug(
                         "Error reading batch at address %d (count=%d, keys=%s): %s",
                         batch_addr,
                         batch_count,
-                        key_names,
+                        [k[0] for k in batch_keys],
                         result,
                     )
                     continue
 
-                # Extract each key's registers from the batch result
-                for key, offset, count, config in batch_keys:
-                    key_regs = result.registers[offset : offset + count]
-                    value = self._process_register_value(key_regs, config)
-                    if value is not None:
-                        data[key] = value
+                self.image.store(
+                    batch_addr, result.registers, time.monotonic(), generation
+                )
+                read_count += 1
 
             except Exception as err:
                 _LOGGER.debug(
                     "Failed to read batch at address %d (count=%d, keys=%s): %s",
                     batch_addr,
                     batch_count,
-                    key_names,
+                    [k[0] for k in batch_keys],
                     err,
                 )
             finally:
@@ -347,7 +632,7 @@ class SolakonModbusHub:
                     batch_elapsed,
                 )
 
-        return data
+        return read_count
 
     async def _async_read_static_registers(self) -> None:
         """Read static registers (device info, versions) once."""
@@ -358,55 +643,186 @@ class SolakonModbusHub:
         start = time.monotonic()
 
         async with self._lock:
-            self._static_data = await self._async_read_batches(self._static_batches)
+            read_count = await self._async_read_batches(self._static_batches, 1)
+        self._static_read = read_count > 0
 
         elapsed = time.monotonic() - start
         _LOGGER.debug(
-            "Static registers read complete: %d values in %.3fs",
-            len(self._static_data),
+            "Static registers read complete: %d of %d batches in %.3fs",
+            read_count,
+            len(self._static_batches),
             elapsed,
         )
 
-    async def async_read_registers(self) -> dict[str, Any]:
+    def value(self, key: str) -> Any:
+        """Return the last value of a key read from or written to the device."""
+        if (layout := self._layout.get(key)) is None:
+            return None
+        address, offset, count, config = layout
+        words = self.image.read(address + offset, count, 0.0)
+        return None if words is None else self._process_register_value(words, config)
+
+    def holds(self, address: int, values: Sequence[int]) -> bool:
+        """Return whether writing ``values`` at ``address`` would change nothing.
+
+        The words are compared with the last ones read from or written to
+        the device, provided they were read within ``max_age`` and are not
+        in a batch shed from the polls. Otherwise the device may have
+        changed them since, so the write is not skipped.
+        """
+        end = address + len(values)
+        if any(address <= action < end for action in _ACTION_ADDRESSES):
+            return False
+        if any(
+            batch["address"] < end and address < batch["address"] + batch["count"]
+            for batch in self._poll_batches
+            if batch["address"] in self._shed_blocks
+        ):
+            return False
+        words = self.image.read(address, len(values), time.monotonic() - self.max_age)
+        return words == list(values)
+
+    def _snapshot(self) -> RegisterSnapshot:
+        """Return a snapshot of the register image for the current poll."""
+        return RegisterSnapshot(
+            self.image,
+            self._layout,
+            self._process_register_value,
+            self._generation,
+            self._static_blocks,
+            self._shed_blocks,
+            time.monotonic() - self.max_age,
+        )
+
+    async def async_read_registers(self) -> RegisterSnapshot:
         """Read all configured registers using batched reads."""
-        data: dict[str, Any] = {}
+        # Bump the generation so blocks of a failed read count as stale
+        self._generation += 1
 
         if not self._client or not self.connected:
             try:
                 await self.async_setup()
             except Exception:
-                return data
+                return self._snapshot()
 
         if not self.connected:
             _LOGGER.error("Client not connected for register read")
-            return data
+            return self._snapshot()
 
-        if not self._static_data and self._static_batches:
+        if not self._static_read and self._static_batches:
             await self._async_read_static_registers()
 
+        batches = self._poll_batches
+        if self._shed_priority:
+            batches = [
+                batch for batch in batches if batch["priority"] >= self._shed_priority
+            ]
+            self.shed_batches += len(self._poll_batches) - len(batches)
+        self._shed_blocks = frozenset(
+            batch["address"]
+            for batch in self._poll_batches
+            if batch["priority"] < self._shed_priority
+        )
+
         async with self._lock:
             lock_start = time.monotonic()
-            data = await self._async_read_batches(self._dynamic_batches)
+            read_count = await self._async_read_batches(batches, self._generation)
             lock_elapsed = time.monotonic() - lock_start
             _LOGGER.debug(
-                "Lock held for %.3fs total. Register read: %d batches and %d values",
+                "Lock held for %.3fs total. Register read: %d of %d batches",
                 lock_elapsed,
-                len(self._dynamic_batches),
-                len(data),
+                read_count,
+                len(batches),
             )
 
-        # Merge in static data (read once at setup)
-        if self._static_data:
-            data.update(self._static_data)
-
-        return data
+        if (
+            self.keepalive.active
+            and (countdown := self.keepalive.countdown()) is not None
+        ):
+            # The countdown is not polled while the keepalive runs
+            self.image.update(
+                cast(int, REGISTERS[COUNTDOWN_KEY]["address"]), [countdown]
+            )
+        snapshot = self._snapshot()
+        self.keepalive.observe(snapshot, snapshot.timestamp(COUNTDOWN_KEY))
+        return snapshot
 
-    async def async_read_all_data(self) -> dict[str, Any]:
+    async def async_read_all_data(self) -> RegisterSnapshot:
         """Read all data from the device."""
         return await self.async_read_registers()
 
+    async def async_read_fast(self) -> dict[str, Any]:
+        """Read the fast poll registers and return their decoded values.
+
+        The values bypass the register image, so the snapshot of the
+        regular poll stays consistent.
+        """
+        values: dict[str, Any] = {}
+        if not self.connected:
+            return values
+
+        async with self._lock:
+            for batch in self._fast_batches:
+                try:
+                    result = await self._async_client_read(
+                        batch["address"], batch["count"]
+                    )
+                except Exception as err:
+                    _LOGGER.debug(
+                        "Failed to read fast batch at address %d: %s",
+                        batch["address"],
+                        err,
+                    )
+                    continue
+                if result.isError():
+                    continue
+                for key, offset, count, config in batch["keys"]:
+                    value = self._process_register_value(
+                        result.registers[offset : offset + count], config
+                    )
+                    if value is not None:
+                        values[key] = value
+        return values
+
+    async def async_read_cached(
+        self, address: int, count: int, max_age: float
+    ) -> list[int] | None:
+        """Read raw words from the register image, falling back to the device.
+
+        Words older than ``max_age`` seconds (or not covered by the polled
+        batches) are read live through the hub's lock.
+        """
+        words = self.image.read(address, count, time.monotonic() - max_age)
+        if words is not None:
+            return words
+
+        if not self.connected:
+            return None
+
+        async with self._lock:
+            try:
+                result = await self._async_client_read(address, count)
+            except Exception as err:
+                _LOGGER.debug(
+                    "Failed to read %d registers at address %d: %s",
+                    count,
+                    address,
+                    err,
+                )
+                return None
+
+        if result.isError():
+            _LOGGER.debug(
+                "Error reading %d registers at address %d: %s",
+                count,
+                address,
+                result,
+            )
+            return None
+        return list(result.registers)
+
     def _process_register_value(
-        self, registers: list[int], config: dict[str, Any]
+        self, registers: Sequence[int], config: dict[str, Any]
     ) -> Any:
         """Process register values based on their configuration."""
         if not registers:
@@ -451,44 +867,273 @@ class SolakonModbusHub:
             _LOGGER.debug(f"Failed to process register value: {err}")
             return None
 
-    async def async_write_register(self, address: int, value: int) -> bool:
-        """Write a single register."""
+    async def async_write_values(
+        self,
+        values: Mapping[str, float],
+        *,
+        cancel_ramps: bool = True,
+        force: bool = False,
+    ) -> dict[str, bool]:
+        """Write register values by key, skipping those the image already holds.
+
+        The words of changed keys are grouped into the fewest contiguous
+        writes. Returns the success of each written key; keys whose value
+        was unchanged are left out. Running ramps of the keys are cancelled
+        unless ``cancel_ramps`` is False. With ``force`` every key is
+        written, even if the device already holds its value.
+        """
+        if cancel_ramps:
+            self.ramper.cancel(values)
+        words: dict[int, int] = {}
+        held: dict[int, int] = {}
+        changed: dict[str, tuple[int, int]] = {}
+        for key, value in values.items():
+            config = REGISTERS[key]
+            address = cast(int, config["address"])
+            encoded = encode_register_value(config, value)
+            if not force and self.holds(address, encoded):
+                self.skipped_values += 1
+                held.update(enumerate(encoded, address))
+                continue
+            changed[key] = (address, len(encoded))
+            words.update(enumerate(encoded, address))
+        _bridge_write_gaps(words, held)
+
+        results: dict[str, bool] = {}
+        for address, batch in compute_write_batches(words):
+            if len(batch) == 1:
+                success = await self.async_write_register(
+                    address, batch[0], force=force
+                )
+            else:
+                success = await self.async_write_registers(address, batch, force=force)
+            for key, (start, count) in changed.items():
+                if address <= start and start + count <= address + len(batch):
+                    results[key] = success
+        return results
+
+    async def async_read_keys(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Read keys live from the device and return their values.
+
+        The keys are read in as few batches as the planner allows; the words
+        read update the register image. Keys of failed reads map to None.
+        """
+        values: dict[str, Any] = {}
+        for batch in compute_register_batches(
+            {key: REGISTERS[key] for key in keys}, unreadable=self._unreadable
+        ):
+            words = await self.async_read_cached(batch["address"], batch["count"], 0.0)
+            if words is not None:
+                self.image.update(batch["address"], words)
+            # Decoded from the words read, as the image ignores them for
+            # blocks no poll has read yet
+            for key, offset, count, config in batch["keys"]:
+                values[key] = (
+                    None
+                    if words is None
+                    else self._process_register_value(
+                        words[offset : offset + count], config
+                    )
+                )
+        return values
+
+    async def async_probe(self, address: int, count: int) -> list[int] | None:
+        """Read words live, or return None if the device refuses the range.
+
+        Raises CannotConnect if the device does not answer at all.
+        """
+        if not self.connected:
+            raise CannotConnect(f"Not connected to {self._host}:{self._port}")
+
+        async with self._lock:
+            try:
+                result = await self._async_client_read(address, count)
+            except Exception as err:
+                raise CannotConnect(
+                    f"Failed to read {count} registers at {address}: {err}"
+                ) from err
+
+        if result.isError():
+            return None
+        return list(result.registers)
+
+    async def async_detect_bms2(self) -> bool:
+        """Probe whether a second battery module reports valid data.
+
+        The module counts as present if its state of health reads as 1 to
+        100 %. Its registers are polled only while it is present. If the
+        device does not answer, the previous result is kept.
+        """
+        address = cast(int, REGISTERS["bms2_soh"]["address"])
+        try:
+            words = await self.async_probe(address, 1)
+        except CannotConnect as err:
+            _LOGGER.debug("Failed to probe for a second battery module: %s", err)
+            return self.bms2_present
+
+        present = words is not None and 0 < words[0] <= 100
+        if present != self.bms2_present:
+            _LOGGER.info(
+                "Second battery module %s", "detected" if present else "not found"
+            )
+            self.bms2_present = present
+            self.set_poll_exclusions("bms2", () if present else BMS2_KEYS)
+        return present
+
+    async def async_read_specs(
+        self, registers: Mapping[str, dict[str, Any]], max_age: float
+    ) -> dict[str, dict[str, Any]]:
+        """Read registers described like ``REGISTERS`` entries and decode them.
+
+        The registers are planned into batches like the polled ones and read
+        through the hub's lock, or served from the register image if it
+        holds words younger than ``max_age`` seconds. If a batch fails, its
+        registers are read one by one, so a gap the device refuses to read
+        only fails the registers around it. Returns the raw words and the
+        decoded value of each register, both None if it could not be read.
+        """
+        results: dict[str, dict[str, Any]] = {}
+        for batch in compute_register_batches(
+            dict(registers), unreadable=self._unreadable
+        ):
+            words = await self.async_read_cached(
+                batch["address"], batch["count"], max_age
+            )
+            for key, offset, count, config in batch["keys"]:
+                if words is not None:
+                    raw: list[int] | None = words[offset : offset + count]
+                elif len(batch["keys"]) > 1:
+                    raw = await self.async_read_cached(
+                        batch["address"] + offset, count, max_age
+                    )
+                else:
+                    raw = None
+                results[key] = {
+                    "raw": raw,
+                    "value": None
+                    if raw is None
+                    else self._process_register_value(raw, config),
+                }
+        return results
+
+    async def async_apply_values(
+        self, values: Mapping[str, float], *, force: bool = False
+    ) -> dict[str, dict[str, Any]]:
+        """Write changed register values and verify them with one readback.
+
+        Returns per key the status (``unchanged``, ``written``, ``rejected``
+        if the device holds another value afterwards, or ``failed``) and the
+        value read back. With ``force`` unchanged values are written too.
+        """
+        written = await self.async_write_values(values, force=force)
+        read = await self.async_read_keys(values)
+        results: dict[str, dict[str, Any]] = {}
+        for key, value in values.items():
+            if key not in written:
+                status = "unchanged"
+            elif not written[key]:
+                status = "failed"
+            elif read[key] is not None and encode_register_value(
+                REGISTERS[key], read[key]
+            ) != encode_register_value(REGISTERS[key], value):
+                status = "rejected"
+            else:
+                status = "written"
+            results[key] = {"status": status, "value": read[key]}
+        return results
+
+    async def async_write_register(
+        self, address: int, value: int, *, force: bool = False
+    ) -> bool:
+        """Write a single register.
+
+        Writing the value the device already holds is skipped, unless
+        ``force`` is set, and counts as success.
+        """
         if not self.connected:
             return False
+        if not force and self.holds(address, [value]):
+            self.skipped_writes += 1
+            return True
 
         async with self._lock:
             try:
-                # Using device_id parameter
-                result = await self._client.write_register(
-                    address=address, value=value, device_id=self._device_id
+                result = await self._async_client_write(
+                    FUNCTION_WRITE_SINGLE_REGISTER, address, [value]
                 )
 
-                return not result.isError()
+                if result.isError():
+                    return False
+                changed = self.image.read(address, 1, 0.0) != [value]
+                self.image.update(address, [value])
 
             except Exception as err:
                 _LOGGER.error(f"Failed to write register at {address}: {err}")
                 return False
 
-    async def async_write_registers(self, address: int, values: list[int]) -> bool:
-        """Write multiple registers."""
+        self._written(address, [value], changed)
+        return True
+
+    async def async_write_registers(
+        self, address: int, values: list[int], *, force: bool = False
+    ) -> bool:
+        """Write multiple registers.
+
+        Writing the values the device already holds is skipped, unless
+        ``force`` is set, and counts as success.
+        """
         if not self.connected:
             return False
+        if not force and self.holds(address, values):
+            self.skipped_writes += 1
+            return True
 
         async with self._lock:
             try:
-                # Using device_id parameter
-                result = await self._client.write_registers(
-                    address=address, values=values, device_id=self._device_id
+                result = await self._async_client_write(
+                    FUNCTION_WRITE_MULTIPLE_REGISTERS, address, values
                 )
 
-                return not result.isError()
+                if result.isError():
+                    return False
+                changed = self.image.read(address, len(values), 0.0) != values
+                self.image.update(address, values)
 
             except Exception as err:
                 _LOGGER.error(f"Failed to write registers at {address}: {err}")
                 return False
 
+        self._written(address, values, changed)
+        return True
+
 
-def get_modbus_hub(hass: HomeAssistant, data: ConfigEntry) -> SolakonModbusHub:
+def encode_register_value(config: dict[str, Any], value: float) -> list[int]:
+    """Encode a value into the words of a numeric register.
+
+    The inverse of the hub's decoding: the value is scaled, clamped to the
+    range of the register type and split into big-endian words.
+    """
+    data_type = str(config.get("type", "uint16"))
+    raw = round(value * float(config.get("scale", 1)))
+
+    if data_type in ("uint16", "u16"):
+        return [min(max(raw, 0), 0xFFFF)]
+    if data_type in ("int16", "i16"):
+        return [min(max(raw, -0x8000), 0x7FFF) & 0xFFFF]
+    if data_type in ("uint32", "u32"):
+        raw = min(max(raw, 0), 0xFFFFFFFF)
+    elif data_type in ("int32", "i32"):
+        raw = min(max(raw, -0x80000000), 0x7FFFFFFF) & 0xFFFFFFFF
+    else:
+        raise ValueError(f"Cannot encode registers of type {data_type}")
+    return [(raw >> 16) & 0xFFFF, raw & 0xFFFF]
+
+
+def get_modbus_hub(
+    hass: HomeAssistant,
+    data: ConfigEntry,
+    unreadable: Sequence[tuple[int, int]] = (),
+) -> SolakonModbusHub:
     """Creates the hub to interact with the modbus."""
     return SolakonModbusHub(
         hass,
@@ -496,10 +1141,11 @@ def get_modbus_hub(hass: HomeAssistant, data: ConfigEntry) -> SolakonModbusHub:
         data[CONF_PORT],
         data.get(CONF_DEVICE_ID, DEFAULT_DEVICE_ID),
         data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+        unreadable=unreadable,
     )
 
 
-def convert_bitfield16(registers: list[int], bit: int) -> bool | None:
+def convert_bitfield16(registers: Sequence[int], bit: int) -> bool | None:
     """Convert bitfield16 registers to boolean."""
     if bit > 15:
         return None
@@ -507,7 +1153,7 @@ def convert_bitfield16(registers: list[int], bit: int) -> bool | None:
     return bool(bitfield[f"bit_{bit}"])
 
 
-def convert_bitfield32(registers: list[int], bit: int) -> bool | None:
+def convert_bitfield32(registers: Sequence[int], bit: int) -> bool | None:
     """Convert bitfield32 registers to boolean."""
     if len(registers) < 2 or bit > 31:
         return None
@@ -515,7 +1161,7 @@ def convert_bitfield32(registers: list[int], bit: int) -> bool | None:
     return bool(bitfield[f"bit_{bit}"])
 
 
-def convert_string(registers: list[int]) -> str | None:
+def convert_string(registers: Sequence[int]) -> str | None:
     """Convert registers to string."""
     chars = []
     for val in registers:
@@ -19,15 +19,26 @@ from homeassistant.const import (
     UnitOfTime,
 )
 from homeassistant.core import HomeAssistant, callback
-from typing import cast
+from typing import Any, cast
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import REGISTERS
+from .const import CONF_POWER_RAMP_RATE, DEFAULT_POWER_RAMP_RATE, REGISTERS
 from .entity import SolakonEntity
 from .types import SolakonConfigEntry
 
 _LOGGER = logging.getLogger(__name__)
 
+# Power setpoints moved to new values by the hub's ramper, if enabled
+RAMPED_KEYS = ("remote_active_power", "remote_reactive_power")
+
+
+def _power_ramp_rate(config_entry: SolakonConfigEntry) -> float:
+    """Return the configured power ramp rate in W/s, 0 if disabled."""
+    return float(
+        config_entry.options.get(CONF_POWER_RAMP_RATE, DEFAULT_POWER_RAMP_RATE)
+    )
+
+
 # "import_power_limit": {
 #     "name": "Import Power Limit Control",
 #     "icon": "mdi:transmission-tower-import",
@@ -223,7 +234,12 @@ class SolakonNumber(SolakonEntity, NumberEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if (
+        hub = self._config_entry.runtime_data.hub
+        pending = {**hub.ramper.targets, **hub.debouncer.pending}
+        if self.entity_description.key in pending:
+            # Show the value being written rather than the last one read
+            self._attr_native_value = pending[self.entity_description.key]
+        elif (
             self.coordinator.data
             and self.entity_description.key in self.coordinator.data
         ):
@@ -247,11 +263,34 @@ class SolakonNumber(SolakonEntity, NumberEntity):
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
+        hub = self._config_entry.runtime_data.hub
+        if self.entity_description.key in RAMPED_KEYS and (
+            ramp_rate := _power_ramp_rate(self._config_entry)
+        ):
+            hub.ramper.ramp({self.entity_description.key: value}, ramp_rate)
+            # The ramp writes in the background; the refreshes follow it
+            self._attr_native_value = float(value)
+            self.async_write_ha_state()
+            return
+        if self.entity_description.mode is NumberMode.SLIDER:
+            # Dragging a slider sends a burst of values; only the last is written
+            hub.debouncer.schedule(
+                self._config_entry,
+                self.entity_description.key,
+                value,
+                self._handle_write_done,
+            )
+            self._attr_native_value = float(value)
+            self.async_write_ha_state()
+            return
+        # A direct write replaces a running ramp
+        hub.ramper.cancel((self.entity_description.key,))
+
         # Convert to int for Modbus register writing
         int_value = int(value)
 
         # Get register info
-        address = self._register_config["address"]
+        address = cast(int, self._register_config["address"])
         count = self._register_config.get("count", 1)
         data_type = str(self._register_config.get("type", "u16"))
         scale = float(cast(float, self._register_config.get("scale", 1)))
@@ -274,9 +313,9 @@ class SolakonNumber(SolakonEntity, NumberEntity):
             elif int_value > 0xFFFF:
                 int_value = 0xFFFF
 
-            success = await self._config_entry.runtime_data.hub.async_write_register(
-                address, int_value
-            )
+            # The hub skips the write if the device already holds the value
+            unchanged = hub.holds(address, [int_value])
+            success = await hub.async_write_register(address, int_value)
         else:
             # Multi-register write (32-bit)
             # Handle signed/unsigned conversion
@@ -299,20 +338,27 @@ class SolakonNumber(SolakonEntity, NumberEntity):
                 f"Writing 32-bit value: {int_value:#x} = [{high_word:#x}, {low_word:#x}]"
             )
 
-            success = await self._config_entry.runtime_data.hub.async_write_registers(
-                address, values
-            )
+            unchanged = hub.holds(address, values)
+            success = await hub.async_write_registers(address, values)
 
         if success:
             _LOGGER.info(f"Successfully set {self.entity_description.key} to {value}")
             # Update the state immediately (optimistic update)
             self._attr_native_value = float(value)
             self.async_write_ha_state()
-            # Request coordinator to refresh data to confirm the change
-            await self.coordinator.async_request_refresh()
+            if not unchanged:
+                # Request coordinator to refresh data to confirm the change
+                await self.coordinator.async_request_refresh()
         else:
             _LOGGER.error(f"Failed to set {self.entity_description.key} to {value}")
 
+    @callback
+    def _handle_write_done(self, value: Any) -> None:
+        """Show the value read back after a debounced write."""
+        if isinstance(value, (int, float)):
+            self._attr_native_value = float(value)
+            self.async_write_ha_state()
+
     @property
     def available(self) -> bool:
         """Return if entity is available."""
@@ -342,7 +388,14 @@ class ForceDurationNumber(SolakonEntity, NumberEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if self.coordinator.data and "remote_timeout_set" in self.coordinator.data:
+        pending = self._config_entry.runtime_data.hub.debouncer.pending
+        if "remote_timeout_set" in pending:
+            # Show the duration being written rather than the last one read
+            self._attr_native_value = round(pending["remote_timeout_set"] / 60.0, 1)
+        elif (
+            self.coordinator.data is not None
+            and "remote_timeout_set" in self.coordinator.data
+        ):
             value_seconds = self.coordinator.data["remote_timeout_set"]
 
             # Convert from seconds to minutes for display
@@ -381,22 +434,23 @@ class ForceDurationNumber(SolakonEntity, NumberEntity):
             f"Setting force_duration to {value} min (raw value: {value_seconds}s) at address {address}"
         )
 
-        # Write to register 46002
-        success = await self._config_entry.runtime_data.hub.async_write_register(
-            address, value_seconds
+        # Write to register 46002 once the slider settled
+        self._config_entry.runtime_data.hub.debouncer.schedule(
+            self._config_entry,
+            "remote_timeout_set",
+            value_seconds,
+            self._handle_write_done,
         )
+        # Update the state immediately (optimistic update)
+        self._attr_native_value = float(value)
+        self.async_write_ha_state()
 
-        if success:
-            _LOGGER.info(
-                f"Successfully set force_duration to {value} min ({value_seconds}s)"
-            )
-            # Update the state immediately (optimistic update)
-            self._attr_native_value = float(value)
+    @callback
+    def _handle_write_done(self, value_seconds: Any) -> None:
+        """Show the duration read back after the debounced write."""
+        if isinstance(value_seconds, (int, float)):
+            self._attr_native_value = round(float(value_seconds) / 60.0, 1)
             self.async_write_ha_state()
-            # Request coordinator to refresh data to confirm the change
-            await self.coordinator.async_request_refresh()
-        else:
-            _LOGGER.error(f"Failed to set force_duration to {value} min")
 
     @property
     def available(self) -> bool:
@@ -426,8 +480,15 @@ class ForcePowerNumber(SolakonEntity, NumberEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        targets = self._config_entry.runtime_data.hub.ramper.targets
+        if "remote_active_power" in targets:
+            # Show where a running ramp is heading rather than its last step
+            self._attr_native_value = abs(targets["remote_active_power"])
         # Read from register 46003 (remote_active_power)
-        if self.coordinator.data and "remote_active_power" in self.coordinator.data:
+        elif (
+            self.coordinator.data is not None
+            and "remote_active_power" in self.coordinator.data
+        ):
             value = self.coordinator.data["remote_active_power"]
 
             # Always use absolute value (positive)
@@ -453,8 +514,19 @@ class ForcePowerNumber(SolakonEntity, NumberEntity):
         # (You could add validation here to check if force charge is active and limit to 1200W,
         #  or if force discharge is active and limit to 800W)
 
-        address_46003 = REGISTERS["remote_active_power"]["address"]
-        address_46005 = REGISTERS["remote_reactive_power"]["address"]
+        hub = self._config_entry.runtime_data.hub
+        if ramp_rate := _power_ramp_rate(self._config_entry):
+            _LOGGER.info(f"Ramping force_power to {int_value}W at {ramp_rate}W/s")
+            # Both registers step together, each step in a single write
+            hub.ramper.ramp(dict.fromkeys(RAMPED_KEYS, int_value), ramp_rate)
+            self._attr_native_value = float(int_value)
+            self.async_write_ha_state()
+            return
+        # A direct write replaces a running ramp
+        hub.ramper.cancel(RAMPED_KEYS)
+
+        address_46003 = cast(int, REGISTERS["remote_active_power"]["address"])
+        address_46005 = cast(int, REGISTERS["remote_reactive_power"]["address"])
 
         _LOGGER.info(
             f"Setting force_power to {int_value}W (writing to both 46003 and 46005)"
@@ -470,21 +542,21 @@ class ForcePowerNumber(SolakonEntity, NumberEntity):
             f"Writing 32-bit value: {int_value:#x} = [{high_word:#x}, {low_word:#x}]"
         )
 
-        # Write to both registers
-        success_46003 = await self._config_entry.runtime_data.hub.async_write_registers(
-            address_46003, values
-        )
-        success_46005 = await self._config_entry.runtime_data.hub.async_write_registers(
+        # Write to both registers; the hub skips those already holding the value
+        unchanged = hub.holds(address_46003, values) and hub.holds(
             address_46005, values
         )
+        success_46003 = await hub.async_write_registers(address_46003, values)
+        success_46005 = await hub.async_write_registers(address_46005, values)
 
         if success_46003 and success_46005:
             _LOGGER.info(f"Successfully set force_power to {int_value}W")
             # Update the state immediately (optimistic update)
             self._attr_native_value = float(int_value)
             self.async_write_ha_state()
-            # Request coordinator to refresh data to confirm the change
-            await self.coordinator.async_request_refresh()
+            if not unchanged:
+                # Request coordinator to refresh data to confirm the change
+                await self.coordinator.async_request_refresh()
         else:
             _LOGGER.error(
                 f"Failed to set force_power to {int_value}W (46003: {success_46003}, 46005: {success_46005})"
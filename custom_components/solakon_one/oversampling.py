@@ -0,0 +1,77 @@
+"""Aggregation of fast poll samples between publish intervals."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+import math
+from typing import Any
+
+
+@dataclass(slots=True)
+class SampleAggregate:
+    """Mean, minimum, maximum and last value of the samples of one key."""
+
+    count: int = 0
+    total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+    last: float | None = None
+
+    def add(self, value: float) -> None:
+        """Add a sample."""
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.last = value
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the samples."""
+        return self.total / self.count if self.count else None
+
+    def value(self, aggregate: str) -> float | None:
+        """Return an aggregate by name: mean, min, max or last."""
+        if not self.count:
+            return None
+        if aggregate == "mean":
+            return self.mean
+        if aggregate == "min":
+            return self.minimum
+        if aggregate == "max":
+            return self.maximum
+        return self.last
+
+
+class FastSampleAggregator:
+    """Collect fast poll samples and hand them out once per publish interval."""
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        """Initialize the aggregator."""
+        self.keys = tuple(keys)
+        self._current = {key: SampleAggregate() for key in self.keys}
+        self.published: dict[str, SampleAggregate] = {}
+        self.samples = 0
+
+    def add(self, values: Mapping[str, Any]) -> None:
+        """Add the values of one fast poll."""
+        self.samples += 1
+        for key, value in values.items():
+            if (aggregate := self._current.get(key)) is not None:
+                aggregate.add(float(value))
+
+    def publish(self) -> None:
+        """Publish the samples collected since the last call and start over."""
+        self.published = {
+            key: aggregate
+            for key, aggregate in self._current.items()
+            if aggregate.count
+        }
+        self._current = {key: SampleAggregate() for key in self.keys}
+
+    def value(self, key: str, aggregate: str) -> float | None:
+        """Return a published aggregate of a key."""
+        if (published := self.published.get(key)) is None:
+            return None
+        return published.value(aggregate)
@@ -0,0 +1,212 @@
+"""Peak shaving of grid import with the battery for Solakon ONE."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    CONF_CONTROLLER_METER,
+    CONF_CONTROLLER_METER_INVERTED,
+    CONF_FAST_POLL_INTERVAL,
+    CONF_PEAK_SHAVING_HYSTERESIS,
+    CONF_PEAK_SHAVING_LIMIT,
+    DEFAULT_FAST_POLL_INTERVAL,
+    DEFAULT_PEAK_SHAVING_HYSTERESIS,
+)
+from .controller import PowerMeasurement
+from .remote_control import RemoteControlMode, mode_to_register_value
+
+if TYPE_CHECKING:
+    from .coordinator import SolakonDataCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Longest interval between two checks of the import (s)
+_MAX_INTERVAL = 1.0
+# Largest discharge power of the device (W)
+_MAX_DISCHARGE = 800
+# Remote control timeout written when shaving starts; renewed by the keepalive
+_TIMEOUT = 60
+# Discharge setpoints are multiples of this (W)
+_STEP = 10
+# Owner of remote control and of the keepalive hold while shaving
+_OWNER = "peak_shaving"
+
+
+class PeakShaver:
+    """Discharge the battery while the grid import exceeds a cap.
+
+    Shaving starts as soon as the import exceeds ``limit``. The discharge
+    setpoint then integrates the deviation of the import from
+    ``limit - hysteresis / 2``, but is only written when it moved by at
+    least half the hysteresis. Shaving ends, disabling remote control, once
+    no discharge is needed and the import fell below ``limit - hysteresis``,
+    or when the battery reaches its minimum SoC.
+    """
+
+    def __init__(self, limit: float, hysteresis: float) -> None:
+        """Initialize the peak shaver."""
+        self.limit = limit
+        self.hysteresis = hysteresis
+        self.active = False
+        self.setpoint = 0
+        self.activations = 0
+
+    def _quantize(self, power: float) -> int:
+        """Return a discharge setpoint within the device's range."""
+        return min(max(round(power / _STEP) * _STEP, 0), _MAX_DISCHARGE)
+
+    def update(
+        self, grid_import: float, soc: float | None, min_soc: float | None
+    ) -> dict[str, float] | None:
+        """Return the register values to write for an import reading, if any."""
+        available = soc is None or min_soc is None or soc > min_soc
+
+        if not self.active:
+            if grid_import <= self.limit or not available:
+                return None
+            self.active = True
+            self.activations += 1
+            self.setpoint = self._quantize(
+                grid_import - self.limit + self.hysteresis / 2
+            )
+            return {
+                "remote_control": mode_to_register_value(
+                    RemoteControlMode.BATTERY_DISCHARGE
+                ),
+                "remote_timeout_set": _TIMEOUT,
+                "remote_active_power": self.setpoint,
+                "remote_reactive_power": self.setpoint,
+            }
+
+        desired = self._quantize(
+            self.setpoint + grid_import - (self.limit - self.hysteresis / 2)
+        )
+        if not available or (
+            desired == 0 and grid_import < self.limit - self.hysteresis
+        ):
+            self.active = False
+            self.setpoint = 0
+            return {"remote_control": 0}
+        if abs(desired - self.setpoint) < self.hysteresis / 2:
+            return None
+        self.setpoint = desired
+        return {"remote_active_power": desired, "remote_reactive_power": desired}
+
+
+class PeakShavingController:
+    """Run the peak shaver on the fast path and write its setpoints.
+
+    The grid import is read from the configured meter of the grid
+    connection. The device's own active power does not include the load of
+    the house, so peak shaving is not set up without a meter.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: SolakonDataCoordinator,
+        options: Mapping[str, Any],
+    ) -> None:
+        """Initialize the controller from the config entry options."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self.shaver = PeakShaver(
+            float(options[CONF_PEAK_SHAVING_LIMIT]),
+            float(
+                options.get(
+                    CONF_PEAK_SHAVING_HYSTERESIS, DEFAULT_PEAK_SHAVING_HYSTERESIS
+                )
+            ),
+        )
+        fast_poll_interval = float(
+            options.get(CONF_FAST_POLL_INTERVAL, DEFAULT_FAST_POLL_INTERVAL)
+        )
+        self.interval = (
+            min(fast_poll_interval, _MAX_INTERVAL)
+            if fast_poll_interval
+            else _MAX_INTERVAL
+        )
+        self._measurement = PowerMeasurement(
+            hass,
+            options[CONF_CONTROLLER_METER],
+            bool(options.get(CONF_CONTROLLER_METER_INVERTED, False)),
+        )
+        self.grid_import: float | None = None
+        self.writes = 0
+        self._unsub: list[CALLBACK_TYPE] = []
+        self._busy = False
+
+    @callback
+    def async_start(self) -> None:
+        """Start watching the import."""
+        self._unsub.append(
+            async_track_time_interval(
+                self._hass,
+                self._async_check,
+                timedelta(seconds=self.interval),
+                name="Solakon ONE peak shaving",
+                cancel_on_shutdown=True,
+            )
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop watching the import."""
+        while self._unsub:
+            self._unsub.pop()()
+        self._coordinator.hub.keepalive.async_stop(_OWNER)
+        self._coordinator.hub.remote_control.release(_OWNER)
+
+    async def _async_check(self, _: datetime) -> None:
+        """Read the import and write changed setpoints."""
+        if self._busy:
+            return
+        self._busy = True
+        try:
+            if (measurement := await self._measurement.async_read()) is None:
+                return
+            self.grid_import = -measurement
+            hub = self._coordinator.hub
+            if not self.shaver.active and not hub.remote_control.claim(_OWNER):
+                # The schedule or zero export control runs remote control
+                return
+            data = self._coordinator.data
+            values = self.shaver.update(
+                self.grid_import,
+                data.get("battery_soc") if data is not None else None,
+                data.get("minimum_soc") if data is not None else None,
+            )
+            if values is None:
+                return
+            results = await hub.async_write_values(values)
+            self.writes += 1
+            if not all(results.values()):
+                _LOGGER.warning("Failed to write peak shaving values %s", values)
+
+            if self.shaver.active:
+                # Hold the discharge mode for as long as shaving is needed
+                hub.keepalive.async_start(_OWNER)
+            else:
+                hub.keepalive.async_stop(_OWNER)
+        finally:
+            if not self.shaver.active:
+                self._coordinator.hub.remote_control.release(_OWNER)
+            self._busy = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the peak shaving state for diagnostics."""
+        return {
+            "limit": self.shaver.limit,
+            "active": self.shaver.active,
+            "grid_import": self.grid_import,
+            "setpoint": self.shaver.setpoint,
+            "activations": self.shaver.activations,
+            "writes": self.writes,
+        }
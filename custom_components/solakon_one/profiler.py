@@ -0,0 +1,118 @@
+"""On-demand profiling of the Solakon ONE poll and entity update path."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+import cProfile
+from dataclasses import dataclass, field
+import io
+import pstats
+import time
+from typing import Any
+
+# Number of functions listed per section of the report
+_REPORT_FUNCTIONS = 40
+
+
+@dataclass
+class ListenerStats:
+    """Accumulated update time of one coordinator listener."""
+
+    calls: int = 0
+    total: float = 0.0
+    worst: float = 0.0
+
+
+@dataclass
+class CycleProfile:
+    """Timings collected while profiling coordinator cycles.
+
+    A profile is attached to the coordinator only for the duration of a
+    profiling run; without one the coordinator takes its regular path.
+    """
+
+    profiler: cProfile.Profile = field(default_factory=cProfile.Profile)
+    cycles: list[tuple[float, float]] = field(default_factory=list)
+    listeners: defaultdict[str, ListenerStats] = field(
+        default_factory=lambda: defaultdict(ListenerStats)
+    )
+    _read_time: float = 0.0
+
+    def add_read(self, elapsed: float) -> None:
+        """Record the hub read time of the current cycle."""
+        self._read_time = elapsed
+
+    def add_cycle(self, elapsed: float) -> None:
+        """Record the total time of a finished cycle."""
+        self.cycles.append((elapsed, self._read_time))
+        self._read_time = 0.0
+
+    def update_listeners(self, callbacks: Iterable[Callable[[], None]]) -> None:
+        """Call coordinator listeners and time each of them."""
+        for update_callback in callbacks:
+            start = time.perf_counter()
+            update_callback()
+            elapsed = time.perf_counter() - start
+            stats = self.listeners[_listener_name(update_callback)]
+            stats.calls += 1
+            stats.total += elapsed
+            stats.worst = max(stats.worst, elapsed)
+
+    def summary(self) -> dict[str, Any]:
+        """Return a compact summary of the run in milliseconds."""
+        cycles = len(self.cycles) or 1
+        slowest = sorted(
+            self.listeners.items(), key=lambda item: item[1].total, reverse=True
+        )[:10]
+        return {
+            "cycles": len(self.cycles),
+            "cycle_ms": round(1000 * sum(c for c, _ in self.cycles) / cycles, 3),
+            "read_ms": round(1000 * sum(r for _, r in self.cycles) / cycles, 3),
+            "listeners_ms": round(
+                1000 * sum(s.total for s in self.listeners.values()) / cycles, 3
+            ),
+            "slowest_listeners": {
+                name: round(1000 * stats.total / cycles, 3) for name, stats in slowest
+            },
+        }
+
+    def report(self, title: str) -> str:
+        """Render the full text report."""
+        out = io.StringIO()
+        summary = self.summary()
+        out.write(f"Solakon ONE profile of {title}\n")
+        out.write(f"{summary['cycles']} coordinator cycles\n\n")
+
+        out.write("Cycle     total ms    read ms\n")
+        for index, (elapsed, read) in enumerate(self.cycles, 1):
+            out.write(f"{index:5d} {1000 * elapsed:12.3f} {1000 * read:10.3f}\n")
+        out.write(f"mean  {summary['cycle_ms']:12.3f} {summary['read_ms']:10.3f}\n\n")
+
+        out.write("Entity updates (sorted by total time)\n")
+        out.write("   calls    total ms     mean ms    worst ms  listener\n")
+        for name, stats in sorted(
+            self.listeners.items(), key=lambda item: item[1].total, reverse=True
+        ):
+            out.write(
+                f"{stats.calls:8d} {1000 * stats.total:11.3f} "
+                f"{1000 * stats.total / stats.calls:11.3f} "
+                f"{1000 * stats.worst:11.3f}  {name}\n"
+            )
+
+        profile_stats = pstats.Stats(self.profiler, stream=out)
+        out.write("\nIntegration functions (sorted by cumulative time)\n")
+        profile_stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+            "solakon_one", _REPORT_FUNCTIONS
+        )
+        out.write("\nAll functions (sorted by internal time)\n")
+        profile_stats.sort_stats(pstats.SortKey.TIME).print_stats(_REPORT_FUNCTIONS)
+        return out.getvalue()
+
+
+def _listener_name(update_callback: Callable[[], None]) -> str:
+    """Return a readable name for a coordinator listener."""
+    owner = getattr(update_callback, "__self__", None)
+    if (entity_id := getattr(owner, "entity_id", None)) is not None:
+        return str(entity_id)
+    return getattr(update_callback, "__qualname__", repr(update_callback))
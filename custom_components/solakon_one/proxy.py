@@ -0,0 +1,120 @@
+"""Local Modbus TCP proxy for Solakon ONE.
+
+Serves holding register reads to other Modbus clients from the hub's
+register image and forwards their writes through the hub, so third-party
+tools share the integration's single connection to the inverter. Clients
+are not authenticated, so the proxy listens on localhost unless configured
+otherwise and only forwards writes to registers marked writable.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import cast
+
+from pymodbus.constants import ExcCodes
+from pymodbus.datastore import ModbusBaseDeviceContext, ModbusServerContext
+from pymodbus.server import ModbusTcpServer
+
+from .const import REGISTERS
+from .modbus import SolakonModbusHub
+
+_LOGGER = logging.getLogger(__name__)
+
+_WRITE_SINGLE_REGISTER = 6
+# Words of the registers proxy clients may write
+_WRITABLE_ADDRESSES = frozenset(
+    address
+    for config in REGISTERS.values()
+    if config.get("rw", False)
+    for address in range(
+        cast(int, config["address"]),
+        cast(int, config["address"]) + cast(int, config.get("count", 1)),
+    )
+)
+
+
+class SolakonProxyDeviceContext(ModbusBaseDeviceContext):
+    """Device context answering proxy requests through the hub."""
+
+    def __init__(self, hub: SolakonModbusHub, max_age: float) -> None:
+        """Initialize the device context."""
+        self._hub = hub
+        self._max_age = max_age
+
+    def reset(self) -> None:
+        """Reset the datastore (nothing to reset, the hub owns the data)."""
+
+    async def async_getValues(
+        self, func_code: int, address: int, count: int = 1
+    ) -> list[int] | list[bool] | ExcCodes:
+        """Return holding registers from the register image or the device."""
+        if self.decode(func_code) != "h":
+            return ExcCodes.ILLEGAL_FUNCTION
+
+        words = await self._hub.async_read_cached(address, count, self._max_age)
+        if words is None:
+            return ExcCodes.GATEWAY_NO_RESPONSE
+        return words
+
+    async def async_setValues(
+        self, func_code: int, address: int, values: list[int] | list[bool]
+    ) -> None | ExcCodes:
+        """Forward a register write through the hub's serialized write path."""
+        if self.decode(func_code) != "h":
+            return ExcCodes.ILLEGAL_FUNCTION
+
+        words = [int(value) for value in values]
+        if any(
+            word_address not in _WRITABLE_ADDRESSES
+            for word_address in range(address, address + len(words))
+        ):
+            _LOGGER.warning(
+                "Rejected proxy write of %d registers at address %d: not writable",
+                len(words),
+                address,
+            )
+            return ExcCodes.ILLEGAL_ADDRESS
+
+        if func_code == _WRITE_SINGLE_REGISTER:
+            success = await self._hub.async_write_register(address, words[0])
+        else:
+            success = await self._hub.async_write_registers(address, words)
+
+        _LOGGER.debug(
+            "Proxy write of %d registers at address %d: %s",
+            len(words),
+            address,
+            "ok" if success else "failed",
+        )
+        return None if success else ExcCodes.DEVICE_FAILURE
+
+
+class SolakonModbusProxy:
+    """Modbus TCP server sharing the hub with other local clients."""
+
+    def __init__(
+        self,
+        hub: SolakonModbusHub,
+        host: str,
+        port: int,
+        max_age: float,
+    ) -> None:
+        """Initialize the proxy."""
+        self.host = host
+        self.port = port
+        self.max_age = max_age
+        context = ModbusServerContext(
+            devices=SolakonProxyDeviceContext(hub, max_age), single=True
+        )
+        self._server = ModbusTcpServer(context, address=(host, port))
+
+    async def async_start(self) -> None:
+        """Start listening for proxy clients."""
+        await self._server.serve_forever(background=True)
+        _LOGGER.info("Modbus proxy listening on %s:%d", self.host, self.port)
+
+    async def async_stop(self) -> None:
+        """Stop the proxy and disconnect its clients."""
+        await self._server.shutdown()
+        _LOGGER.info("Modbus proxy on port %d stopped", self.port)
@@ -0,0 +1,160 @@
+"""Rate-limited ramping of register setpoints for Solakon ONE."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+
+if TYPE_CHECKING:
+    from .modbus import SolakonModbusHub
+
+_LOGGER = logging.getLogger(__name__)
+
+# Interval between two ramp steps (s), bounding the write rate
+RAMP_INTERVAL = 0.5
+
+
+@dataclass(slots=True)
+class _Ramp:
+    """Running ramp of one register key."""
+
+    value: float
+    target: float
+    rate: float
+
+
+class SetpointRamper:
+    """Move register values towards their targets at a bounded rate.
+
+    On each tick every running ramp advances by ``rate * elapsed``. The new
+    values of all ramps are written in one go through
+    ``hub.async_write_values``, which merges adjacent registers into one
+    write and skips unchanged ones. A new target for a key replaces the
+    ramp running for it, and a direct write of a key cancels its ramp.
+    """
+
+    def __init__(self, hass: HomeAssistant, hub: SolakonModbusHub) -> None:
+        """Initialize the ramper."""
+        self._hass = hass
+        self._hub = hub
+        self._ramps: dict[str, _Ramp] = {}
+        self._pending: dict[str, float] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._last_tick: float | None = None
+        self.steps = 0
+        self.writes = 0
+
+    @property
+    def targets(self) -> dict[str, float]:
+        """Return the targets of the running ramps."""
+        return {key: ramp.target for key, ramp in self._ramps.items()}
+
+    @callback
+    def ramp(self, values: Mapping[str, float], rate: float) -> None:
+        """Ramp keys to target values at ``rate`` units per second."""
+        for key, target in values.items():
+            if (ramp := self._ramps.get(key)) is not None:
+                start = ramp.value
+            elif (current := self._hub.value(key)) is not None:
+                start = float(current)
+            else:
+                # Without a known start there is nothing to ramp from
+                self._pending[key] = target
+                continue
+            self._ramps[key] = _Ramp(start, target, rate)
+        self._arm()
+
+    @callback
+    def cancel(self, keys: Iterable[str]) -> None:
+        """Stop ramping keys that are written directly."""
+        for key in keys:
+            self._ramps.pop(key, None)
+            self._pending.pop(key, None)
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel all ramps and pending values."""
+        self._ramps.clear()
+        self._pending.clear()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _arm(self) -> None:
+        """Schedule the next tick unless one is due or running."""
+        if self._timer is not None or self._task is not None:
+            return
+        if not self._ramps and not self._pending:
+            self._last_tick = None
+            return
+        if self._last_tick is None:
+            # The first step of a ramp is written right away
+            self._last_tick = time.monotonic() - RAMP_INTERVAL
+            delay = 0.0
+        else:
+            delay = max(self._last_tick + RAMP_INTERVAL - time.monotonic(), 0.0)
+        self._timer = self._hass.loop.call_later(delay, self._handle_timer)
+
+    @callback
+    def _handle_timer(self) -> None:
+        """Run the tick in the background."""
+        self._timer = None
+        task = self._hass.async_create_background_task(
+            self._async_tick(), name="Solakon ONE setpoint ramp"
+        )
+        # An eagerly started task may already have finished
+        self._task = None if task.done() else task
+
+    def step(self, elapsed: float) -> dict[str, float]:
+        """Advance all ramps by ``elapsed`` seconds and return the values to write."""
+        values = self._pending
+        self._pending = {}
+        for key, ramp in list(self._ramps.items()):
+            delta = ramp.target - ramp.value
+            limit = ramp.rate * elapsed
+            if abs(delta) <= limit:
+                ramp.value = ramp.target
+                del self._ramps[key]
+            else:
+                ramp.value += limit if delta > 0 else -limit
+            values[key] = round(ramp.value)
+            self.steps += 1
+        return values
+
+    async def _async_tick(self) -> None:
+        """Write the next step of all ramps and the queued values."""
+        try:
+            now = time.monotonic()
+            elapsed = now - self._last_tick if self._last_tick is not None else 0.0
+            self._last_tick = now
+            if not (values := self.step(elapsed)):
+                return
+            results = await self._hub.async_write_values(values, cancel_ramps=False)
+            self.writes += 1
+            if not all(results.values()):
+                _LOGGER.warning(
+                    "Failed to write ramp values %s",
+                    [key for key, success in results.items() if not success],
+                )
+        finally:
+            self._task = None
+            self._arm()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the ramp state for diagnostics."""
+        return {
+            "ramps": {
+                key: {"value": ramp.value, "target": ramp.target, "rate": ramp.rate}
+                for key, ramp in self._ramps.items()
+            },
+            "pending": dict(self._pending),
+            "steps": self.steps,
+            "writes": self.writes,
+        }
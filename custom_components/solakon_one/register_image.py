@@ -0,0 +1,245 @@
+"""Raw register image for Solakon ONE."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from typing import Any
+
+# Layout entry of a key: (block address, offset in block, word count, config)
+type KeyLayout = tuple[int, int, int, dict[str, Any]]
+
+_MISSING = object()
+
+
+class RegisterImage:
+    """Latest raw register words read from the device, indexed by address.
+
+    The image holds one preallocated ``array("H")`` per planner batch.
+    Batch responses are copied into these blocks in place, so polling does
+    not allocate new containers for the register data. Each block records
+    the monotonic time and the poll generation of its last successful read.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty register image."""
+        self._blocks: dict[int, array[int]] = {}
+        self._timestamps: dict[int, float] = {}
+        self._generations: dict[int, int] = {}
+
+    def allocate(self, address: int, count: int) -> None:
+        """Reserve a zeroed block of ``count`` words at ``address``."""
+        if address not in self._blocks or len(self._blocks[address]) != count:
+            self._blocks[address] = array("H", bytes(2 * count))
+            self._timestamps[address] = 0.0
+            self._generations[address] = 0
+
+    def store(
+        self,
+        address: int,
+        registers: Sequence[int],
+        timestamp: float,
+        generation: int = 0,
+    ) -> None:
+        """Copy the words of a block read at ``timestamp`` into the image.
+
+        A read shorter than the block updates its leading words only.
+        """
+        block = self._blocks.get(address)
+        if block is None or len(block) < len(registers):
+            self._blocks[address] = array("H", registers)
+        else:
+            block[: len(registers)] = array("H", registers)
+        self._timestamps[address] = timestamp
+        self._generations[address] = generation
+
+    def update(self, address: int, values: Sequence[int]) -> None:
+        """Apply successfully written words to the blocks covering them."""
+        for offset, value in enumerate(values):
+            if (start := self._find(address + offset)) is not None:
+                self._blocks[start][address + offset - start] = value
+
+    def read(self, address: int, count: int, min_timestamp: float) -> list[int] | None:
+        """Return ``count`` words from ``address`` if all are cached and fresh.
+
+        Returns None if any requested word is not cached or was read before
+        ``min_timestamp``.
+        """
+        words: list[int] = []
+        current = address
+        end = address + count
+        while current < end:
+            start = self._find(current)
+            if (
+                start is None
+                or self._generations[start] == 0
+                or self._timestamps[start] < min_timestamp
+            ):
+                return None
+            block = self._blocks[start]
+            offset = current - start
+            take = min(end - current, len(block) - offset)
+            words.extend(block[offset : offset + take])
+            current += take
+        return words
+
+    def words(self, address: int, offset: int, count: int) -> array[int]:
+        """Return a copy of ``count`` words at ``offset`` of a block."""
+        return self._blocks[address][offset : offset + count]
+
+    def timestamp(self, address: int) -> float:
+        """Return the monotonic time of the last successful read of a block."""
+        return self._timestamps.get(address, 0.0)
+
+    def generation(self, address: int) -> int:
+        """Return the poll generation of the last successful read of a block."""
+        return self._generations.get(address, 0)
+
+    def _find(self, address: int) -> int | None:
+        """Return the start address of the block containing ``address``."""
+        for start, block in self._blocks.items():
+            if start <= address < start + len(block):
+                return start
+        return None
+
+
+class RegisterSnapshot(Mapping[str, Any]):
+    """Read-only view of the register image for one poll.
+
+    Keys are decoded lazily on first access and memoized for the lifetime
+    of the snapshot. A key is present if its block was read successfully in
+    this poll, or in an earlier poll not before ``stale_before``, and decodes
+    to a value other than None. Static blocks and blocks shed from this poll
+    count once they have been read at all. A failed batch read therefore
+    keeps the last values of its keys until they become stale. The view is
+    meant to be consumed until the next poll, which writes new words into
+    the same image.
+    """
+
+    def __init__(
+        self,
+        image: RegisterImage,
+        layout: Mapping[str, KeyLayout],
+        decode: Callable[[Sequence[int], dict[str, Any]], Any],
+        generation: int,
+        static_blocks: frozenset[int],
+        shed_blocks: frozenset[int] = frozenset(),
+        stale_before: float | None = None,
+    ) -> None:
+        """Initialize the snapshot."""
+        self._image = image
+        self._layout = layout
+        self._decode = decode
+        self.generation = generation
+        self._static_blocks = static_blocks
+        self._shed_blocks = shed_blocks
+        self._stale_before = stale_before
+        self._values: dict[str, Any] = {}
+
+    def _block_valid(self, address: int) -> bool:
+        """Return if a block holds data for this snapshot."""
+        if address in self._static_blocks or address in self._shed_blocks:
+            return self._image.generation(address) > 0
+        return self._block_current(address)
+
+    def _block_current(self, address: int) -> bool:
+        """Return if a block was read in this poll or is not yet stale."""
+        block_generation = self._image.generation(address)
+        if block_generation >= self.generation:
+            return True
+        if block_generation == 0:
+            return False
+        return (
+            self._stale_before is not None
+            and self._image.timestamp(address) >= self._stale_before
+        )
+
+    def _value(self, key: str) -> Any:
+        """Return the decoded value of a key, or _MISSING."""
+        if (value := self._values.get(key, _MISSING)) is not _MISSING:
+            return value
+        if (layout := self._layout.get(key)) is None:
+            return _MISSING
+        address, offset, count, config = layout
+        if not self._block_valid(address):
+            value = _MISSING
+        else:
+            value = self._decode(self._image.words(address, offset, count), config)
+            if value is None:
+                value = _MISSING
+        self._values[key] = value
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the decoded value of a key."""
+        if (value := self._value(key)) is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        """Return if a key has a value in this snapshot."""
+        return isinstance(key, str) and self._value(key) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the keys with a value in this snapshot."""
+        return (key for key in self._layout if self._value(key) is not _MISSING)
+
+    def __len__(self) -> int:
+        """Return the number of keys with a value in this snapshot."""
+        return sum(1 for _ in self)
+
+    def __bool__(self) -> bool:
+        """Return if any polled block holds current data for this snapshot.
+
+        Static and shed blocks keep their last words indefinitely, so they do
+        not count; a poll without any usable dynamic data is a failed poll.
+        """
+        return any(
+            self._block_current(address)
+            for address, _, _, _ in self._layout.values()
+            if address not in self._static_blocks and address not in self._shed_blocks
+        )
+
+    def raw(self, key: str) -> array[int] | None:
+        """Return the raw register words of a key, or None if not present."""
+        if (layout := self._layout.get(key)) is None:
+            return None
+        address, offset, count, _ = layout
+        if not self._block_valid(address):
+            return None
+        return self._image.words(address, offset, count)
+
+    def timestamp(self, key: str) -> float | None:
+        """Return the monotonic read time of a key's block."""
+        if (layout := self._layout.get(key)) is None:
+            return None
+        return self._image.timestamp(layout[0])
+
+    def fresh(self, key: str) -> bool:
+        """Return if a key's block was read in this poll."""
+        if (layout := self._layout.get(key)) is None:
+            return False
+        return self._image.generation(layout[0]) >= self.generation
+
+    def timestamps(self) -> dict[int, float]:
+        """Return the monotonic read times of the blocks of this snapshot."""
+        return {
+            address: self._image.timestamp(address)
+            for address in {layout[0] for layout in self._layout.values()}
+            if self._block_valid(address)
+        }
+
+    def skew(self, *keys: str) -> float | None:
+        """Return the time between the earliest and latest read of keys.
+
+        Keys of one block, such as a coherence group, have no skew. Returns
+        None if any of the keys is not present.
+        """
+        timestamps: list[float] = []
+        for key in keys:
+            if (layout := self._layout.get(key)) is None or not self._block_valid(
+                layout[0]
+            ):
+                return None
+            timestamps.append(self._image.timestamp(layout[0]))
+        return max(timestamps) - min(timestamps) if timestamps else None
@@ -161,3 +161,28 @@ def get_mode_description(mode: RemoteControlMode) -> str:
         RemoteControlMode.INV_CHARGE_AC_FIRST: "INV Charge (AC First)",
     }
     return descriptions.get(mode, "Unknown")
+
+
+class RemoteControlOwner:
+    """Exclusive ownership of the remote control registers of a device.
+
+    The schedule, peak shaving and the zero export controller all write the
+    remote control mode or power setpoints. Each claims ownership before it
+    takes over and releases it when done, so none of them overwrites or
+    disables a mode another one runs.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without an owner."""
+        self.owner: str | None = None
+
+    def claim(self, owner: str) -> bool:
+        """Take ownership for ``owner`` and return whether it holds it now."""
+        if self.owner is None:
+            self.owner = owner
+        return self.owner == owner
+
+    def release(self, owner: str) -> None:
+        """Give up ownership if ``owner`` holds it."""
+        if self.owner == owner:
+            self.owner = None
@@ -0,0 +1,316 @@
+"""Local time-of-use schedule of remote control modes for Solakon ONE."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+import heapq
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .remote_control import RemoteControlMode, mode_to_register_value
+
+if TYPE_CHECKING:
+    from .modbus import SolakonModbusHub
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Largest remote control timeout the device accepts (s)
+_MAX_TIMEOUT = 0xFFFF
+# The timeout runs this much past the end of a slot, so the next slot (or
+# the end of the schedule) takes over before the device falls back
+_TIMEOUT_MARGIN = 60
+
+_SECONDS_PER_DAY = 86400
+# Slot index of queued timeout renewals of long slots
+_RENEWAL = -1
+# Owner of remote control while a slot runs
+_OWNER = "schedule"
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleSlot:
+    """Daily time slot running a remote control mode."""
+
+    start: time
+    end: time
+    mode: RemoteControlMode
+    power: int
+    min_soc: int | None = None
+
+    def _ranges(self) -> list[tuple[int, int]]:
+        """Return the slot as second-of-day ranges, split at midnight."""
+        start = self.start.hour * 3600 + self.start.minute * 60 + self.start.second
+        end = self.end.hour * 3600 + self.end.minute * 60 + self.end.second
+        if start < end:
+            return [(start, end)]
+        return [(start, _SECONDS_PER_DAY), (0, end)]
+
+    def contains(self, moment: time) -> bool:
+        """Return whether the slot covers a time of day."""
+        if self.start < self.end:
+            return self.start <= moment < self.end
+        return moment >= self.start or moment < self.end
+
+    def overlaps(self, other: ScheduleSlot) -> bool:
+        """Return whether two slots share any time of day."""
+        return any(
+            start < other_end and other_start < end
+            for start, end in self._ranges()
+            for other_start, other_end in other._ranges()
+        )
+
+    def values(self, remaining: float) -> dict[str, float]:
+        """Return the register values running this slot for ``remaining`` s."""
+        values: dict[str, float] = {
+            "remote_control": mode_to_register_value(self.mode),
+            "remote_timeout_set": min(int(remaining) + _TIMEOUT_MARGIN, _MAX_TIMEOUT),
+            # The power command goes to both power registers, as for force power
+            "remote_active_power": abs(self.power),
+            "remote_reactive_power": abs(self.power),
+        }
+        if self.min_soc is not None:
+            values["minimum_soc"] = self.min_soc
+        return values
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the slot in its stored form."""
+        return {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "mode": self.mode.name.lower(),
+            "power": self.power,
+            "min_soc": self.min_soc,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ScheduleSlot:
+        """Create a slot from its stored form."""
+        return cls(
+            start=time.fromisoformat(data["start"]),
+            end=time.fromisoformat(data["end"]),
+            mode=RemoteControlMode[data["mode"].upper()],
+            power=int(data["power"]),
+            min_soc=data.get("min_soc"),
+        )
+
+
+def _next_occurrence(moment: time, after: datetime) -> datetime:
+    """Return the first local datetime at ``moment`` later than ``after``."""
+    local = dt_util.as_local(after)
+    candidate = datetime.combine(local.date(), moment, local.tzinfo)
+    if candidate <= local:
+        candidate = datetime.combine(
+            local.date() + timedelta(days=1), moment, local.tzinfo
+        )
+    return dt_util.as_utc(candidate)
+
+
+def _schedule_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store of the schedule of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.schedule.{entry_id}")
+
+
+async def async_remove_schedule(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored schedule of a removed config entry."""
+    await _schedule_store(hass, entry_id).async_remove()
+
+
+class ScheduleExecutor:
+    """Run a persisted daily schedule with a single timer.
+
+    The start and end times of all slots are kept in a heap; one timer is
+    armed for the earliest of them. At each boundary the active slot's
+    register values are written through the hub, which skips the values
+    the device already holds and merges the rest into contiguous writes.
+    A slot only runs while the schedule owns remote control. When a slot
+    the schedule ran ends without a following one, remote control is
+    disabled; other modes are left alone. The minimum SoC a slot overrides
+    is stored before the slot and restored once a slot without one, or no
+    slot, follows.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, hub: SolakonModbusHub, entry_id: str
+    ) -> None:
+        """Initialize the executor."""
+        self._hass = hass
+        self._hub = hub
+        self._store = _schedule_store(hass, entry_id)
+        self.slots: list[ScheduleSlot] = []
+        # Slot whose values were written last, until remote control is reset
+        self._applied: ScheduleSlot | None = None
+        # Minimum SoC of the device before a slot overrode it
+        self._saved_min_soc: float | None = None
+        self._events: list[tuple[datetime, int]] = []
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self.transitions = 0
+        self.last_transition: datetime | None = None
+        self.last_delay: float | None = None
+
+    async def async_load(self) -> None:
+        """Load the stored schedule and start running it."""
+        if (data := await self._store.async_load()) is not None:
+            self.slots = [ScheduleSlot.from_dict(slot) for slot in data["slots"]]
+            self._saved_min_soc = data.get("saved_min_soc")
+        await self._async_start()
+
+    async def async_set(self, slots: Sequence[ScheduleSlot]) -> None:
+        """Replace, store and start running the schedule."""
+        self.slots = list(slots)
+        await self._async_save()
+        # Leaving a slot of the old schedule ends it
+        await self._async_start()
+
+    async def _async_save(self) -> None:
+        """Store the slots and the minimum SoC to restore."""
+        await self._store.async_save(
+            {
+                "slots": [slot.as_dict() for slot in self.slots],
+                "saved_min_soc": self._saved_min_soc,
+            }
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the timer and release remote control."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._hub.remote_control.release(_OWNER)
+
+    def active_slot(self, now: datetime) -> ScheduleSlot | None:
+        """Return the slot covering a moment."""
+        moment = dt_util.as_local(now).time()
+        return next((slot for slot in self.slots if slot.contains(moment)), None)
+
+    async def _async_start(self) -> None:
+        """Rebuild the boundary heap and apply the current slot."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        now = dt_util.utcnow()
+        self._events = []
+        self._push(range(len(self.slots)), now)
+        await self._async_apply(now)
+        self._arm()
+
+    def _push(self, indices: Iterable[int], after: datetime) -> None:
+        """Queue the next start and end of slots."""
+        for index in indices:
+            slot = self.slots[index]
+            heapq.heappush(self._events, (_next_occurrence(slot.start, after), index))
+            heapq.heappush(self._events, (_next_occurrence(slot.end, after), index))
+
+    def _arm(self) -> None:
+        """Arm the timer for the earliest boundary."""
+        if self._events:
+            self._unsub_timer = async_track_point_in_utc_time(
+                self._hass, self._async_boundary, self._events[0][0]
+            )
+
+    async def _async_boundary(self, now: datetime) -> None:
+        """Handle all boundaries that are due at ``now``, the armed time."""
+        self._unsub_timer = None
+        self.last_delay = (dt_util.utcnow() - now).total_seconds()
+        while self._events and self._events[0][0] <= now:
+            when, index = heapq.heappop(self._events)
+            if index != _RENEWAL:
+                # Re-queue the boundary for the next day
+                heapq.heappush(
+                    self._events,
+                    (_next_occurrence(dt_util.as_local(when).time(), when), index),
+                )
+        await self._async_apply(now)
+        self._arm()
+
+    async def _async_apply(self, now: datetime) -> None:
+        """Write the register values of the slot active at ``now``."""
+        slot = self.active_slot(now)
+        values: dict[str, float] = {}
+        if slot is None:
+            if self._applied is None and self._saved_min_soc is None:
+                # Remote control is not the schedule's to disable
+                return
+            if self._applied is not None:
+                values["remote_control"] = 0
+        elif not self._hub.remote_control.claim(_OWNER):
+            _LOGGER.warning(
+                "Skipping schedule slot %s: remote control is run by %s",
+                slot.as_dict(),
+                self._hub.remote_control.owner,
+            )
+            return
+        else:
+            end = _next_occurrence(slot.end, now)
+            remaining = (end - now).total_seconds()
+            values = slot.values(remaining)
+            if slot.min_soc is not None and self._saved_min_soc is None:
+                # Survives restarts, so a restarted slot does not save its own
+                current = (await self._hub.async_read_keys(["minimum_soc"]))[
+                    "minimum_soc"
+                ]
+                if current is None:
+                    _LOGGER.warning(
+                        "Minimum SoC could not be read and is not restored "
+                        "after the schedule slot"
+                    )
+                else:
+                    self._saved_min_soc = current
+                    await self._async_save()
+            if remaining + _TIMEOUT_MARGIN > _MAX_TIMEOUT:
+                # Renew before the device's timeout runs out
+                heapq.heappush(
+                    self._events,
+                    (
+                        now + timedelta(seconds=_MAX_TIMEOUT - _TIMEOUT_MARGIN),
+                        _RENEWAL,
+                    ),
+                )
+
+        # The minimum SoC to restore, once no slot overrides it any more
+        restore = self._saved_min_soc if slot is None or slot.min_soc is None else None
+        if restore is not None:
+            values["minimum_soc"] = restore
+
+        results = await self._hub.async_write_values(values)
+        self._applied = slot
+        if restore is not None and results.get("minimum_soc", True):
+            self._saved_min_soc = None
+            await self._async_save()
+        if slot is None:
+            self._hub.remote_control.release(_OWNER)
+        self.transitions += 1
+        self.last_transition = now
+        _LOGGER.debug(
+            "Applied schedule slot %s: wrote %s",
+            slot.as_dict() if slot else None,
+            results,
+        )
+        if not all(results.values()):
+            _LOGGER.warning(
+                "Failed to write schedule values: %s",
+                [key for key, success in results.items() if not success],
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the schedule state for diagnostics."""
+        return {
+            "slots": [slot.as_dict() for slot in self.slots],
+            "next_boundary": self._events[0][0].isoformat() if self._events else None,
+            "applied_slot": self._applied.as_dict() if self._applied else None,
+            "saved_min_soc": self._saved_min_soc,
+            "transitions": self.transitions,
+            "last_transition": self.last_transition.isoformat()
+            if self.last_transition
+            else None,
+            "last_delay": self.last_delay,
+        }
@@ -0,0 +1,86 @@
+"""Fleet-level poll scheduling for Solakon ONE coordinators."""
+
+from __future__ import annotations
+
+from itertools import pairwise
+import logging
+import math
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+POLL_SCHEDULER: HassKey[SolakonPollScheduler] = HassKey(f"{DOMAIN}_poll_scheduler")
+
+
+class SolakonPollScheduler:
+    """Assign stable phase offsets to the coordinators of all config entries.
+
+    Every coordinator polls on a grid anchored to the monotonic event loop
+    clock: ``phase * interval + k * interval``. Phases are fractions of the
+    interval, so entries with different scan intervals are spread as well.
+    A new member takes the midpoint of the largest free gap on the circle,
+    which keeps the phases of existing members untouched.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self._phases: dict[str, float] = {}
+
+    @property
+    def phases(self) -> dict[str, float]:
+        """Return the assigned phase fractions by member id."""
+        return dict(self._phases)
+
+    @callback
+    def async_register(self, member_id: str) -> float:
+        """Register a member and return its phase fraction in [0, 1)."""
+        if member_id in self._phases:
+            return self._phases[member_id]
+
+        taken = sorted(self._phases.values())
+        if not taken:
+            phase = 0.0
+        else:
+            # Find the largest gap between neighbours, wrapping around 1.0
+            best_start = taken[-1]
+            best_gap = taken[0] + 1.0 - taken[-1]
+            for start, end in pairwise(taken):
+                if end - start > best_gap:
+                    best_start, best_gap = start, end - start
+            phase = (best_start + best_gap / 2) % 1.0
+
+        self._phases[member_id] = phase
+        _LOGGER.debug(
+            "Assigned poll phase %.4f to %s (%d members)",
+            phase,
+            member_id,
+            len(self._phases),
+        )
+        return phase
+
+    @callback
+    def async_unregister(self, member_id: str) -> None:
+        """Release the phase of a member."""
+        self._phases.pop(member_id, None)
+
+    def next_refresh(self, member_id: str, interval: float, now: float) -> float:
+        """Return the next grid point strictly after ``now`` for a member.
+
+        Missed grid points are skipped rather than queued, so a poll that
+        overruns its interval does not shift the cadence of later polls.
+        """
+        offset = self._phases.get(member_id, 0.0) * interval
+        slot = math.floor((now - offset) / interval) + 1
+        return offset + slot * interval
+
+
+@callback
+def get_poll_scheduler(hass: HomeAssistant) -> SolakonPollScheduler:
+    """Return the poll scheduler shared by all config entries."""
+    if (scheduler := hass.data.get(POLL_SCHEDULER)) is None:
+        scheduler = hass.data[POLL_SCHEDULER] = SolakonPollScheduler()
+    return scheduler
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from typing import cast
 
 from homeassistant.components.select import SelectEntity, SelectEntityDescription
 from homeassistant.core import HomeAssistant, callback
@@ -169,16 +170,17 @@ class SolakonSelect(SolakonEntity, SelectEntity):
 
         # Get the numeric value to write
         numeric_value = int(option)
-        address = self._register_config["address"]
+        address = cast(int, self._register_config["address"])
 
         _LOGGER.info(
             f"Setting {self.entity_description.key} at address {address} to '{option}' (value: {numeric_value})"
         )
 
         # Write the value to the register (single register for selects)
-        success = await self._config_entry.runtime_data.hub.async_write_register(
-            address, numeric_value
-        )
+        hub = self._config_entry.runtime_data.hub
+        # The hub skips the write if the device already holds the value
+        unchanged = hub.holds(address, [numeric_value])
+        success = await hub.async_write_register(address, numeric_value)
 
         if success:
             _LOGGER.info(
@@ -187,8 +189,9 @@ class SolakonSelect(SolakonEntity, SelectEntity):
             # Update the state immediately (optimistic update)
             self._attr_current_option = option
             self.async_write_ha_state()
-            # Request coordinator to refresh data to confirm the change
-            await self.coordinator.async_request_refresh()
+            if not unchanged:
+                # Request coordinator to refresh data to confirm the change
+                await self.coordinator.async_request_refresh()
         else:
             _LOGGER.error(f"Failed to set {self.entity_description.key} to '{option}'")
 
@@ -222,7 +225,10 @@ class RemoteControlModeSelect(SolakonEntity, SelectEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if self.coordinator.data and self._register_key in self.coordinator.data:
+        if (
+            self.coordinator.data is not None
+            and self._register_key in self.coordinator.data
+        ):
             raw_value = self.coordinator.data[self._register_key]
 
             if isinstance(raw_value, (int, float)):
@@ -269,24 +275,26 @@ class RemoteControlModeSelect(SolakonEntity, SelectEntity):
         register_value = mode_to_register_value(mode)
 
         # Get the register address for remote_control
-        address = self._register_config["address"]
+        address = cast(int, self._register_config["address"])
 
         _LOGGER.info(
             f"Setting remote_control_mode to '{option}' (mode={mode.name}, register value={register_value:#06x}) at address {address}"
         )
 
         # Write the value to the register
-        success = await self._config_entry.runtime_data.hub.async_write_register(
-            address, register_value
-        )
+        hub = self._config_entry.runtime_data.hub
+        # The hub skips the write if the device already holds the value
+        unchanged = hub.holds(address, [register_value])
+        success = await hub.async_write_register(address, register_value)
 
         if success:
             _LOGGER.info(f"Successfully set remote_control_mode to '{option}'")
             # Update the state immediately (optimistic update)
             self._attr_current_option = option
             self.async_write_ha_state()
-            # Request coordinator to refresh data to confirm the change
-            await self.coordinator.async_request_refresh()
+            if not unchanged:
+                # Request coordinator to refresh data to confirm the change
+                await self.coordinator.async_request_refresh()
         else:
             _LOGGER.error(f"Failed to set remote_control_mode to '{option}'")
 
@@ -319,7 +327,10 @@ class ForceModeSelect(SolakonEntity, SelectEntity):
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        if self.coordinator.data and self._register_key in self.coordinator.data:
+        if (
+            self.coordinator.data is not None
+            and self._register_key in self.coordinator.data
+        ):
             raw_value = self.coordinator.data[self._register_key]
 
             if isinstance(raw_value, (int, float)):
@@ -365,24 +376,26 @@ class ForceModeSelect(SolakonEntity, SelectEntity):
         mode_value = int(option)
 
         # Get the register address for remote_control
-        address = self._register_config["address"]
+        address = cast(int, self._register_config["address"])
 
         _LOGGER.info(
             f"Setting force_mode to '{option}' (register value={mode_value:#06x}) at address {address}"
         )
 
         # Write the value to the register
-        success = await self._config_entry.runtime_data.hub.async_write_register(
-            address, mode_value
-        )
+        hub = self._config_entry.runtime_data.hub
+        # The hub skips the write if the device already holds the value
+        unchanged = hub.holds(address, [mode_value])
+        success = await hub.async_write_register(address, mode_value)
 
         if success:
             _LOGGER.info(f"Successfully set force_mode to '{option}'")
             # Update the state immediately (optimistic update)
             self._attr_current_option = option
             self.async_write_ha_state()
-            # Request coordinator to refresh data to confirm the change
-            await self.coordinator.async_request_refresh()
+            if not unchanged:
+                # Request coordinator to refresh data to confirm the change
+                await self.coordinator.async_request_refresh()
         else:
             _LOGGER.error(f"Failed to set force_mode to '{option}'")
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import timedelta
 import logging
 from typing import Any
 
@@ -28,6 +29,7 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .coordinator import SolakonDataCoordinator
 from .entity import SolakonEntity
 from .types import SolakonConfigEntry
 
@@ -58,6 +60,61 @@ class SolakonSensorEntityDescription(SensorEntityDescription):
     value_fn: Callable[[Any], Any | None] | None = None
 
 
+@dataclass(frozen=True, kw_only=True)
+class SolakonDerivedSensorEntityDescription(SensorEntityDescription):
+    """Solakon sensor entity description for a value derived from registers."""
+
+    inputs: tuple[str, ...]
+    derive_fn: Callable[..., Any]
+
+
+@dataclass(frozen=True, kw_only=True)
+class SolakonIntegratedEnergySensorEntityDescription(SensorEntityDescription):
+    """Solakon sensor entity description for locally integrated energy."""
+
+    power_key: str
+    power_fn: Callable[[float], float] = lambda power: power
+    counter_key: str
+
+
+@dataclass(frozen=True, kw_only=True)
+class SolakonStatisticSensorEntityDescription(SensorEntityDescription):
+    """Solakon sensor entity description for a rolling window statistic."""
+
+    source_key: str
+    window: timedelta
+    statistic: str
+    # Take the statistic over the negated samples, matching the source sensor
+    inverted: bool = False
+
+
+@dataclass(frozen=True, kw_only=True)
+class SolakonFastSampleSensorEntityDescription(SensorEntityDescription):
+    """Solakon sensor entity description for an aggregate of fast poll samples."""
+
+    source_key: str
+    aggregate: str
+    # Publish the negated samples, matching the sign of the source sensor
+    inverted: bool = False
+
+
+@dataclass(frozen=True, kw_only=True)
+class SolakonPollSensorEntityDescription(SensorEntityDescription):
+    """Solakon sensor entity description for a state of the polling."""
+
+    value_fn: Callable[[SolakonDataCoordinator], Any]
+
+
+_INVERTED_AGGREGATES = {"mean": "mean", "min": "max", "max": "min"}
+
+
+def _ratio(numerator: float, denominator: float) -> float | None:
+    """Return a percentage, or None if the denominator is not positive."""
+    if denominator <= 0:
+        return None
+    return round(100 * numerator / denominator, 2)
+
+
 # Sensor entity descriptions for Home Assistant
 SENSOR_ENTITY_DESCRIPTIONS: tuple[SolakonSensorEntityDescription, ...] = (
     SolakonSensorEntityDescription(
@@ -411,6 +468,268 @@ SENSOR_ENTITY_DESCRIPTIONS: tuple[SolakonSensorEntityDescription, ...] = (
 )
 
 
+# Sensors of the second battery module, only added when it is detected
+BMS2_SENSOR_ENTITY_DESCRIPTIONS: tuple[SolakonSensorEntityDescription, ...] = (
+    SolakonSensorEntityDescription(
+        key="bms2_soc",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.BATTERY,
+        native_unit_of_measurement=PERCENTAGE,
+    ),
+    SolakonSensorEntityDescription(
+        key="bms2_soh",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        native_unit_of_measurement=PERCENTAGE,
+    ),
+    SolakonSensorEntityDescription(
+        key="bms2_ambient_temp",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    ),
+    SolakonSensorEntityDescription(
+        key="bms2_max_temp",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    ),
+    SolakonSensorEntityDescription(
+        key="bms2_min_temp",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    ),
+)
+
+# Derived sensors, computed once per poll by the coordinator.
+# Raw battery_power is positive while charging, active_power is the inverter
+# output towards the house and grid.
+DERIVED_SENSOR_ENTITY_DESCRIPTIONS: tuple[
+    SolakonDerivedSensorEntityDescription, ...
+] = (
+    SolakonDerivedSensorEntityDescription(
+        key="house_consumption",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.POWER,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        inputs=("total_pv_power", "battery_power", "active_power"),
+        derive_fn=lambda pv, battery, active: pv - battery - active,
+    ),
+    SolakonDerivedSensorEntityDescription(
+        key="pv_strings_power",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.POWER,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        inputs=("pv1_power", "pv2_power", "pv3_power", "pv4_power"),
+        derive_fn=lambda *strings: sum(strings),
+    ),
+    SolakonDerivedSensorEntityDescription(
+        key="battery_round_trip_efficiency",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+        inputs=("battery_total_discharge_energy", "battery_total_charge_energy"),
+        derive_fn=_ratio,
+    ),
+    SolakonDerivedSensorEntityDescription(
+        key="grid_dependency",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+        inputs=(
+            "grid_total_import_energy",
+            "pv_total_energy",
+            "grid_total_export_energy",
+        ),
+        derive_fn=lambda grid_import, pv, grid_export: _ratio(
+            grid_import, grid_import + pv - grid_export
+        ),
+    ),
+)
+
+
+# Energy integrated from the power registers between polls and anchored to
+# the 0.01 kWh device counters, for a finer resolution in the dashboard
+INTEGRATED_ENERGY_SENSOR_ENTITY_DESCRIPTIONS: tuple[
+    SolakonIntegratedEnergySensorEntityDescription, ...
+] = (
+    SolakonIntegratedEnergySensorEntityDescription(
+        key="pv_total_energy_integrated",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        device_class=SensorDeviceClass.ENERGY,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=3,
+        power_key="total_pv_power",
+        counter_key="pv_total_energy",
+    ),
+    SolakonIntegratedEnergySensorEntityDescription(
+        key="battery_total_charge_energy_integrated",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        device_class=SensorDeviceClass.ENERGY,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=3,
+        power_key="battery_power",
+        power_fn=lambda power: max(power, 0),
+        counter_key="battery_total_charge_energy",
+    ),
+    SolakonIntegratedEnergySensorEntityDescription(
+        key="battery_total_discharge_energy_integrated",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        device_class=SensorDeviceClass.ENERGY,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=3,
+        power_key="battery_power",
+        power_fn=lambda power: max(-power, 0),
+        counter_key="battery_total_discharge_energy",
+    ),
+    SolakonIntegratedEnergySensorEntityDescription(
+        key="grid_total_export_energy_integrated",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        device_class=SensorDeviceClass.ENERGY,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=3,
+        power_key="active_power",
+        power_fn=lambda power: max(power, 0),
+        counter_key="grid_total_export_energy",
+    ),
+    SolakonIntegratedEnergySensorEntityDescription(
+        key="grid_total_import_energy_integrated",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        device_class=SensorDeviceClass.ENERGY,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=3,
+        power_key="active_power",
+        power_fn=lambda power: max(-power, 0),
+        counter_key="grid_total_import_energy",
+    ),
+)
+
+
+# Rolling window statistics kept in memory by the coordinator
+STATISTIC_SENSOR_ENTITY_DESCRIPTIONS: tuple[
+    SolakonStatisticSensorEntityDescription, ...
+] = (
+    SolakonStatisticSensorEntityDescription(
+        key="active_power_mean_5m",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.POWER,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        suggested_display_precision=0,
+        source_key="active_power",
+        window=timedelta(minutes=5),
+        statistic="mean",
+    ),
+    SolakonStatisticSensorEntityDescription(
+        key="active_power_stdev_5m",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.POWER,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        suggested_display_precision=0,
+        source_key="active_power",
+        window=timedelta(minutes=5),
+        statistic="stdev",
+    ),
+    SolakonStatisticSensorEntityDescription(
+        key="battery_power_mean_5m",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.POWER,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        suggested_display_precision=0,
+        source_key="battery_power",
+        window=timedelta(minutes=5),
+        statistic="mean",
+        inverted=True,
+    ),
+    SolakonStatisticSensorEntityDescription(
+        key="total_pv_power_p95_15m",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.POWER,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        suggested_display_precision=0,
+        source_key="total_pv_power",
+        window=timedelta(minutes=15),
+        statistic="p95",
+    ),
+    SolakonStatisticSensorEntityDescription(
+        key="internal_temp_max_24h",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        suggested_display_precision=1,
+        source_key="internal_temp",
+        window=timedelta(hours=24),
+        statistic="max",
+    ),
+)
+
+
+# Aggregates of the fast poll samples, only added when fast polling is enabled
+FAST_SAMPLE_SENSOR_ENTITY_DESCRIPTIONS: tuple[
+    SolakonFastSampleSensorEntityDescription, ...
+] = tuple(
+    SolakonFastSampleSensorEntityDescription(
+        key=f"{source_key}_{aggregate}",
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement=UnitOfPower.WATT,
+        suggested_display_precision=0,
+        source_key=source_key,
+        aggregate=aggregate,
+        inverted=source_key == "battery_power",
+    )
+    for source_key in ("active_power", "battery_power", "total_pv_power")
+    for aggregate in ("mean", "min", "max")
+)
+
+# Counters of polls overrunning their interval and of the batches shed
+POLL_SENSOR_ENTITY_DESCRIPTIONS: tuple[SolakonPollSensorEntityDescription, ...] = (
+    SolakonPollSensorEntityDescription(
+        key="poll_overruns",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.shedder.overruns,
+    ),
+    SolakonPollSensorEntityDescription(
+        key="shed_batches",
+        entity_category=EntityCategory.DIAGNOSTIC,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.hub.shed_batches,
+    ),
+)
+
+# Interval until the next poll, only added when the interval adapts
+POLL_INTERVAL_SENSOR_ENTITY_DESCRIPTION = SolakonPollSensorEntityDescription(
+    key="poll_interval",
+    entity_category=EntityCategory.DIAGNOSTIC,
+    device_class=SensorDeviceClass.DURATION,
+    native_unit_of_measurement=UnitOfTime.SECONDS,
+    suggested_display_precision=1,
+    value_fn=lambda coordinator: (
+        coordinator.update_interval.total_seconds()
+        if coordinator.update_interval is not None
+        else None
+    ),
+)
+
+
 async def async_setup_entry(
     _: HomeAssistant,
     config_entry: SolakonConfigEntry,
@@ -420,7 +739,21 @@ async def async_setup_entry(
     # Get device info for all sensors
     device_info = await config_entry.runtime_data.hub.async_get_device_info()
 
-    entities: list[SolakonSensor] = []
+    coordinator = config_entry.runtime_data.coordinator
+    coordinator.derived.register(DERIVED_SENSOR_ENTITY_DESCRIPTIONS)
+    coordinator.energy.register(INTEGRATED_ENERGY_SENSOR_ENTITY_DESCRIPTIONS)
+    coordinator.telemetry.register(STATISTIC_SENSOR_ENTITY_DESCRIPTIONS)
+    if coordinator.data:
+        coordinator.derived.update(coordinator.data)
+
+    entities: list[
+        SolakonSensor
+        | SolakonDerivedSensor
+        | SolakonIntegratedEnergySensor
+        | SolakonStatisticSensor
+        | SolakonFastSampleSensor
+        | SolakonPollSensor
+    ] = []
     entities.extend(
         SolakonSensor(
             config_entry,
@@ -429,6 +762,64 @@ async def async_setup_entry(
         )
         for description in SENSOR_ENTITY_DESCRIPTIONS
     )
+    if config_entry.runtime_data.hub.bms2_present:
+        entities.extend(
+            SolakonSensor(
+                config_entry,
+                device_info,
+                description,
+            )
+            for description in BMS2_SENSOR_ENTITY_DESCRIPTIONS
+        )
+    entities.extend(
+        SolakonDerivedSensor(
+            config_entry,
+            device_info,
+            description,
+        )
+        for description in DERIVED_SENSOR_ENTITY_DESCRIPTIONS
+    )
+    entities.extend(
+        SolakonIntegratedEnergySensor(
+            config_entry,
+            device_info,
+            description,
+        )
+        for description in INTEGRATED_ENERGY_SENSOR_ENTITY_DESCRIPTIONS
+    )
+    entities.extend(
+        SolakonStatisticSensor(
+            config_entry,
+            device_info,
+            description,
+        )
+        for description in STATISTIC_SENSOR_ENTITY_DESCRIPTIONS
+    )
+    entities.extend(
+        SolakonPollSensor(
+            config_entry,
+            device_info,
+            description,
+        )
+        for description in POLL_SENSOR_ENTITY_DESCRIPTIONS
+    )
+    if coordinator.fast_samples is not None:
+        entities.extend(
+            SolakonFastSampleSensor(
+                config_entry,
+                device_info,
+                description,
+            )
+            for description in FAST_SAMPLE_SENSOR_ENTITY_DESCRIPTIONS
+        )
+    if coordinator.adaptive is not None:
+        entities.append(
+            SolakonPollSensor(
+                config_entry,
+                device_info,
+                POLL_INTERVAL_SENSOR_ENTITY_DESCRIPTION,
+            )
+        )
     if entities:
         async_add_entities(entities, True)
 
@@ -459,7 +850,7 @@ class SolakonSensor(SolakonEntity, SensorEntity):
             else self.entity_description.key
         )
 
-        if self.coordinator.data and key in self.coordinator.data:
+        if self.coordinator.data is not None and key in self.coordinator.data:
             value = self.coordinator.data[key]
             if self.entity_description.value_fn and value is not None:
                 self._attr_native_value = self.entity_description.value_fn(value)
@@ -476,3 +867,160 @@ class SolakonSensor(SolakonEntity, SensorEntity):
         return (
             self.coordinator.last_update_success and self._attr_native_value is not None
         )
+
+
+class SolakonDerivedSensor(SolakonEntity, SensorEntity):
+    """Representation of a Solakon ONE sensor derived from other registers."""
+
+    entity_description: SolakonDerivedSensorEntityDescription
+
+    def __init__(
+        self,
+        config_entry: SolakonConfigEntry,
+        device_info: dict,
+        description: SolakonDerivedSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(config_entry, device_info, description.key)
+        self.entity_description = description
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._attr_native_value = self.coordinator.derived.values.get(
+            self.entity_description.key
+        )
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return (
+            self.coordinator.last_update_success and self._attr_native_value is not None
+        )
+
+
+class SolakonIntegratedEnergySensor(SolakonEntity, SensorEntity):
+    """Representation of a Solakon ONE energy sensor integrated from power."""
+
+    entity_description: SolakonIntegratedEnergySensorEntityDescription
+
+    def __init__(
+        self,
+        config_entry: SolakonConfigEntry,
+        device_info: dict,
+        description: SolakonIntegratedEnergySensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(config_entry, device_info, description.key)
+        self.entity_description = description
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._attr_native_value = self.coordinator.energy.values.get(
+            self.entity_description.key
+        )
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return (
+            self.coordinator.last_update_success and self._attr_native_value is not None
+        )
+
+
+class SolakonStatisticSensor(SolakonEntity, SensorEntity):
+    """Representation of a Solakon ONE rolling window statistic."""
+
+    entity_description: SolakonStatisticSensorEntityDescription
+
+    def __init__(
+        self,
+        config_entry: SolakonConfigEntry,
+        device_info: dict,
+        description: SolakonStatisticSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(config_entry, device_info, description.key)
+        self.entity_description = description
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._attr_native_value = self.coordinator.telemetry.value(
+            self.entity_description.key
+        )
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return (
+            self.coordinator.last_update_success and self._attr_native_value is not None
+        )
+
+
+class SolakonFastSampleSensor(SolakonEntity, SensorEntity):
+    """Representation of an aggregate of Solakon ONE fast poll samples."""
+
+    entity_description: SolakonFastSampleSensorEntityDescription
+
+    def __init__(
+        self,
+        config_entry: SolakonConfigEntry,
+        device_info: dict,
+        description: SolakonFastSampleSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(config_entry, device_info, description.key)
+        self.entity_description = description
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        description = self.entity_description
+        value = None
+        if (fast_samples := self.coordinator.fast_samples) is not None:
+            if description.inverted:
+                value = fast_samples.value(
+                    description.source_key,
+                    _INVERTED_AGGREGATES[description.aggregate],
+                )
+                value = -value if value is not None else None
+            else:
+                value = fast_samples.value(
+                    description.source_key, description.aggregate
+                )
+        self._attr_native_value = value
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return (
+            self.coordinator.last_update_success and self._attr_native_value is not None
+        )
+
+
+class SolakonPollSensor(SolakonEntity, SensorEntity):
+    """Representation of a state of the Solakon ONE polling."""
+
+    entity_description: SolakonPollSensorEntityDescription
+
+    def __init__(
+        self,
+        config_entry: SolakonConfigEntry,
+        device_info: dict,
+        description: SolakonPollSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(config_entry, device_info, description.key)
+        self.entity_description = description
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._attr_native_value = self.entity_description.value_fn(self.coordinator)
+        self.async_write_ha_state()
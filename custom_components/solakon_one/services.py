@@ -0,0 +1,415 @@
+"""Services for the Solakon ONE integration."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from pathlib import Path
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .capture import ModbusTrafficRecorder
+from .discovery import (
+    DISCOVERY_RANGES,
+    RegisterMapStore,
+    RegisterScanner,
+    diff_registers,
+)
+from .const import ATTR_CONFIG_ENTRY_ID, DOMAIN, REGISTERS
+from .remote_control import RemoteControlMode
+from .schedule import ScheduleSlot
+from .exceptions import CannotConnect
+from .types import SolakonConfigEntry
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_PROFILE = "profile"
+SERVICE_SET_SCHEDULE = "set_schedule"
+SERVICE_APPLY_PROFILE = "apply_profile"
+SERVICE_READ_REGISTERS = "read_registers"
+SERVICE_DISCOVER_REGISTERS = "discover_registers"
+
+ATTR_MAX_SIZE = "max_size"
+ATTR_BACKUP_COUNT = "backup_count"
+ATTR_CYCLES = "cycles"
+ATTR_SLOTS = "slots"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_MODE = "mode"
+ATTR_POWER = "power"
+ATTR_MIN_SOC = "min_soc"
+ATTR_VALUES = "values"
+ATTR_REGISTERS = "registers"
+ATTR_ADDRESS = "address"
+ATTR_COUNT = "count"
+ATTR_TYPE = "type"
+ATTR_SCALE = "scale"
+ATTR_MAX_AGE = "max_age"
+ATTR_APPLY = "apply"
+ATTR_FORCE = "force"
+
+DEFAULT_CAPTURE_MAX_SIZE = 10  # MiB
+DEFAULT_CAPTURE_BACKUP_COUNT = 3
+DEFAULT_PROFILE_CYCLES = 5
+
+# Word count of the register types the read_registers service decodes
+REGISTER_TYPE_COUNTS = {"u16": 1, "i16": 1, "u32": 2, "i32": 2, "string": 1}
+
+SERVICE_ENTRY_SCHEMA = vol.Schema({vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+SERVICE_START_CAPTURE_SCHEMA = SERVICE_ENTRY_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_MAX_SIZE, default=DEFAULT_CAPTURE_MAX_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1024)
+        ),
+        vol.Optional(ATTR_BACKUP_COUNT, default=DEFAULT_CAPTURE_BACKUP_COUNT): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=100)
+        ),
+    }
+)
+
+SERVICE_PROFILE_SCHEMA = SERVICE_ENTRY_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+SCHEDULE_SLOT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_START): cv.time,
+        vol.Required(ATTR_END): cv.time,
+        vol.Required(ATTR_MODE): vol.In(
+            [mode.name.lower() for mode in RemoteControlMode]
+        ),
+        vol.Optional(ATTR_POWER, default=0): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=100000)
+        ),
+        vol.Optional(ATTR_MIN_SOC): vol.All(
+            vol.Coerce(int), vol.Range(min=10, max=100)
+        ),
+    }
+)
+
+SERVICE_SET_SCHEDULE_SCHEMA = SERVICE_ENTRY_SCHEMA.extend(
+    {vol.Required(ATTR_SLOTS): vol.All(cv.ensure_list, [SCHEDULE_SLOT_SCHEMA])}
+)
+
+SERVICE_APPLY_PROFILE_SCHEMA = SERVICE_ENTRY_SCHEMA.extend(
+    {
+        vol.Required(ATTR_VALUES): vol.All(
+            {cv.string: vol.Coerce(float)}, vol.Length(min=1)
+        ),
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+    }
+)
+
+
+def _validate_register_spec(spec: dict[str, Any]) -> dict[str, Any]:
+    """Default the count of a register spec and check it fits the type."""
+    type_count = REGISTER_TYPE_COUNTS[spec[ATTR_TYPE]]
+    spec.setdefault(ATTR_COUNT, type_count)
+    if spec[ATTR_COUNT] < type_count:
+        raise vol.Invalid(
+            f"{spec[ATTR_TYPE]} registers need a count of at least {type_count}"
+        )
+    return spec
+
+
+REGISTER_SPEC_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_ADDRESS): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=0xFFFF)
+            ),
+            vol.Optional(ATTR_TYPE, default="u16"): vol.In(REGISTER_TYPE_COUNTS),
+            vol.Optional(ATTR_COUNT): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=125)
+            ),
+            vol.Optional(ATTR_SCALE, default=1): vol.All(
+                vol.Coerce(float), vol.Range(min=0, min_included=False)
+            ),
+        }
+    ),
+    _validate_register_spec,
+)
+
+SERVICE_READ_REGISTERS_SCHEMA = SERVICE_ENTRY_SCHEMA.extend(
+    {
+        vol.Required(ATTR_REGISTERS): vol.All(
+            cv.ensure_list, [REGISTER_SPEC_SCHEMA], vol.Length(min=1)
+        ),
+        vol.Optional(ATTR_MAX_AGE, default=0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=3600)
+        ),
+    }
+)
+
+SERVICE_DISCOVER_REGISTERS_SCHEMA = SERVICE_ENTRY_SCHEMA.extend(
+    {vol.Optional(ATTR_APPLY, default=False): cv.boolean}
+)
+
+
+def _get_entry(hass: HomeAssistant, call: ServiceCall) -> SolakonConfigEntry:
+    """Return the loaded config entry targeted by a service call."""
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    entry: SolakonConfigEntry | None = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_found",
+            translation_placeholders={"entry_id": entry_id},
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="entry_not_loaded",
+            translation_placeholders={"title": entry.title},
+        )
+    return entry
+
+
+async def _async_start_capture(call: ServiceCall) -> None:
+    """Start recording the Modbus traffic of a device."""
+    entry = _get_entry(call.hass, call)
+    hub = entry.runtime_data.hub
+    if hub.recorder is not None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="capture_running",
+            translation_placeholders={"path": hub.recorder.path},
+        )
+
+    path = call.hass.config.path(f"{DOMAIN}_capture_{entry.entry_id}.bin")
+    hub.recorder = ModbusTrafficRecorder(
+        call.hass,
+        path,
+        call.data[ATTR_MAX_SIZE] * 1024 * 1024,
+        call.data[ATTR_BACKUP_COUNT],
+    )
+    _LOGGER.info("Started Modbus capture of %s to %s", entry.title, path)
+
+
+async def _async_stop_capture(call: ServiceCall) -> None:
+    """Stop recording the Modbus traffic of a device."""
+    entry = _get_entry(call.hass, call)
+    if (recorder := await entry.runtime_data.hub.async_stop_capture()) is None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="capture_not_running",
+            translation_placeholders={"title": entry.title},
+        )
+    _LOGGER.info(
+        "Stopped Modbus capture of %s: %d transactions written to %s",
+        entry.title,
+        recorder.records,
+        recorder.path,
+    )
+
+
+async def _async_profile(call: ServiceCall) -> ServiceResponse:
+    """Profile coordinator cycles of a device and write a report."""
+    entry = _get_entry(call.hass, call)
+    coordinator = entry.runtime_data.coordinator
+    if coordinator.profile is not None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="profile_running",
+            translation_placeholders={"title": entry.title},
+        )
+
+    try:
+        profile = await coordinator.async_profile(call.data[ATTR_CYCLES])
+    except ValueError as err:
+        # cProfile refuses to run while another profiler is active
+        raise HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="profiler_busy",
+            translation_placeholders={"error": str(err)},
+        ) from err
+
+    path = call.hass.config.path(
+        f"{DOMAIN}_profile_{entry.entry_id}_{datetime.now():%Y%m%d_%H%M%S}.txt"
+    )
+    await call.hass.async_add_executor_job(
+        Path(path).write_text, profile.report(entry.title)
+    )
+    _LOGGER.info("Wrote profile of %s to %s", entry.title, path)
+    return {"path": path, **profile.summary()}
+
+
+async def _async_set_schedule(call: ServiceCall) -> None:
+    """Replace the time-of-use schedule of a device."""
+    entry = _get_entry(call.hass, call)
+    slots = [
+        ScheduleSlot(
+            start=slot[ATTR_START],
+            end=slot[ATTR_END],
+            mode=RemoteControlMode[slot[ATTR_MODE].upper()],
+            power=slot[ATTR_POWER],
+            min_soc=slot.get(ATTR_MIN_SOC),
+        )
+        for slot in call.data[ATTR_SLOTS]
+    ]
+    for index, slot in enumerate(slots):
+        if slot.start == slot.end:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="schedule_slot_empty",
+                translation_placeholders={"start": slot.start.isoformat()},
+            )
+        for other in slots[index + 1 :]:
+            if slot.overlaps(other):
+                raise ServiceValidationError(
+                    translation_domain=DOMAIN,
+                    translation_key="schedule_overlap",
+                    translation_placeholders={
+                        "first": f"{slot.start.isoformat()}-{slot.end.isoformat()}",
+                        "second": f"{other.start.isoformat()}-{other.end.isoformat()}",
+                    },
+                )
+
+    await entry.runtime_data.schedule.async_set(slots)
+    _LOGGER.info("Set schedule of %s to %d slots", entry.title, len(slots))
+
+
+async def _async_apply_profile(call: ServiceCall) -> ServiceResponse:
+    """Write a set of register values and report the result of each."""
+    entry = _get_entry(call.hass, call)
+    values: dict[str, float] = call.data[ATTR_VALUES]
+    for key in values:
+        if not REGISTERS.get(key, {}).get("rw", False):
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="profile_key_invalid",
+                translation_placeholders={"key": key},
+            )
+
+    results = await entry.runtime_data.hub.async_apply_values(
+        values, force=call.data[ATTR_FORCE]
+    )
+    _LOGGER.info("Applied profile to %s: %s", entry.title, results)
+    return {"results": {key: {**result} for key, result in results.items()}}
+
+
+async def _async_read_registers(call: ServiceCall) -> ServiceResponse:
+    """Read registers through the integration's connection and decode them."""
+    entry = _get_entry(call.hass, call)
+    specs: list[dict[str, Any]] = call.data[ATTR_REGISTERS]
+    results = await entry.runtime_data.hub.async_read_specs(
+        {str(index): spec for index, spec in enumerate(specs)},
+        call.data[ATTR_MAX_AGE],
+    )
+    return {
+        "registers": [
+            {**spec, **results[str(index)]} for index, spec in enumerate(specs)
+        ]
+    }
+
+
+def _format_ranges(ranges: list[tuple[int, int]]) -> list[str]:
+    """Return address ranges with exclusive ends as inclusive strings."""
+    return [
+        f"{start}" if end == start + 1 else f"{start}-{end - 1}"
+        for start, end in ranges
+    ]
+
+
+async def _async_discover_registers(call: ServiceCall) -> ServiceResponse:
+    """Map the readable register space of a device and compare it with REGISTERS."""
+    entry = _get_entry(call.hass, call)
+    scanner = RegisterScanner(entry.runtime_data.hub)
+    try:
+        readable = await scanner.async_scan()
+    except CannotConnect as err:
+        raise HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="discovery_failed",
+            translation_placeholders={"error": str(err)},
+        ) from err
+
+    diff = diff_registers(readable)
+    _LOGGER.info(
+        "Scanned registers of %s in %d reads: %d readable ranges",
+        entry.title,
+        scanner.round_trips,
+        len(readable),
+    )
+    if call.data[ATTR_APPLY]:
+        await RegisterMapStore(call.hass, entry.entry_id).async_save(
+            DISCOVERY_RANGES, readable
+        )
+        # The batches are planned around the map when the hub is created
+        call.hass.config_entries.async_schedule_reload(entry.entry_id)
+    return {
+        "round_trips": scanner.round_trips,
+        "readable_ranges": _format_ranges(readable),
+        "unreadable_keys": diff["unreadable_keys"],
+        "unmapped_ranges": _format_ranges(diff["unmapped_ranges"]),
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Solakon ONE services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_CAPTURE,
+        _async_start_capture,
+        schema=SERVICE_START_CAPTURE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_CAPTURE,
+        _async_stop_capture,
+        schema=SERVICE_ENTRY_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=SERVICE_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_SCHEDULE,
+        _async_set_schedule,
+        schema=SERVICE_SET_SCHEDULE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_PROFILE,
+        _async_apply_profile,
+        schema=SERVICE_APPLY_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_READ_REGISTERS,
+        _async_read_registers,
+        schema=SERVICE_READ_REGISTERS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DISCOVER_REGISTERS,
+        _async_discover_registers,
+        schema=SERVICE_DISCOVER_REGISTERS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
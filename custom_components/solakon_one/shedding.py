@@ -0,0 +1,69 @@
+"""Load shedding of overrunning polls for Solakon ONE."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .const import PRIORITY_CORE
+
+# On-time polls needed before a shed priority is polled again
+_RECOVERY_POLLS = 3
+# Upper bound of the recovery streak after repeated overruns
+_MAX_RECOVERY_POLLS = 48
+# Share of the interval a poll may take to count as on time for recovery
+_RECOVERY_LOAD = 0.5
+
+
+class PollLoadShedder:
+    """Shed low-priority register batches while polls overrun their interval.
+
+    Each poll that takes longer than the poll interval sheds the batches of
+    the next priority, lowest first; core registers are never shed. Once
+    ``_RECOVERY_POLLS`` polls in a row took at most half the interval, one
+    priority is polled again. An overrun right after such a step doubles the
+    number of on-time polls the next step needs, so a link that cannot keep
+    up with a priority does not flap between shedding and polling it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the shedder with nothing shed."""
+        # Batches of registers below this priority are shed
+        self.priority = 0
+        self.overruns = 0
+        self._on_time = 0
+        self._required = _RECOVERY_POLLS
+        self._recovered = False
+
+    def update(self, elapsed: float, interval: float) -> int:
+        """Account for a poll's duration and return the priority to shed below."""
+        if elapsed > interval:
+            self.overruns += 1
+            self._on_time = 0
+            if self._recovered:
+                self._required = min(self._required * 2, _MAX_RECOVERY_POLLS)
+            self._recovered = False
+            self.priority = min(self.priority + 1, PRIORITY_CORE)
+            return self.priority
+
+        # The priority polled again kept up
+        self._recovered = False
+        if not self.priority:
+            self._required = _RECOVERY_POLLS
+        elif elapsed <= interval * _RECOVERY_LOAD:
+            self._on_time += 1
+            if self._on_time >= self._required:
+                self._on_time = 0
+                self._recovered = True
+                self.priority -= 1
+        else:
+            self._on_time = 0
+        return self.priority
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the shedding state for diagnostics."""
+        return {
+            "shed_below_priority": self.priority,
+            "overruns": self.overruns,
+            "on_time_polls": self._on_time,
+            "recovery_polls": self._required,
+        }
@@ -0,0 +1,163 @@
+"""Switch platform for Solakon ONE integration."""
+
+from __future__ import annotations
+
+import logging
+from functools import partial
+from typing import Any
+
+from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
+from homeassistant.const import STATE_ON, EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
+
+from .const import DOMAIN
+from .controller import ZeroExportController
+from .entity import SolakonEntity
+from .keepalive import RemoteTimeoutKeepalive
+from .types import SolakonConfigEntry
+
+ZERO_EXPORT_CONTROL_SWITCH_ENTITY_DESCRIPTION = SwitchEntityDescription(
+    key="zero_export_control",
+    entity_category=EntityCategory.CONFIG,
+)
+
+REMOTE_CONTROL_KEEPALIVE_SWITCH_ENTITY_DESCRIPTION = SwitchEntityDescription(
+    key="remote_control_keepalive",
+    entity_category=EntityCategory.CONFIG,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Owner of the keepalive hold of the switch
+_KEEPALIVE_OWNER = "switch"
+
+
+async def async_setup_entry(
+    _: HomeAssistant,
+    config_entry: SolakonConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Solakon ONE switch entities."""
+    device_info = await config_entry.runtime_data.hub.async_get_device_info()
+
+    entities: list[SwitchEntity] = [
+        RemoteControlKeepaliveSwitch(
+            config_entry,
+            device_info,
+            REMOTE_CONTROL_KEEPALIVE_SWITCH_ENTITY_DESCRIPTION,
+            config_entry.runtime_data.hub.keepalive,
+        )
+    ]
+    if (controller := config_entry.runtime_data.controller) is not None:
+        entities.append(
+            ZeroExportControlSwitch(
+                config_entry,
+                device_info,
+                ZERO_EXPORT_CONTROL_SWITCH_ENTITY_DESCRIPTION,
+                controller,
+            )
+        )
+    async_add_entities(entities)
+
+
+class ZeroExportControlSwitch(SolakonEntity, SwitchEntity, RestoreEntity):
+    """Switch running the zero export controller.
+
+    The state is restored on startup, so an enabled controller resumes
+    after a restart or reload.
+    """
+
+    def __init__(
+        self,
+        config_entry: SolakonConfigEntry,
+        device_info: dict,
+        description: SwitchEntityDescription,
+        controller: ZeroExportController,
+    ) -> None:
+        """Initialize the switch."""
+        super().__init__(config_entry, device_info, description.key)
+        self.entity_description = description
+        self._controller = controller
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the previous state."""
+        await super().async_added_to_hass()
+        if (
+            (state := await self.async_get_last_state())
+            and state.state == STATE_ON
+            and not self._controller.async_enable()
+        ):
+            _LOGGER.warning(
+                "Zero export control not resumed: remote control is run by %s",
+                self._config_entry.runtime_data.hub.remote_control.owner,
+            )
+
+    @property
+    def is_on(self) -> bool:
+        """Return whether the controller is running."""
+        return self._controller.enabled
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Start the controller."""
+        if not self._controller.async_enable():
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="remote_control_busy",
+                translation_placeholders={
+                    "owner": str(
+                        self._config_entry.runtime_data.hub.remote_control.owner
+                    )
+                },
+            )
+        self.async_write_ha_state()
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Stop the controller."""
+        self._controller.async_disable()
+        self.async_write_ha_state()
+
+
+class RemoteControlKeepaliveSwitch(SolakonEntity, SwitchEntity, RestoreEntity):
+    """Switch holding the current remote control mode beyond its timeout.
+
+    The switch holds the keepalive as its own owner and only shows and
+    restores that hold, not one of peak shaving. The state is restored on
+    startup, so the keepalive resumes after a restart or reload.
+    """
+
+    def __init__(
+        self,
+        config_entry: SolakonConfigEntry,
+        device_info: dict,
+        description: SwitchEntityDescription,
+        keepalive: RemoteTimeoutKeepalive,
+    ) -> None:
+        """Initialize the switch."""
+        super().__init__(config_entry, device_info, description.key)
+        self.entity_description = description
+        self._keepalive = keepalive
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the previous state and stop the keepalive on removal."""
+        await super().async_added_to_hass()
+        self.async_on_remove(partial(self._keepalive.async_stop, _KEEPALIVE_OWNER))
+        if (state := await self.async_get_last_state()) and state.state == STATE_ON:
+            self._keepalive.async_start(_KEEPALIVE_OWNER)
+
+    @property
+    def is_on(self) -> bool:
+        """Return whether the switch holds the keepalive."""
+        return self._keepalive.holds(_KEEPALIVE_OWNER)
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Hold the keepalive."""
+        self._keepalive.async_start(_KEEPALIVE_OWNER)
+        self.async_write_ha_state()
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Release the hold of the keepalive."""
+        self._keepalive.async_stop(_KEEPALIVE_OWNER)
+        self.async_write_ha_state()
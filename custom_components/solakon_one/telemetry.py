@@ -0,0 +1,232 @@
+"""Rolling in-memory telemetry windows for Solakon ONE.
+
+Each window keeps three ``array("d")`` buffers of at most ``capacity``
+entries: sample times and values in arrival order (a ring buffer) and the
+same values in sorted order. Memory per window is therefore bounded by
+``3 * 8 * capacity`` bytes, i.e. 96 KiB at the maximum capacity of 4096.
+
+Mean and standard deviation are kept as running sums. Minimum, maximum
+and percentiles are read from the sorted buffer, which is maintained by
+binary search insertion and removal instead of being rebuilt per poll.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+from datetime import timedelta
+import math
+import time
+from typing import Protocol
+
+from .register_image import RegisterSnapshot
+
+MAX_CAPACITY = 4096
+# Running sums are rebuilt after this many removals to bound float drift
+_RESUM_INTERVAL = 10000
+
+
+class WindowStatistic(Protocol):
+    """Declaration of a statistic over a rolling window of a register key."""
+
+    @property
+    def key(self) -> str:
+        """Return the key the value is published under."""
+
+    @property
+    def source_key(self) -> str:
+        """Return the register key the window is built from."""
+
+    @property
+    def window(self) -> timedelta:
+        """Return the length of the window."""
+
+    @property
+    def statistic(self) -> str:
+        """Return the statistic: mean, min, max, stdev or pNN (percentile)."""
+
+    @property
+    def inverted(self) -> bool:
+        """Return if the statistic is taken over the negated samples."""
+
+
+class RollingWindow:
+    """Time-bounded window of samples with incremental statistics.
+
+    If the window holds more polls than ``MAX_CAPACITY``, ``decimation``
+    consecutive samples are averaged into one entry. Minimum, maximum and
+    percentiles then refer to these averages.
+    """
+
+    def __init__(self, length: float, capacity: int, decimation: int = 1) -> None:
+        """Initialize the window."""
+        self.length = length
+        self.capacity = capacity
+        self.decimation = decimation
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._sorted = array("d")
+        self._head = 0
+        self._size = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._removals = 0
+        self._pending_sum = 0.0
+        self._pending_count = 0
+
+    def __len__(self) -> int:
+        """Return the number of entries in the window."""
+        return self._size
+
+    def add(self, value: float, timestamp: float) -> None:
+        """Add a sample and expire entries that fell out of the window."""
+        self._pending_sum += value
+        self._pending_count += 1
+        if self._pending_count >= self.decimation:
+            self._push(self._pending_sum / self._pending_count, timestamp)
+            self._pending_sum = 0.0
+            self._pending_count = 0
+        self.expire(timestamp)
+
+    def expire(self, now: float) -> None:
+        """Drop entries older than the window length."""
+        while self._size and self._times[self._head] < now - self.length:
+            self._pop()
+
+    def _push(self, value: float, timestamp: float) -> None:
+        """Append an entry, evicting the oldest one if the buffer is full."""
+        if self._size == self.capacity:
+            self._pop()
+        tail = (self._head + self._size) % self.capacity
+        self._times[tail] = timestamp
+        self._values[tail] = value
+        self._size += 1
+        self._sum += value
+        self._sum_sq += value * value
+        insort(self._sorted, value)
+
+    def _pop(self) -> None:
+        """Remove the oldest entry."""
+        value = self._values[self._head]
+        self._head = (self._head + 1) % self.capacity
+        self._size -= 1
+        del self._sorted[bisect_left(self._sorted, value)]
+        self._removals += 1
+        if self._removals >= _RESUM_INTERVAL or not self._size:
+            self._removals = 0
+            self._sum = math.fsum(self._sorted)
+            self._sum_sq = math.fsum(v * v for v in self._sorted)
+        else:
+            self._sum -= value
+            self._sum_sq -= value * value
+
+    def mean(self) -> float | None:
+        """Return the mean of the window."""
+        return self._sum / self._size if self._size else None
+
+    def stdev(self) -> float | None:
+        """Return the population standard deviation of the window."""
+        if not self._size:
+            return None
+        mean = self._sum / self._size
+        return math.sqrt(max(self._sum_sq / self._size - mean * mean, 0.0))
+
+    def minimum(self) -> float | None:
+        """Return the minimum of the window."""
+        return self._sorted[0] if self._size else None
+
+    def maximum(self) -> float | None:
+        """Return the maximum of the window."""
+        return self._sorted[-1] if self._size else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Return a percentile of the window by linear interpolation."""
+        if not self._size:
+            return None
+        rank = percent / 100 * (self._size - 1)
+        lower = math.floor(rank)
+        upper = min(lower + 1, self._size - 1)
+        return self._sorted[lower] + (self._sorted[upper] - self._sorted[lower]) * (
+            rank - lower
+        )
+
+    def statistic(self, name: str) -> float | None:
+        """Return a statistic by name."""
+        if name == "mean":
+            return self.mean()
+        if name == "min":
+            return self.minimum()
+        if name == "max":
+            return self.maximum()
+        if name == "stdev":
+            return self.stdev()
+        if name.startswith("p"):
+            return self.percentile(float(name[1:]))
+        raise ValueError(f"Unknown statistic {name}")
+
+
+class TelemetryBuffers:
+    """Rolling windows of the registered statistics, updated once per poll.
+
+    Statistics over the same key and window length share one window.
+    """
+
+    def __init__(self, scan_interval: float) -> None:
+        """Initialize the buffers."""
+        self._scan_interval = scan_interval
+        self._statistics: dict[str, WindowStatistic] = {}
+        self._windows: dict[tuple[str, float], RollingWindow] = {}
+
+    def register(self, statistics: Iterable[WindowStatistic]) -> None:
+        """Add statistic declarations and allocate their windows."""
+        for statistic in statistics:
+            self._statistics[statistic.key] = statistic
+            length = statistic.window.total_seconds()
+            if (statistic.source_key, length) in self._windows:
+                continue
+            polls = math.ceil(length / self._scan_interval) + 1
+            decimation = math.ceil(polls / MAX_CAPACITY)
+            self._windows[(statistic.source_key, length)] = RollingWindow(
+                length, min(polls, MAX_CAPACITY), decimation
+            )
+
+    @property
+    def memory(self) -> int:
+        """Return the upper bound of the window memory in bytes."""
+        return sum(24 * window.capacity for window in self._windows.values())
+
+    def update(self, data: RegisterSnapshot) -> None:
+        """Add the values of a poll to the windows."""
+        now = time.monotonic()
+        for (source_key, _), window in self._windows.items():
+            value = data.get(source_key)
+            timestamp = data.timestamp(source_key)
+            if value is None or timestamp is None or not data.fresh(source_key):
+                window.expire(now)
+            else:
+                window.add(float(value), timestamp)
+
+    def value(self, key: str) -> float | None:
+        """Return the current value of a registered statistic."""
+        if (statistic := self._statistics.get(key)) is None:
+            return None
+        window = self._windows[(statistic.source_key, statistic.window.total_seconds())]
+        if not statistic.inverted:
+            return window.statistic(statistic.statistic)
+        return _inverted_statistic(window, statistic.statistic)
+
+
+def _inverted_statistic(window: RollingWindow, name: str) -> float | None:
+    """Return a statistic of the negated samples of a window."""
+    if name == "stdev":
+        return window.stdev()
+    if name == "min":
+        value = window.maximum()
+    elif name == "max":
+        value = window.minimum()
+    elif name.startswith("p"):
+        value = window.percentile(100 - float(name[1:]))
+    else:
+        value = window.statistic(name)
+    return -value if value is not None else None
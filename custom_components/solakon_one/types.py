@@ -4,8 +4,12 @@ from dataclasses import dataclass
 
 from homeassistant.config_entries import ConfigEntry
 
+from .controller import ZeroExportController
 from .coordinator import SolakonDataCoordinator
 from .modbus import SolakonModbusHub
+from .peak_shaving import PeakShavingController
+from .proxy import SolakonModbusProxy
+from .schedule import ScheduleExecutor
 
 
 @dataclass(frozen=True)
@@ -14,6 +18,10 @@ class SolakonData:
 
     hub: SolakonModbusHub
     coordinator: SolakonDataCoordinator
+    schedule: ScheduleExecutor
+    proxy: SolakonModbusProxy | None = None
+    controller: ZeroExportController | None = None
+    peak_shaving: PeakShavingController | None = None
 
 
 type SolakonConfigEntry = ConfigEntry[SolakonData]
@@ -0,0 +1 @@
+"""Tests for the Solakon ONE integration."""
@@ -0,0 +1,130 @@
+"""Helpers for the Solakon ONE tests."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, cast
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from custom_components.solakon_one.const import DOMAIN, REGISTERS
+from custom_components.solakon_one.modbus import SolakonModbusHub
+
+
+class FakeResponse:
+    """Response of the simulated device."""
+
+    def __init__(self, registers: list[int] | None = None, error: bool = False):
+        """Initialize the response."""
+        self.registers = registers or []
+        self._error = error
+
+    def isError(self) -> bool:
+        """Return whether the device answered with an exception."""
+        return self._error
+
+
+class FakeModbusClient:
+    """Simulated Solakon ONE answering from a register memory.
+
+    Every configured register holds 1 unless ``memory`` says otherwise.
+    Reads overlapping a ``refused`` range get an exception response, and
+    all reads raise while ``offline`` is set.
+    """
+
+    def __init__(
+        self,
+        memory: Mapping[int, int] | None = None,
+        refused: Iterable[tuple[int, int]] = (),
+    ) -> None:
+        """Initialize the device."""
+        self.memory: dict[int, int] = {
+            config["address"] + offset: 1
+            for config in REGISTERS.values()
+            for offset in range(config.get("count", 1))
+        }
+        self.memory.update(memory or {})
+        self.refused = list(refused)
+        self.offline = False
+        self.connected = True
+        self.reads: list[tuple[int, int]] = []
+        self.writes: list[tuple[int, list[int]]] = []
+
+    async def connect(self) -> bool:
+        """Connect to the device."""
+        return True
+
+    def close(self) -> None:
+        """Close the connection."""
+
+    async def read_holding_registers(
+        self, address: int, count: int, device_id: int
+    ) -> FakeResponse:
+        """Read words from the memory."""
+        if self.offline:
+            raise TimeoutError("device offline")
+        self.reads.append((address, count))
+        if any(
+            start < address + count and address < end for start, end in self.refused
+        ):
+            return FakeResponse(error=True)
+        return FakeResponse(
+            [self.memory.get(word, 0) for word in range(address, address + count)]
+        )
+
+    async def write_register(
+        self, address: int, value: int, device_id: int
+    ) -> FakeResponse:
+        """Write one word to the memory."""
+        return await self.write_registers(address, [value], device_id)
+
+    async def write_registers(
+        self, address: int, values: list[int], device_id: int
+    ) -> FakeResponse:
+        """Write words to the memory."""
+        if self.offline:
+            raise TimeoutError("device offline")
+        self.writes.append((address, list(values)))
+        for offset, value in enumerate(values):
+            self.memory[address + offset] = value
+        return FakeResponse()
+
+
+def make_hub(client: FakeModbusClient, scan_interval: int = 30) -> SolakonModbusHub:
+    """Return a hub polling the simulated device."""
+    # Reads and writes do not use Home Assistant
+    return SolakonModbusHub(
+        cast(Any, None), "127.0.0.1", 502, 1, scan_interval, client=client
+    )
+
+
+async def async_test_home_assistant(config_dir: Path) -> HomeAssistant:
+    """Return a Home Assistant instance for a test."""
+    hass = HomeAssistant(str(config_dir))
+    hass.config.skip_pip = True
+    return hass
+
+
+def make_config_entry(options: Mapping[str, Any] | None = None) -> ConfigEntry:
+    """Return a config entry of the integration."""
+    return ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Solakon ONE",
+        data={
+            "host": "127.0.0.1",
+            "port": 502,
+            "slave_id": 1,
+            "scan_interval": 30,
+            "name": "Solakon ONE",
+        },
+        source="user",
+        options=dict(options or {}),
+        unique_id="test",
+        discovery_keys=MappingProxyType({}),
+        subentries_data=None,
+    )
@@ -0,0 +1,143 @@
+"""Simulation tests of the zero export controller of Solakon ONE."""
+
+from __future__ import annotations
+
+import itertools
+import random
+from collections.abc import Callable
+from typing import Any, cast
+
+from custom_components.solakon_one.controller import (
+    ControllerSettings,
+    PIController,
+    ZeroExportController,
+)
+
+_SETTINGS = ControllerSettings(
+    interval=1.0,
+    target=0.0,
+    kp=0.5,
+    ki=0.2,
+    deadband=20.0,
+    slew_rate=100.0,
+    min_output=0.0,
+    max_output=800.0,
+    meter="sensor.grid_power",
+)
+
+
+def _make_controller(settings: ControllerSettings = _SETTINGS) -> ZeroExportController:
+    """Return a controller; stepping it uses neither hass nor the coordinator."""
+    return ZeroExportController(cast(Any, None), cast(Any, None), settings)
+
+
+def _simulate(
+    controller: ZeroExportController,
+    load: Callable[[int], float],
+    seconds: int,
+    noise: float = 0.0,
+) -> tuple[list[float], dict[int, int]]:
+    """Run the controller against a house load, stepping once a second.
+
+    The meter measures the export: the inverter output minus the load, with
+    up to ``noise`` W of noise. A written setpoint takes effect from the
+    next reading. Returns the measurements and the setpoints written by
+    second.
+    """
+    rng = random.Random(0)
+    output = 0.0
+    measurements: list[float] = []
+    writes: dict[int, int] = {}
+    for second in range(seconds):
+        measurement = output - load(second) + rng.uniform(-noise, noise)
+        measurements.append(measurement)
+        if (setpoint := controller.step(measurement, float(second))) is not None:
+            # Stands in for the successful register write
+            controller.setpoint = setpoint
+            output = setpoint
+            writes[second] = setpoint
+    return measurements, writes
+
+
+def test_load_step_is_followed_at_the_slew_rate() -> None:
+    """A load step is tracked with bounded setpoint changes and no export."""
+    controller = _make_controller()
+    measurements, writes = _simulate(
+        controller, lambda second: 500.0 if second >= 10 else 0.0, 60
+    )
+
+    setpoints = list(writes.values())
+    changes = [later - earlier for earlier, later in itertools.pairwise(setpoints)]
+    assert 0 < min(changes)
+    assert max(changes) <= _SETTINGS.slew_rate * _SETTINGS.interval
+    # The setpoint settles within the deadband without overshooting the load
+    assert 500 - _SETTINGS.deadband < setpoints[-1] <= 500
+    assert all(abs(value) < _SETTINGS.deadband for value in measurements[40:])
+
+
+def test_deadband_suppresses_noise() -> None:
+    """Once settled, meter noise below the deadband writes nothing."""
+    controller = _make_controller()
+    measurements, writes = _simulate(controller, lambda _: 300.0, 180, noise=5.0)
+
+    assert max(writes) < 60
+    assert all(abs(value) < _SETTINGS.deadband for value in measurements[60:])
+    # Every step without a write was suppressed
+    assert controller.suppressed == 180 - len(writes)
+
+
+def test_unchanged_setpoint_is_not_written() -> None:
+    """A step that lands on the current setpoint is suppressed."""
+    controller = _make_controller(
+        ControllerSettings(
+            interval=1.0, kp=0.0, ki=1.0, deadband=0.0, meter="sensor.grid_power"
+        )
+    )
+    assert controller.step(-100.0, 0.0) == 100
+    controller.setpoint = 100
+
+    assert controller.step(0.0, 1.0) is None
+    assert controller.suppressed == 1
+
+
+def test_saturated_output_does_not_wind_up() -> None:
+    """After a long stretch at the limit, the setpoint follows a load drop."""
+    controller = _make_controller()
+    measurements, writes = _simulate(
+        controller, lambda second: 1500.0 if second < 120 else 300.0, 180
+    )
+
+    # The load above the maximum saturates the output for over 100 s
+    assert max(second for second, value in writes.items() if value == 800) < 10
+    assert measurements[119] == -700
+    # The first step after the drop leaves the limit, as no integrated
+    # error has to unwind first
+    assert writes[120] == 800 - _SETTINGS.slew_rate * _SETTINGS.interval
+    assert all(abs(value) < _SETTINGS.deadband for value in measurements[160:])
+
+
+def test_gap_between_steps_is_clamped() -> None:
+    """A late step integrates at most two intervals."""
+    controller = _make_controller(
+        ControllerSettings(
+            interval=1.0, kp=0.0, ki=1.0, deadband=0.0, meter="sensor.grid_power"
+        )
+    )
+    assert controller.step(-100.0, 0.0) == 100
+    controller.setpoint = 100
+    assert controller.step(-100.0, 100.0) == 300
+
+
+def test_pi_controller_limits_and_slew() -> None:
+    """The velocity form clamps the output and limits its rate of change."""
+    pi = PIController(kp=1.0, ki=0.0, minimum=-50.0, maximum=50.0, slew_rate=10.0)
+    pi.reset(0.0)
+
+    assert pi.step(0.0, 1.0) == 0.0
+    # A proportional kick of 100 is limited to 10 per second
+    assert pi.step(100.0, 1.0) == 10.0
+    assert pi.step(100.0, 10.0) == 10.0
+    # Without a previous error only the integral term acts
+    pi.reset(100.0)
+    assert pi.output == 50.0
+    assert pi.step(-1000.0, 1.0) == 50.0
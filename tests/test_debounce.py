@@ -0,0 +1,70 @@
+"""Tests of the debounced register writes of Solakon ONE."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from custom_components.solakon_one.debounce import WriteDebouncer
+
+from .common import (
+    FakeModbusClient,
+    async_test_home_assistant,
+    make_config_entry,
+    make_hub,
+)
+
+
+def test_only_the_last_value_of_a_burst_is_written(tmp_path: Path) -> None:
+    """A burst of values for one key results in one write."""
+
+    async def run() -> None:
+        hass = await async_test_home_assistant(tmp_path)
+        entry = make_config_entry()
+        client = FakeModbusClient()
+        hub = make_hub(client)
+        await hub.async_setup()
+        await hub.async_read_registers()
+        debouncer = WriteDebouncer(hass, hub)
+        results: list[Any] = []
+
+        for value in (10, 20, 30):
+            debouncer.schedule(entry, "minimum_soc", value, results.append)
+        await asyncio.sleep(0.6)
+        await hass.async_block_till_done()
+
+        assert client.writes == [(46609, [30])]
+        assert results == [30]
+        await hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+def test_stop_cancels_a_write_in_flight(tmp_path: Path) -> None:
+    """Stopping the debouncer cancels a write that already started."""
+
+    async def run() -> None:
+        hass = await async_test_home_assistant(tmp_path)
+        entry = make_config_entry()
+        client = FakeModbusClient()
+        hub = make_hub(client)
+        await hub.async_setup()
+        debouncer = WriteDebouncer(hass, hub)
+        blocked = asyncio.Event()
+
+        async def write_forever(**_: object) -> None:
+            blocked.set()
+            await asyncio.Event().wait()
+
+        client.write_register = write_forever  # type: ignore[method-assign]
+        debouncer.schedule(entry, "minimum_soc", 20, lambda _: None)
+        await blocked.wait()
+        (task,) = entry._background_tasks
+
+        debouncer.async_stop()
+        await asyncio.sleep(0)
+        assert task.cancelled()
+        await hass.async_stop(force=True)
+
+    asyncio.run(run())
@@ -0,0 +1,35 @@
+"""Tests of the remote control keepalive of Solakon ONE."""
+
+from __future__ import annotations
+
+from custom_components.solakon_one.keepalive import COUNTDOWN_KEY
+
+from .common import FakeModbusClient, make_hub
+
+
+def test_keepalive_runs_until_the_last_owner_releases_it() -> None:
+    """Releasing one hold keeps the keepalive of another owner running."""
+    hub = make_hub(FakeModbusClient())
+    keepalive = hub.keepalive
+
+    keepalive.async_start("switch")
+    keepalive.async_start("peak_shaving")
+    keepalive.async_stop("peak_shaving")
+    assert keepalive.active
+    assert keepalive.holds("switch")
+    assert not keepalive.holds("peak_shaving")
+    assert hub._poll_exclusions["keepalive"] == {COUNTDOWN_KEY}
+
+    keepalive.async_stop("switch")
+    assert not keepalive.active
+    assert hub._poll_exclusions["keepalive"] == set()
+
+
+def test_stop_without_owner_releases_every_hold() -> None:
+    """Closing the hub stops the keepalive whoever holds it."""
+    hub = make_hub(FakeModbusClient())
+    hub.keepalive.async_start("switch")
+    hub.keepalive.async_start("peak_shaving")
+
+    hub.keepalive.async_stop()
+    assert not hub.keepalive.active
@@ -0,0 +1,140 @@
+"""Tests of the Modbus hub of Solakon ONE."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, cast
+
+from custom_components.solakon_one.const import REGISTERS
+from custom_components.solakon_one.modbus import SolakonModbusHub
+
+from .common import FakeModbusClient, make_hub
+
+# Battery max charge current, which the simulated device holds as 1
+_ADDRESS = REGISTERS["battery_max_charge_current"]["address"]
+
+
+def test_write_of_a_fresh_value_is_skipped() -> None:
+    """Writing the value just read does not reach the device."""
+
+    async def run() -> None:
+        client = FakeModbusClient()
+        hub = make_hub(client)
+        await hub.async_setup()
+        await hub.async_read_registers()
+
+        assert await hub.async_write_register(_ADDRESS, 1)
+        assert client.writes == []
+        assert hub.skipped_writes == 1
+
+    asyncio.run(run())
+
+
+def test_forced_write_of_a_fresh_value_reaches_the_device() -> None:
+    """A forced write is sent even if the device holds the value."""
+
+    async def run() -> None:
+        client = FakeModbusClient()
+        hub = make_hub(client)
+        await hub.async_setup()
+        await hub.async_read_registers()
+
+        results = await hub.async_apply_values({"minimum_soc": 1}, force=True)
+        assert results["minimum_soc"]["status"] == "written"
+        assert client.writes == [(46609, [1])]
+        assert hub.skipped_writes == 0
+
+    asyncio.run(run())
+
+
+def test_write_of_a_stale_value_reaches_the_device() -> None:
+    """Words read before ``max_age`` do not skip a write."""
+
+    async def run() -> None:
+        client = FakeModbusClient()
+        hub = make_hub(client)
+        await hub.async_setup()
+        await hub.async_read_registers()
+
+        hub.max_age = 0.0
+        assert await hub.async_write_register(_ADDRESS, 1)
+        assert client.writes == [(_ADDRESS, [1])]
+
+    asyncio.run(run())
+
+
+def test_write_into_a_shed_batch_reaches_the_device() -> None:
+    """Words of a batch shed from the polls do not skip a write."""
+
+    async def run() -> None:
+        client = FakeModbusClient()
+        hub = make_hub(client)
+        await hub.async_setup()
+        await hub.async_read_registers()
+
+        (batch,) = (
+            batch
+            for batch in hub._poll_batches
+            if batch["address"] <= _ADDRESS < batch["address"] + batch["count"]
+        )
+        hub.set_shed_priority(batch["priority"] + 1)
+        await hub.async_read_registers()
+
+        assert await hub.async_write_register(_ADDRESS, 1)
+        assert client.writes == [(_ADDRESS, [1])]
+
+    asyncio.run(run())
+
+
+def test_unrequested_registers_are_not_rewritten() -> None:
+    """A gap between written registers is only bridged with requested values."""
+
+    async def run() -> None:
+        client = FakeModbusClient()
+        hub = make_hub(client)
+        await hub.async_setup()
+        await hub.async_read_registers()
+
+        # Maximum SoC lies between the two and holds 1
+        await hub.async_write_values({"minimum_soc": 20, "minimum_soc_ongrid": 20})
+        assert client.writes == [(46609, [20]), (46611, [20])]
+
+        client.writes.clear()
+        await hub.async_write_values(
+            {"minimum_soc": 30, "maximum_soc": 1, "minimum_soc_ongrid": 30}
+        )
+        assert client.writes == [(46609, [30, 1, 30])]
+
+    asyncio.run(run())
+
+
+def test_ad_hoc_reads_avoid_unreadable_ranges() -> None:
+    """Registers around a refused range are read without touching it."""
+
+    async def run() -> None:
+        client = FakeModbusClient({40000: 7, 40003: 9}, refused=[(40001, 40003)])
+        hub = SolakonModbusHub(
+            cast(Any, None),
+            "127.0.0.1",
+            502,
+            1,
+            30,
+            client=client,
+            unreadable=[(40001, 40003)],
+        )
+        await hub.async_setup()
+        client.reads.clear()
+
+        results = await hub.async_read_specs(
+            {
+                "first": {"address": 40000, "count": 1, "type": "u16"},
+                "second": {"address": 40003, "count": 1, "type": "u16"},
+            },
+            0.0,
+        )
+        assert results["first"]["value"] == 7
+        assert results["second"]["value"] == 9
+        # Two reads straight away, no refused batch and no per-key fallback
+        assert client.reads == [(40000, 1), (40003, 1)]
+
+    asyncio.run(run())
@@ -0,0 +1,82 @@
+"""Simulation tests of the peak shaving of Solakon ONE."""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+
+from custom_components.solakon_one.peak_shaving import PeakShaver
+
+_LIMIT = 1000.0
+_HYSTERESIS = 100.0
+
+
+def _house_load(second: int) -> float:
+    """Return the load of the house: an oven with a kettle on top."""
+    if 60 <= second < 300:
+        return 1750.0 if 120 <= second < 130 else 1500.0
+    return 400.0
+
+
+def _simulate(
+    load: Callable[[int], float],
+    seconds: int,
+    soc: Callable[[int], float] = lambda _: 50.0,
+) -> tuple[PeakShaver, list[float], list[dict[str, float]]]:
+    """Run the shaver against the load, checking the import once a second.
+
+    The meter measures the load of the house minus the battery discharge,
+    with up to 20 W of noise. A written setpoint takes effect from the next
+    reading.
+    """
+    noise = random.Random(0)
+    shaver = PeakShaver(_LIMIT, _HYSTERESIS)
+    discharge = 0.0
+    imports: list[float] = []
+    writes: list[dict[str, float]] = []
+    for second in range(seconds):
+        grid_import = load(second) - discharge + noise.uniform(-20, 20)
+        imports.append(grid_import)
+        if (values := shaver.update(grid_import, soc(second), 10.0)) is None:
+            continue
+        writes.append(values)
+        if values.get("remote_control") == 0:
+            discharge = 0.0
+        elif "remote_active_power" in values:
+            discharge = values["remote_active_power"]
+    return shaver, imports, writes
+
+
+def test_import_is_held_below_the_cap() -> None:
+    """The import exceeds the cap only for the reading that starts shaving."""
+    shaver, imports, writes = _simulate(_house_load, 400)
+
+    # The oven and the kettle each exceed the cap for one reading
+    assert [second for second, value in enumerate(imports) if value > _LIMIT] == [
+        60,
+        120,
+    ]
+    assert all(value <= _LIMIT - _HYSTERESIS / 2 + 50 for value in imports[61:120])
+    # Start, kettle on, kettle off and end; the noise is not written
+    assert len(writes) == 4
+    assert shaver.activations == 1
+
+
+def test_shaving_ends_after_the_peak() -> None:
+    """Remote control is disabled once the load fell back."""
+    shaver, imports, writes = _simulate(_house_load, 400)
+
+    assert writes[-1] == {"remote_control": 0}
+    assert not shaver.active
+    assert max(imports[301:]) < _LIMIT - _HYSTERESIS
+
+
+def test_shaving_stops_at_the_minimum_soc() -> None:
+    """An empty battery ends shaving although the import exceeds the cap."""
+    shaver, imports, writes = _simulate(
+        _house_load, 400, lambda second: 10.0 if second >= 200 else 50.0
+    )
+
+    assert writes[-1] == {"remote_control": 0}
+    assert shaver.activations == 1
+    assert min(imports[201:300]) > _LIMIT
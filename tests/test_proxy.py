@@ -0,0 +1,54 @@
+"""Tests of the Modbus proxy of Solakon ONE."""
+
+from __future__ import annotations
+
+import asyncio
+
+from pymodbus.constants import ExcCodes
+
+from custom_components.solakon_one.proxy import SolakonProxyDeviceContext
+
+from .common import FakeModbusClient, make_hub
+
+_WRITE_SINGLE_REGISTER = 6
+_WRITE_MULTIPLE_REGISTERS = 16
+
+
+def test_writes_to_writable_registers_are_forwarded() -> None:
+    """A client write of a writable register reaches the device."""
+
+    async def run() -> None:
+        client = FakeModbusClient()
+        hub = make_hub(client)
+        await hub.async_setup()
+        context = SolakonProxyDeviceContext(hub, 30)
+
+        assert (
+            await context.async_setValues(_WRITE_SINGLE_REGISTER, 46609, [20]) is None
+        )
+        assert client.writes == [(46609, [20])]
+
+    asyncio.run(run())
+
+
+def test_writes_outside_writable_registers_are_rejected() -> None:
+    """Writes touching any register not marked writable never reach the device."""
+
+    async def run() -> None:
+        client = FakeModbusClient()
+        hub = make_hub(client)
+        await hub.async_setup()
+        context = SolakonProxyDeviceContext(hub, 30)
+
+        # Active power is read-only; 46611-46612 spans the unknown 46612
+        for func_code, address, values in (
+            (_WRITE_SINGLE_REGISTER, 39134, [0]),
+            (_WRITE_MULTIPLE_REGISTERS, 46611, [20, 0]),
+        ):
+            assert (
+                await context.async_setValues(func_code, address, values)
+                == ExcCodes.ILLEGAL_ADDRESS
+            )
+        assert client.writes == []
+
+    asyncio.run(run())
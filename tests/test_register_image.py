@@ -0,0 +1,48 @@
+"""Tests of the register image snapshots of Solakon ONE."""
+
+from __future__ import annotations
+
+import asyncio
+
+from .common import FakeModbusClient, make_hub
+
+
+def test_failed_poll_keeps_values_until_stale() -> None:
+    """An offline poll keeps dynamic values only while they are fresh."""
+
+    async def run() -> None:
+        client = FakeModbusClient()
+        hub = make_hub(client)
+        await hub.async_setup()
+        assert await hub.async_read_registers()
+
+        client.offline = True
+        snapshot = await hub.async_read_registers()
+        assert snapshot
+        assert "active_power" in snapshot
+
+        hub.max_age = 0.0
+        snapshot = await hub.async_read_registers()
+        assert "active_power" not in snapshot
+        # Static values remain, but do not make the poll a success
+        assert "model_name" in snapshot
+        assert not snapshot
+
+    asyncio.run(run())
+
+
+def test_shed_blocks_do_not_count_as_data() -> None:
+    """A poll reading nothing fails even if shed blocks hold old words."""
+
+    async def run() -> None:
+        client = FakeModbusClient()
+        hub = make_hub(client)
+        await hub.async_setup()
+        assert await hub.async_read_registers()
+
+        hub.set_shed_priority(1)
+        client.offline = True
+        hub.max_age = 0.0
+        assert not await hub.async_read_registers()
+
+    asyncio.run(run())
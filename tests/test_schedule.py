@@ -0,0 +1,147 @@
+"""Tests of the time-of-use schedule of Solakon ONE."""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+from datetime import date, datetime, time
+from pathlib import Path
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.solakon_one.const import REGISTERS
+from custom_components.solakon_one.remote_control import RemoteControlMode
+from custom_components.solakon_one.schedule import (
+    ScheduleExecutor,
+    ScheduleSlot,
+    async_remove_schedule,
+)
+
+from .common import FakeModbusClient, async_test_home_assistant, make_hub
+
+_REMOTE_CONTROL = REGISTERS["remote_control"]["address"]
+_MINIMUM_SOC = REGISTERS["minimum_soc"]["address"]
+_SLOT = ScheduleSlot(
+    start=time(2), end=time(5), mode=RemoteControlMode.BATTERY_CHARGE, power=800
+)
+
+
+def _at(hour: int) -> datetime:
+    """Return a moment of a day in UTC."""
+    return dt_util.as_utc(
+        datetime.combine(date(2026, 1, 1), time(hour), dt_util.get_default_time_zone())
+    )
+
+
+def _storage_path(config_dir: Path) -> Path:
+    """Return the file of the stored schedule of the test entry."""
+    return config_dir / ".storage" / "solakon_one.schedule.test"
+
+
+def _modes(client: FakeModbusClient) -> list[int]:
+    """Return the remote control modes written to the device."""
+    return [
+        values[_REMOTE_CONTROL - address]
+        for address, values in client.writes
+        if address <= _REMOTE_CONTROL < address + len(values)
+    ]
+
+
+def test_only_the_end_of_an_applied_slot_disables_remote_control(
+    tmp_path: Path,
+) -> None:
+    """Outside of slots, a mode the schedule did not set is left alone."""
+
+    async def run() -> None:
+        hass = await async_test_home_assistant(tmp_path)
+        client = FakeModbusClient()
+        hub = make_hub(client)
+        await hub.async_setup()
+        schedule = ScheduleExecutor(hass, hub, "test")
+        schedule.slots = [_SLOT]
+
+        await schedule._async_apply(_at(6))
+        assert client.writes == []
+
+        await schedule._async_apply(_at(3))
+        assert _modes(client) == [RemoteControlMode.BATTERY_CHARGE]
+        assert hub.remote_control.owner == "schedule"
+
+        await schedule._async_apply(_at(6))
+        assert _modes(client) == [RemoteControlMode.BATTERY_CHARGE, 0]
+        assert hub.remote_control.owner is None
+
+        client.writes.clear()
+        await schedule._async_apply(_at(7))
+        assert client.writes == []
+        await hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+def test_slot_is_skipped_while_another_subsystem_runs_remote_control(
+    tmp_path: Path,
+) -> None:
+    """A slot does not overwrite the mode of another owner."""
+
+    async def run() -> None:
+        hass = await async_test_home_assistant(tmp_path)
+        client = FakeModbusClient()
+        hub = make_hub(client)
+        await hub.async_setup()
+        schedule = ScheduleExecutor(hass, hub, "test")
+        schedule.slots = [_SLOT]
+        assert hub.remote_control.claim("peak_shaving")
+
+        await schedule._async_apply(_at(3))
+        await schedule._async_apply(_at(6))
+        assert client.writes == []
+        assert hub.remote_control.owner == "peak_shaving"
+        await hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+def test_minimum_soc_of_a_slot_is_restored_at_its_end(tmp_path: Path) -> None:
+    """The minimum SoC before a slot overriding it returns after the slot."""
+
+    async def run() -> None:
+        hass = await async_test_home_assistant(tmp_path)
+        client = FakeModbusClient({_MINIMUM_SOC: 15})
+        hub = make_hub(client)
+        await hub.async_setup()
+        schedule = ScheduleExecutor(hass, hub, "test")
+        schedule.slots = [dataclasses.replace(_SLOT, min_soc=50)]
+
+        await schedule._async_apply(_at(3))
+        assert client.memory[_MINIMUM_SOC] == 50
+        # Stored, so a restart during the slot still restores the value
+        stored = json.loads(_storage_path(tmp_path).read_text())
+        assert stored["data"]["saved_min_soc"] == 15
+
+        await schedule._async_apply(_at(6))
+        assert client.memory[_MINIMUM_SOC] == 15
+        assert schedule._saved_min_soc is None
+        await hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+def test_removed_entry_leaves_no_schedule_behind(tmp_path: Path) -> None:
+    """Removing the schedule of an entry deletes its stored slots."""
+
+    async def run() -> None:
+        hass = await async_test_home_assistant(tmp_path)
+        hub = make_hub(FakeModbusClient())
+        schedule = ScheduleExecutor(hass, hub, "test")
+        await schedule.async_set([])
+        await hass.async_block_till_done()
+        path = _storage_path(tmp_path)
+        assert path.exists()
+
+        await async_remove_schedule(hass, "test")
+        assert not path.exists()
+        await hass.async_stop(force=True)
+
+    asyncio.run(run())
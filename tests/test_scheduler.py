@@ -0,0 +1,166 @@
+"""Tests of the poll scheduling of Solakon ONE coordinators."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from pathlib import Path
+
+from custom_components.solakon_one.coordinator import SolakonDataCoordinator
+from custom_components.solakon_one.modbus import SolakonModbusHub
+from custom_components.solakon_one.scheduler import SolakonPollScheduler
+
+from .common import (
+    FakeModbusClient,
+    async_test_home_assistant,
+    make_config_entry,
+    make_hub,
+)
+
+
+def test_phases_spread_a_fleet_over_the_interval() -> None:
+    """Polls of 50 entries at a 2 s interval never bunch up."""
+    scheduler = SolakonPollScheduler()
+    interval = 2.0
+    members = [f"entry_{index}" for index in range(50)]
+    for member in members:
+        scheduler.async_register(member)
+
+    # Polls of all members over ten intervals
+    polls = sorted(
+        poll
+        for member in members
+        for poll in _polls(scheduler, member, interval, 0.0, 10 * interval)
+    )
+    gaps = [later - earlier for earlier, later in itertools.pairwise(polls)]
+    assert len(polls) == 500
+    # Bisected phases leave gaps of 1/64 or 1/32 of the interval
+    assert min(gaps) >= interval / 64 - 1e-9
+    assert max(gaps) <= interval / 32 + 1e-9
+
+
+def test_phases_stay_stable() -> None:
+    """Members keep their phase when others join or leave."""
+    scheduler = SolakonPollScheduler()
+    first = scheduler.async_register("first")
+    second = scheduler.async_register("second")
+    scheduler.async_register("third")
+    scheduler.async_unregister("third")
+
+    assert scheduler.async_register("first") == first
+    assert scheduler.phases == {"first": first, "second": second}
+    assert scheduler.async_register("fourth") not in (first, second)
+
+
+def test_overrun_skips_missed_slots() -> None:
+    """A poll running past its slots continues on the original grid."""
+    scheduler = SolakonPollScheduler()
+    scheduler.async_register("first")
+    scheduler.async_register("second")
+
+    # Phase 0.5 at a 2 s interval polls at 1, 3, 5, ... s
+    assert scheduler.next_refresh("second", 2.0, 1.0) == 3.0
+    # A poll started at 3 s and finished at 7.2 s skips 5 s and 7 s
+    assert scheduler.next_refresh("second", 2.0, 7.2) == 9.0
+
+
+def test_unload_cancels_a_refresh_in_flight(tmp_path: Path) -> None:
+    """A scheduled refresh belongs to the config entry."""
+
+    async def run() -> None:
+        hass = await async_test_home_assistant(tmp_path)
+        entry = make_config_entry()
+        client = FakeModbusClient()
+        hub = SolakonModbusHub(hass, "127.0.0.1", 502, 1, 30, client=client)
+        await hub.async_setup()
+        coordinator = SolakonDataCoordinator(hass, entry, hub, SolakonPollScheduler())
+        blocked = asyncio.Event()
+
+        async def read_forever(**_: object) -> None:
+            blocked.set()
+            await asyncio.Event().wait()
+
+        client.read_holding_registers = read_forever  # type: ignore[method-assign]
+        coordinator._handle_scheduled_refresh()
+        await blocked.wait()
+        (task,) = entry._background_tasks
+
+        await entry._async_process_on_unload(hass)
+        assert task.cancelled()
+        await hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+def test_staggered_fleet_keeps_event_loop_lag_low(tmp_path: Path) -> None:
+    """50 entries on staggered phases do not stall the event loop together.
+
+    Each poll costs 4 ms of event loop time in its listeners, standing in for
+    the entity state updates. Polls of a fleet that drifted into sync run back
+    to back and delay everything else on the loop by their sum.
+    """
+    synchronized = asyncio.run(_async_fleet_lag(tmp_path, _SynchronizedScheduler()))
+    staggered = asyncio.run(_async_fleet_lag(tmp_path, SolakonPollScheduler()))
+
+    # All 50 polls at once stall the loop for about 200 ms
+    assert max(synchronized) > 0.15
+    assert max(staggered) < max(synchronized) / 4
+
+
+class _SynchronizedScheduler(SolakonPollScheduler):
+    """Scheduler that puts every member on the same phase."""
+
+    def async_register(self, member_id: str) -> float:
+        """Register a member at phase 0."""
+        self._phases[member_id] = 0.0
+        return 0.0
+
+
+async def _async_fleet_lag(
+    config_dir: Path, scheduler: SolakonPollScheduler
+) -> list[float]:
+    """Poll 50 simulated devices at 1 s for 3 s and return the loop lag samples."""
+    hass = await async_test_home_assistant(config_dir)
+    coordinators: list[SolakonDataCoordinator] = []
+    for _ in range(50):
+        hub = make_hub(FakeModbusClient(), scan_interval=1)
+        await hub.async_setup()
+        coordinator = SolakonDataCoordinator(hass, make_config_entry(), hub, scheduler)
+        coordinator.async_add_listener(_burn_cpu)
+        coordinators.append(coordinator)
+
+    loop = asyncio.get_running_loop()
+    lag: list[float] = []
+    end = loop.time() + 3.0
+    while loop.time() < end:
+        start = loop.time()
+        await asyncio.sleep(0.005)
+        lag.append(loop.time() - start - 0.005)
+
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+    await hass.async_stop(force=True)
+    return lag
+
+
+def _burn_cpu() -> None:
+    """Block the event loop for 4 ms."""
+    end = time.perf_counter() + 0.004
+    while time.perf_counter() < end:
+        pass
+
+
+def _polls(
+    scheduler: SolakonPollScheduler,
+    member: str,
+    interval: float,
+    start: float,
+    end: float,
+) -> list[float]:
+    """Return the grid points of a member in ``[start, end)``."""
+    polls: list[float] = []
+    now = start - 1e-9
+    while (now := scheduler.next_refresh(member, interval, now)) < end:
+        polls.append(now)
+    return polls
@@ -0,0 +1,47 @@
+"""Tests of the rolling telemetry windows of Solakon ONE."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+
+import pytest
+
+from custom_components.solakon_one.telemetry import TelemetryBuffers
+
+
+@dataclass(frozen=True)
+class _Statistic:
+    """Statistic declaration as made by the sensor descriptions."""
+
+    key: str
+    source_key: str
+    window: timedelta
+    statistic: str
+    inverted: bool = False
+
+
+@pytest.mark.parametrize(
+    ("statistic", "expected"),
+    [("mean", -250.0), ("min", -1000.0), ("max", 500.0), ("p100", 500.0)],
+)
+def test_inverted_statistic_matches_the_source_sign(
+    statistic: str, expected: float
+) -> None:
+    """An inverted statistic is taken over the negated samples."""
+    telemetry = TelemetryBuffers(1.0)
+    telemetry.register(
+        [
+            _Statistic(
+                "battery", "battery_power", timedelta(minutes=5), statistic, True
+            ),
+            _Statistic("stdev", "battery_power", timedelta(minutes=5), "stdev", True),
+        ]
+    )
+    # The register is positive while charging, the sensor shows discharge
+    window = next(iter(telemetry._windows.values()))
+    for timestamp, value in enumerate((1000.0, -500.0, 500.0, 0.0)):
+        window.add(value, float(timestamp))
+
+    assert telemetry.value("battery") == expected
+    assert telemetry.value("stdev") == pytest.approx(559.017, abs=1e-3)